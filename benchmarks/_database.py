@@ -0,0 +1,69 @@
+"""Helpers binding the application database to a temporary SQLite file for benchmarks."""
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from typing import Iterator, Tuple
+
+
+def bind_temporary_database() -> str:
+    """Bind the application database to a fresh temporary SQLite file.
+
+    Must be called before anything imports productivity_tracker.
+
+    Returns:
+        str: SQLite file name
+    """
+    directory = tempfile.mkdtemp(prefix="my-work-tracker-bench-")
+    filename = os.path.join(directory, "sqlite.db")
+    os.environ["FILENAME"] = filename
+
+    from productivity_tracker.bootstrap import ensure_mapping  # pylint: disable=import-outside-toplevel
+
+    ensure_mapping()
+
+    return filename
+
+
+def to_sql_datetime(__datetime: datetime) -> str:
+    """Format a datetime the way Pony stores it in SQLite."""
+    return __datetime.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def generate_work_entries(
+    count: int,
+    *,
+    task_count: int = 1,
+    until: datetime | None = None,
+    span: timedelta = timedelta(hours=1),
+) -> Iterator[Tuple[int, str, str]]:
+    """Generate non-overlapping work entries ending before until, one per span and lasting half of it.
+
+    Yields:
+        Tuple[int, str, str]: Task id, start and end in the SQLite format
+    """
+    if until is None:
+        until = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=1)
+    for i in range(count):
+        start = until - span * (count - i)
+        yield (i % task_count) + 1, to_sql_datetime(start), to_sql_datetime(start + span / 2)
+
+
+def seed_work_entries(
+    filename: str,
+    count: int,
+    *,
+    task_count: int = 1,
+    until: datetime | None = None,
+    span: timedelta = timedelta(hours=1),
+) -> None:
+    """Insert tasks and work entries straight through sqlite3, bypassing the application."""
+    with sqlite3.connect(filename) as connection:
+        connection.executemany(
+            "INSERT INTO tasks (id, name) VALUES (?, ?)",
+            ((i, f"task-{i}") for i in range(1, task_count + 1)),
+        )
+        connection.executemany(
+            'INSERT INTO work_entries (task, start, "end") VALUES (?, ?, ?)',
+            generate_work_entries(count, task_count=task_count, until=until, span=span),
+        )
@@ -0,0 +1,128 @@
+"""Deterministic synthetic work history for benchmarks, shaped like real working days.
+
+Weekdays are worked with few exceptions and weekends rarely. A day starts between 8:30 and 10:00,
+is split into work entries of 15 minutes to 2 hours with short gaps and a lunch break, and ends between 17:00 and 20:00.
+Tasks are picked by a Zipf-like popularity, so that a few tasks take most of the entries like in practice.
+The same spec and the same last day always generate the same rows.
+"""
+import random
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+from typing import Iterator, List, Tuple
+
+from ._database import to_sql_datetime
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    years: float = 2.0
+    tasks: int = 2000
+    categories: int = 200
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class SyntheticCounts:
+    categories: int
+    tasks: int
+    work_entries: int
+    first_day: date
+    last_day: date
+
+
+def category_name(index: int) -> str:
+    return f"category-{index:04d}"
+
+
+def task_name(index: int) -> str:
+    return f"task-{index:05d}"
+
+
+def generate_tasks(spec: SyntheticSpec) -> Iterator[Tuple[int, str, str | None]]:
+    """Generate the tasks, one in ten without project category.
+
+    Yields:
+        Tuple[int, str, str | None]: Task id, task name and project category name
+    """
+    for i in range(1, spec.tasks + 1):
+        yield i, task_name(i), None if i % 10 == 0 else category_name(i % spec.categories)
+
+
+def generate_day(
+    generator: random.Random, day: date, cum_weights: List[float]
+) -> Iterator[Tuple[int, datetime, datetime]]:
+    """Generate the work entries of a day, none if it is not worked.
+
+    Yields:
+        Tuple[int, datetime, datetime]: Task id, start and end
+    """
+    worked = generator.random() < (0.95 if day.weekday() < 5 else 0.05)
+    if not worked:
+        return
+    current = datetime.combine(day, time(8, 30)) + timedelta(minutes=generator.randrange(0, 91))
+    day_end = datetime.combine(day, time(17)) + timedelta(minutes=generator.randrange(0, 181))
+    lunch = datetime.combine(day, time(12))
+    had_lunch = False
+    while current < day_end:
+        end = min(current + timedelta(minutes=generator.randrange(15, 121)), day_end)
+        task_id = generator.choices(range(1, len(cum_weights) + 1), cum_weights=cum_weights)[0]
+        yield task_id, current, end
+        current = end + timedelta(minutes=generator.randrange(0, 16))
+        if not had_lunch and current >= lunch:
+            current += timedelta(minutes=generator.randrange(45, 61))
+            had_lunch = True
+
+
+def generate_work_entries(spec: SyntheticSpec, last_day: date) -> Iterator[Tuple[int, str, str]]:
+    """Generate the work entries of the days up to last_day inclusive, over spec.years years.
+
+    Yields:
+        Tuple[int, str, str]: Task id, start and end in the SQLite format
+    """
+    generator = random.Random(spec.seed)
+    weights = [1 / rank for rank in range(1, spec.tasks + 1)]
+    generator.shuffle(weights)
+    cum_weights = list(accumulate(weights))
+    days = round(spec.years * 365)
+    for offset in range(days - 1, -1, -1):
+        day = last_day - timedelta(days=offset)
+        for task_id, start, end in generate_day(generator, day, cum_weights):
+            yield task_id, to_sql_datetime(start), to_sql_datetime(end)
+
+
+def seed_synthetic(filename: str, spec: SyntheticSpec, last_day: date) -> SyntheticCounts:
+    """Insert the synthetic history straight through sqlite3, bypassing the application.
+
+    The daily task totals are not filled, so business_logic.Report.rebuild() must follow.
+
+    Args:
+        filename (str): SQLite file name of a database with the tables created
+        spec (SyntheticSpec): Size of the history
+        last_day (date): Last day of the history
+
+    Returns:
+        SyntheticCounts: Numbers of the inserted rows
+    """
+    with sqlite3.connect(filename) as connection:
+        connection.executemany(
+            "INSERT INTO project_categories (name) VALUES (?)",
+            ((category_name(i),) for i in range(spec.categories)),
+        )
+        connection.executemany(
+            "INSERT INTO tasks (id, name, project_category) VALUES (?, ?, ?)",
+            generate_tasks(spec),
+        )
+        cursor = connection.executemany(
+            'INSERT INTO work_entries (task, start, "end") VALUES (?, ?, ?)',
+            generate_work_entries(spec, last_day),
+        )
+        work_entries = cursor.rowcount
+    return SyntheticCounts(
+        categories=spec.categories,
+        tasks=spec.tasks,
+        work_entries=work_entries,
+        first_day=last_day - timedelta(days=round(spec.years * 365) - 1),
+        last_day=last_day,
+    )
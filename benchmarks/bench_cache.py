@@ -0,0 +1,62 @@
+"""Benchmark of the process-wide cache in front of Task.acquire_all and ProjectCategory.acquire_all.
+
+Simulates Streamlit reruns reading both lists, while another process commits every so often.
+
+Usage:
+    python -m benchmarks.bench_cache [--tasks 1000] [--reruns 1000] [--write-every 100]
+"""
+import argparse
+import sqlite3
+from time import perf_counter
+
+from ._database import bind_temporary_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000)
+    parser.add_argument("--reruns", type=int, default=1_000)
+    parser.add_argument("--write-every", type=int, default=100)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    with sqlite3.connect(filename) as connection:
+        connection.executemany(
+            "INSERT INTO tasks (name) VALUES (?)", ((f"task-{i}",) for i in range(args.tasks))
+        )
+
+    # pylint: disable=import-outside-toplevel
+    from productivity_tracker import business_logic as logic
+
+    def rerun() -> None:
+        logic.Task.acquire_all()
+        logic.ProjectCategory.acquire_all()
+
+    # NOTE: A separate connection stands for another process writing to the same file
+    external = sqlite3.connect(filename)
+    started = perf_counter()
+    for i in range(args.reruns):
+        if i and i % args.write_every == 0:
+            with external:
+                external.execute(
+                    "INSERT INTO project_categories (name) VALUES (?)", (f"category-{i}",)
+                )
+        rerun()
+    cached_seconds = (perf_counter() - started) / args.reruns
+    cache = logic.cache
+    hits, misses = cache.hits, cache.misses
+
+    started = perf_counter()
+    for _ in range(args.reruns):
+        logic.cache.clear()
+        rerun()
+    uncached_seconds = (perf_counter() - started) / args.reruns
+
+    print(f"tasks: {args.tasks}, reruns: {args.reruns}, external write every {args.write_every} reruns")
+    print(f"  cached   : {cached_seconds * 1e6:10.1f} us/rerun")
+    print(f"  uncached : {uncached_seconds * 1e6:10.1f} us/rerun")
+    print(f"  cached run: hits {hits}, misses {misses}, evictions {cache.evictions}")
+
+
+if __name__ == "__main__":
+    main()
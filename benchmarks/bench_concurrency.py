@@ -0,0 +1,134 @@
+"""Stress test of read throughput while another process keeps writing to the same SQLite file.
+
+Reader threads list the work entries of a day, once through the plain read session of
+WorkEntry.acquire_all_finished_by_date and once through the serializable session reads used before,
+while a writer process registers work entries as fast as it can.
+
+Usage:
+    python -m benchmarks.bench_concurrency [--readers 4] [--seconds 5]
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from multiprocessing.synchronize import Event
+from time import perf_counter
+from typing import Any, Callable, List, Tuple
+
+from ._database import bind_temporary_database, seed_work_entries
+
+
+def write_until(filename: str, stop: Event, written: Any) -> None:
+    """Register one minute work entries, going back one day every 720 entries, until stopped.
+
+    Continues after the entries counted in written by previous writers.
+    """
+    os.environ["FILENAME"] = filename
+    # pylint: disable=import-outside-toplevel
+    from productivity_tracker import business_logic as logic
+
+    day_start = datetime.combine(date.today() - timedelta(days=2), datetime.min.time())
+    i = written.value
+    while not stop.is_set():
+        start = day_start - timedelta(days=i // 720) + timedelta(minutes=2 * (i % 720))
+        logic.WorkEntry.register(1, start, start + timedelta(minutes=1))
+        with written.get_lock():
+            written.value += 1
+        i += 1
+
+
+def read_for(
+    read: Callable[[], object], readers: int, seconds: float
+) -> Tuple[int, List[float], int]:
+    """Call read from several threads for the given seconds.
+
+    Returns:
+        Tuple[int, List[float], int]: Number of reads, their latencies in seconds and number of errors
+    """
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = perf_counter() + seconds
+
+    def loop() -> None:
+        while perf_counter() < deadline:
+            started = perf_counter()
+            try:
+                read()
+            except Exception:  # pylint: disable=broad-except
+                with lock:
+                    errors[0] += 1
+                continue
+            with lock:
+                latencies.append(perf_counter() - started)
+
+    threads = [threading.Thread(target=loop) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies), sorted(latencies), errors[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    the_day = date.today() - timedelta(days=1)
+    seed_work_entries(
+        filename,
+        500,
+        until=datetime.combine(date.today(), datetime.min.time()),
+        span=timedelta(minutes=2),
+    )
+
+    # pylint: disable=import-outside-toplevel
+    from pony.orm import db_session
+
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker.data import entities as models
+
+    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def read_serializable() -> object:
+        # NOTE: The read session used before, kept here as the reference
+        return models.WorkEntry.select_rows_between(*models.day_range(the_day))
+
+    with sqlite3.connect(filename) as connection:
+        (journal_mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+    print(f"readers: {args.readers}, seconds: {args.seconds}, journal_mode: {journal_mode}")
+
+    context = multiprocessing.get_context("spawn")
+    written = context.Value("i", 0)
+    for name, read in [
+        ("plain read session", lambda: logic.WorkEntry.acquire_all_finished_by_date(the_day)),
+        ("serializable (reference)", read_serializable),
+    ]:
+        stop = context.Event()
+        writer = context.Process(target=write_until, args=(filename, stop, written))
+        written_before = written.value
+        writer.start()
+        while written.value == written_before:
+            if not writer.is_alive():
+                raise RuntimeError("The writer process exited before writing")
+        written_before = written.value
+        try:
+            count, latencies, errors = read_for(read, args.readers, args.seconds)
+        finally:
+            stop.set()
+            writes = written.value - written_before
+            writer.join()
+        p99 = latencies[int(len(latencies) * 0.99)] if latencies else float("nan")
+        print(
+            f"  {name:26s}: {count / args.seconds:9.1f} reads/s, "
+            f"p99 {p99 * 1e3:8.1f} ms, errors {errors}, "
+            f"writes {writes / args.seconds:7.1f} /s"
+        )
+
+
+if __name__ == "__main__":
+    main()
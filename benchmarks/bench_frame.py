@@ -0,0 +1,109 @@
+"""Benchmark of WorkEntryFrame against lists of view models for chart data and aggregation.
+
+Usage:
+    python -m benchmarks.bench_frame [--rows 100000] [--days 30] [--repeat 5]
+"""
+import argparse
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from typing import Callable, Dict
+
+from ._database import bind_temporary_database, seed_work_entries
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best seconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        best = min(best, perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    # NOTE: Whole work entries per day, so that none crosses midnight and both sides read the same ones
+    rows_per_day = args.rows // args.days
+    seed_work_entries(
+        filename,
+        rows_per_day * args.days,
+        task_count=50,
+        until=datetime.combine(date.today(), time.min),
+        span=timedelta(days=1) / rows_per_day,
+    )
+
+    # pylint: disable=import-outside-toplevel
+    import pandas as pd
+
+    from productivity_tracker import business_logic as logic
+
+    start, end = date.today() - timedelta(days=args.days), date.today()
+    frame = logic.WorkEntry.acquire_frame_between(start, end)
+    work_entries = [
+        work_entry
+        for day in range(args.days)
+        for work_entry in logic.WorkEntry.acquire_all_finished_by_date(start + timedelta(days=day))
+    ]
+    assert len(frame) == len(work_entries)
+
+    def dataframe_from_dicts() -> pd.DataFrame:
+        return pd.DataFrame(
+            [
+                {"job": str(w.task), "start": w.start, "end": w.end, "status": "Finished"}
+                for w in work_entries
+            ]
+        )
+
+    def dataframe_from_frame() -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "job": frame.task_labels(),
+                "start": frame.starts,
+                "end": frame.ends_at(),
+                "status": "Finished",
+            }
+        )
+
+    def totals_from_view_models() -> Dict[int, float]:
+        totals: Dict[int, float] = {}
+        for w in work_entries:
+            assert w.end is not None
+            totals[w.task.id] = totals.get(w.task.id, 0.0) + (w.end - w.start).total_seconds()
+        return totals
+
+    def totals_from_frame() -> Dict[int, float]:
+        return frame.total_seconds_by_task()
+
+    assert totals_from_view_models().keys() == totals_from_frame().keys()
+
+    print(f"work entries: {len(frame)} over {args.days} days")
+    for name, reference, columnar in [
+        ("chart DataFrame", dataframe_from_dicts, dataframe_from_frame),
+        ("per-task totals", totals_from_view_models, totals_from_frame),
+        (
+            "fill from database",
+            lambda: [
+                logic.WorkEntry.acquire_all_finished_by_date(start + timedelta(days=day))
+                for day in range(args.days)
+            ],
+            lambda: logic.WorkEntry.acquire_frame_between(start, end),
+        ),
+    ]:
+        reference_seconds = measure(reference, args.repeat)
+        columnar_seconds = measure(columnar, args.repeat)
+        print(
+            f"  {name:20s}: frame {columnar_seconds * 1e3:8.1f} ms, "
+            f"record list {reference_seconds * 1e3:8.1f} ms "
+            f"(x{reference_seconds / columnar_seconds:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark of what the instrumentation costs, disabled as by default and enabled with a trace file.
+
+Disabled, business logic is not wrapped and statements are not timed, so what remains is the check
+each colleague and chart builder makes for a trace. Enabled, every call and statement becomes a span.
+
+Usage:
+    python -m benchmarks.bench_instrumentation [--calls 10000] [--reruns 20]
+"""
+import argparse
+import os
+import tempfile
+from time import perf_counter
+from typing import Callable, List
+
+from ._database import bind_temporary_database, seed_work_entries
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def per_call(func: Callable[[], object], calls: int) -> float:
+    """Return the best microseconds per call over three rounds."""
+    best = float("inf")
+    for _ in range(3):
+        started = perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, (perf_counter() - started) / calls)
+    return best * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=10_000)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    seed_work_entries(filename, 200, task_count=20)
+
+    # pylint: disable=import-outside-toplevel
+    from streamlit.testing.v1 import AppTest
+
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker.instrumentation import instrument, traced, tracer
+
+    def plain() -> None:
+        pass
+
+    render = traced("render")(plain)
+
+    def acquire() -> object:
+        return logic.Task.acquire_keys_after(0, 10)
+
+    app = AppTest.from_file(MAIN, default_timeout=60)
+
+    def rerun_ms() -> float:
+        timings: List[float] = []
+        for _ in range(args.reruns):
+            started = perf_counter()
+            app.run()
+            timings.append(perf_counter() - started)
+            assert not app.exception, [e.value for e in app.exception]
+        return sorted(timings)[len(timings) // 2] * 1e3
+
+    # NOTE: Disabled first, as business logic cannot be unwrapped once instrumented
+    tracer.configure(None, False)
+    app.run()
+    disabled = (
+        per_call(plain, args.calls),
+        per_call(render, args.calls),
+        per_call(acquire, args.calls),
+        rerun_ms(),
+    )
+
+    # NOTE: Calls are traced for the debug panel only, as their spans would make a huge line in the trace file
+    tracer.configure(None, True)
+    instrument(logic)
+    with tracer.rerun():
+        enabled = (
+            per_call(plain, args.calls),
+            per_call(render, args.calls),
+            per_call(acquire, args.calls),
+        )
+    # NOTE: Each rerun of main.py appends a line to the trace file, on top of drawing the debug panel
+    trace_file = os.path.join(tempfile.mkdtemp(prefix="my-work-tracker-trace-"), "trace.jsonl")
+    tracer.configure(trace_file, True)
+    enabled = (*enabled, rerun_ms())
+
+    print(f"calls: {args.calls}, reruns of main.py: {args.reruns}")
+    print(f"  plain function            {disabled[0]:8.3f} us")
+    print(f"  traced colleague          {disabled[1]:8.3f} us disabled, {enabled[1]:8.3f} us enabled")
+    print(f"  business logic with SQL   {disabled[2]:8.3f} us disabled, {enabled[2]:8.3f} us enabled")
+    print(f"  rerun of main.py          {disabled[3]:8.1f} ms disabled, {enabled[3]:8.1f} ms enabled")
+    with open(trace_file, encoding="utf-8") as file:
+        print(f"  trace file: {sum(1 for _ in file)} reruns, {os.path.getsize(trace_file) / 2**10:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
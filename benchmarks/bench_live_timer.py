@@ -0,0 +1,112 @@
+"""Benchmark of a tick of the live timer against a full rerun, with a work entry in progress.
+
+A tick runs what the fragments of the timer and the timeline run on their own, through Streamlit's AppTest
+in the session state left by a full run of main.py. Statements are counted on the database of the application.
+
+Usage:
+    python -m benchmarks.bench_live_timer [--rows 500] [--repeat 20]
+"""
+import argparse
+import os
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Tuple
+
+from ._database import bind_temporary_database, seed_work_entries
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def script(main: str) -> None:
+    """Run main.py in full, only the fragments once the session has been set up by a full run, or nothing."""
+    # pylint: disable=import-outside-toplevel,reimport,redefined-outer-name
+    import runpy
+
+    import streamlit as st
+
+    from productivity_tracker import locale
+    from productivity_tracker.app_state import AppState
+    from productivity_tracker.colleagues.task_timer import draw_elapsed_time
+    from productivity_tracker.colleagues.timeline_chart import draw_timeline
+
+    app_state = AppState(state=st.session_state)
+    # NOTE: A run of the whole script drops the widgets it does not draw, unlike a fragment rerun,
+    #       so the ones the fragments read are carried over by hand
+    keys = [str(app_state.key_date_selection.input), str(app_state.key_working_hours_schedule.slider)]
+    mode = st.session_state.get("bench_mode", "full")
+    if mode == "empty":
+        return
+    if mode == "tick":
+        for key in keys:
+            st.session_state[key] = st.session_state[f"bench_{key}"]
+        # NOTE: A fragment reuses the AppState of the last full run, whose language the controller set
+        app_state.set_language(locale.LanguageEN())
+        draw_elapsed_time(app_state)
+        draw_timeline(app_state)
+    else:
+        runpy.run_path(main)
+        for key in keys:
+            st.session_state[f"bench_{key}"] = st.session_state[key]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    # NOTE: Finished work entries fill today up to an hour ago, then one is started
+    now = datetime.now()
+    day_start = datetime.combine(date.today(), datetime.min.time())
+    seed_work_entries(
+        filename,
+        args.rows,
+        task_count=20,
+        until=now - timedelta(hours=1),
+        span=(now - timedelta(hours=1) - day_start) / args.rows,
+    )
+
+    # pylint: disable=import-outside-toplevel
+    from streamlit.testing.v1 import AppTest
+
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker.data.connection import DatabaseSingleton
+
+    logic.Report.rebuild()
+    logic.WorkEntry.start(1)
+    db = DatabaseSingleton.get_instance()
+    app = AppTest.from_function(script, args=(MAIN,), default_timeout=60)
+    app.run()
+    assert not app.exception, [e.value for e in app.exception]
+
+    def measure(mode: str) -> Tuple[float, float]:
+        """Return the median milliseconds and statements per run."""
+        app.session_state["bench_mode"] = mode
+        timings, statements = [], []
+        for _ in range(args.repeat):
+            with db.count_statements() as counter:
+                started = perf_counter()
+                app.run()
+                timings.append(perf_counter() - started)
+            assert not app.exception, [e.value for e in app.exception]
+            statements.append(counter.count)
+        return sorted(timings)[len(timings) // 2] * 1e3, sorted(statements)[len(statements) // 2]
+
+    full_milliseconds, full_statements = measure("full")
+    tick_milliseconds, tick_statements = measure("tick")
+    # NOTE: What AppTest itself costs per run, included in both of the above
+    empty_milliseconds, _ = measure("empty")
+    print(
+        f"work entries: {args.rows} with one in progress, runs: {args.repeat}, "
+        f"AppTest overhead {empty_milliseconds:.1f} ms per run"
+    )
+    print(f"full rerun: {full_milliseconds:7.1f} ms, {full_statements:3.0f} statements")
+    print(
+        f"tick:       {tick_milliseconds:7.1f} ms, {tick_statements:3.0f} statements "
+        f"(x{full_milliseconds / tick_milliseconds:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Load test of one server shared by several people, each session clicking through main.py at once.
+
+Each session is an AppTest of main.py clicking like a person, with a rerun after every change like in the browser:
+it starts and stops the timer on a task, adds a work entry by hand in a free slot of today
+and changes the task of a row in the work log. As the page only lets today be filled in,
+the sessions share one day of one SQLite file, like people sharing the server.
+The number of sessions grows step by step, and each step reports the latency of the reruns,
+their throughput and the errors, split into lock waits that timed out and refusals of business logic,
+e.g. starting while the work entry another session started is in progress.
+
+AppTest swaps global state of Streamlit while it runs, so the sessions run in processes of their own
+instead of threads of one server. They contend for the SQLite file the same way, but do not share
+the process-wide caches, so that each session reads what a server would have read once for all.
+A lower TIMEOUT makes lock waits give up sooner, e.g. to see where they start.
+
+Usage:
+    python -m benchmarks.bench_load [--sessions 1,2,4,8] [--iterations 5] [--tasks 50]
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import random
+import threading
+import traceback
+import warnings
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Barrier
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+from ._database import bind_temporary_database, seed_work_entries
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+# NOTE: Work entries added by hand take one step of the slider, away from the timer's around now
+SLOT = timedelta(minutes=15)
+TIMER_MARGIN = timedelta(hours=1)
+# NOTE: Spawning a session imports Streamlit and runs main.py once before the step starts
+SPAWN_TIMEOUT_SECONDS = 300.0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def free_slots(now: datetime) -> List[datetime]:
+    """Return the starts of the slots of today for the work entries added by hand."""
+    midnight = datetime.combine(now.date(), time.min)
+    # NOTE: The last slot would end at midnight, which the slider takes as the start of the day
+    starts = (midnight + SLOT * i for i in range(int(timedelta(days=1) / SLOT) - 1))
+    return [start for start in starts if abs(start - now) > TIMER_MARGIN]
+
+
+def find_data_editor(app: Any, key_prefix: str) -> Any:
+    """Return the data editor whose key starts with the prefix, None if it is not drawn."""
+    return next(
+        (node for node in app.dataframe if (node.key or "").startswith(key_prefix)), None
+    )
+
+
+def edit_data_editor(app: Any, editor: Any, edited_rows: Dict[str, Dict[str, Any]]) -> None:
+    """Send edits of the data editor with the next run, as the browser does when cells are edited.
+
+    AppTest cannot edit a data editor, so the element is swapped for a widget sending the edits as its value.
+    """
+    # pylint: disable=import-outside-toplevel
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+    from streamlit.testing.v1.element_tree import Block, Widget
+
+    class DataEditor(Widget):
+        def __init__(self) -> None:
+            super().__init__(editor.proto, editor.root)
+            self.type = "data_editor"
+            self._value = {"edited_rows": edited_rows, "added_rows": [], "deleted_rows": []}
+
+        @property
+        def _widget_state(self) -> WidgetState:
+            state = WidgetState()
+            state.id = self.id
+            state.string_value = json.dumps(self._value)
+            return state
+
+        @property
+        def value(self) -> Any:
+            return self._value
+
+    def swap(block: Block) -> bool:
+        for index, node in block.children.items():
+            if node is editor:
+                block.children[index] = DataEditor()
+                return True
+            if isinstance(node, Block) and swap(node):
+                return True
+        return False
+
+    if not swap(app._tree):  # pylint: disable=protected-access
+        raise ValueError("The data editor is not in the tree")
+
+
+class Session:
+    """A person clicking through the page, filling in today."""
+
+    def __init__(self, seed: int, slots: List[datetime]) -> None:
+        # pylint: disable=import-outside-toplevel
+        from streamlit.testing.v1 import AppTest
+
+        self.app = AppTest.from_file(MAIN, default_timeout=120)
+        self.slots = slots
+        self.random = random.Random(seed)
+        self.latencies: List[float] = []
+        self.outcomes: Counter = Counter()
+        self.refusals: Counter = Counter()
+
+    def rerun(self, action: Callable[[], Any]) -> None:
+        """Apply the change, rerun the script and record its latency and outcome."""
+        action()
+        started = perf_counter()
+        self.app.run()
+        self.latencies.append(perf_counter() - started)
+        messages = [str(e.value) for e in self.app.exception] + [str(e.value) for e in self.app.error]
+        if not messages:
+            self.outcomes["ok"] += 1
+        elif any("locked" in message or "busy" in message for message in messages):
+            self.outcomes["lock wait"] += 1
+        else:
+            self.outcomes["refused"] += 1
+            # NOTE: Ids vary, so refusals are told apart by their messages without digits
+            self.refusals.update({"".join(c for c in m if not c.isdigit()) for m in messages})
+        if self.app.exception:
+            # NOTE: An exception stops drawing the page, which the person reloads
+            self.app.run()
+            if self.app.exception:
+                raise RuntimeError([str(e.value) for e in self.app.exception])
+
+    def iterate(self) -> None:
+        # pylint: disable=import-outside-toplevel
+        from productivity_tracker.app_state import KeyTaskAdditionManually, KeyTaskLogs, KeyTaskTimer
+
+        app = self.app
+
+        def select(key: str) -> None:
+            selectbox = app.selectbox(key=key)
+            selectbox.select_index(self.random.randrange(len(selectbox.options)))
+
+        # NOTE: Buttons are clicked only when enabled, as the browser would not let them be clicked
+        self.rerun(lambda: select(str(KeyTaskTimer.selectbox)))
+        if not app.button(key=str(KeyTaskTimer.button_start)).disabled:
+            self.rerun(lambda: app.button(key=str(KeyTaskTimer.button_start)).click())
+        if not app.button(key=str(KeyTaskTimer.button_stop)).disabled:
+            self.rerun(lambda: app.button(key=str(KeyTaskTimer.button_stop)).click())
+
+        start = self.slots.pop(0)
+        self.rerun(lambda: select(str(KeyTaskAdditionManually.selectbox)))
+        self.rerun(
+            lambda: app.slider(key=str(KeyTaskAdditionManually.slider)).set_value(
+                (start.time(), (start + SLOT).time())
+            )
+        )
+        self.rerun(lambda: app.button(key=str(KeyTaskAdditionManually.button)).click())
+
+        editor = find_data_editor(app, str(KeyTaskLogs.editor))
+        if editor is None:
+            return
+        row = self.random.randrange(len(editor.value))
+        # NOTE: The task column always offers the tasks of the rows on the page
+        labels = sorted(set(editor.value["task"]))
+        label = labels[self.random.randrange(len(labels))]
+
+        def edit_task_logs() -> None:
+            edit_data_editor(app, editor, {str(row): {"task": label}})
+            app.button(key=str(KeyTaskLogs.button)).click()
+
+        self.rerun(edit_task_logs)
+
+
+def run_session(
+    filename: str, seed: int, slots: List[datetime], iterations: int, opened: Barrier, results: Queue
+) -> None:
+    """Open the page, wait for the other sessions, then click through the iterations and put the results."""
+    os.environ["FILENAME"] = filename
+    # NOTE: Bare mode warns on every rerun, and exceptions of the app are counted instead of logged
+    logging.disable(logging.CRITICAL)
+    warnings.simplefilter("ignore")
+
+    try:
+        session = Session(seed, slots)
+        session.app.run()
+    except Exception:  # pylint: disable=broad-except
+        opened.abort()
+        results.put(([], {}, {}, traceback.format_exc()))
+        return
+    opened.wait(SPAWN_TIMEOUT_SECONDS)
+    error = None
+    try:
+        for _ in range(iterations):
+            session.iterate()
+    except Exception:  # pylint: disable=broad-except
+        error = traceback.format_exc()
+    results.put((session.latencies, dict(session.outcomes), dict(session.refusals), error))
+
+
+def run_step(
+    filename: str, sessions: int, iterations: int, slots: List[datetime], seed: int
+) -> Dict[str, Any]:
+    """Run the sessions at once, from when they have all opened the page until the last one is done."""
+    context = multiprocessing.get_context("spawn")
+    opened = context.Barrier(sessions + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=run_session,
+            args=(
+                filename,
+                seed + i,
+                slots[i * iterations : (i + 1) * iterations],
+                iterations,
+                opened,
+                results,
+            ),
+        )
+        for i in range(sessions)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        opened.wait(SPAWN_TIMEOUT_SECONDS)
+    except threading.BrokenBarrierError:
+        _, _, _, error = results.get(timeout=SPAWN_TIMEOUT_SECONDS)
+        raise RuntimeError(f"A session failed to open the page:\n{error}") from None
+    started = perf_counter()
+    collected: List[Tuple[List[float], Dict[str, int], Dict[str, int], str | None]] = [
+        results.get() for _ in range(sessions)
+    ]
+    seconds = perf_counter() - started
+    for process in processes:
+        process.join()
+    for _, _, _, error in collected:
+        if error is not None:
+            raise RuntimeError(f"A session failed:\n{error}")
+
+    latencies = sorted(latency for session_latencies, *_ in collected for latency in session_latencies)
+    outcomes: Counter = sum((Counter(session_outcomes) for _, session_outcomes, *_ in collected), Counter())
+    refusals: Counter = sum((Counter(session_refusals) for _, _, session_refusals, _ in collected), Counter())
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "seconds": seconds,
+        "reruns_per_second": len(latencies) / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p95_ms": percentile(latencies, 0.95) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "lock_waits": outcomes["lock wait"],
+        "refused": outcomes["refused"],
+        "refusals": dict(refusals.most_common()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", default="1,2,4,8", help="Session counts, comma separated")
+    parser.add_argument("--iterations", type=int, default=5, help="Per session")
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file the results are written to")
+    args = parser.parse_args()
+    session_counts = [int(count) for count in args.sessions.split(",")]
+    slots = free_slots(datetime.now())
+    if sum(session_counts) * args.iterations > len(slots):
+        parser.error(f"today has {len(slots)} free slots for sessions x iterations work entries")
+
+    filename = bind_temporary_database()
+    # NOTE: A history a year back, away from today which the sessions fill in
+    seed_work_entries(
+        filename,
+        2000,
+        task_count=args.tasks,
+        until=datetime.combine(date.today() - timedelta(days=365), time.min),
+    )
+
+    steps = []
+    print(f"iterations per session: {args.iterations}, tasks: {args.tasks}, database: {filename}")
+    print(
+        f"{'sessions':>8} {'reruns':>7} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'lock waits':>10} {'refused':>8}"
+    )
+    for sessions in session_counts:
+        step = run_step(filename, sessions, args.iterations, slots, args.seed)
+        # NOTE: Every step adds its work entries in slots no other step has taken
+        slots = slots[sessions * args.iterations :]
+        steps.append(step)
+        print(
+            f"{step['sessions']:8d} {step['reruns']:7d} {step['reruns_per_second']:9.1f} "
+            f"{step['p50_ms']:8.1f} {step['p95_ms']:8.1f} {step['p99_ms']:8.1f} "
+            f"{step['lock_waits']:10d} {step['refused']:8d}"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"iterations": args.iterations, "tasks": args.tasks, "steps": steps}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
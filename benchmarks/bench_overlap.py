@@ -0,0 +1,100 @@
+"""Benchmark of the overlap checks backing the "no multitasking" validation.
+
+Usage:
+    python -m benchmarks.bench_overlap [--entries 100000] [--probes 1000]
+"""
+import argparse
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from ._database import bind_temporary_database, seed_work_entries, to_sql_datetime
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the mean seconds per call."""
+    started = perf_counter()
+    for _ in range(repeat):
+        func()
+    return (perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--probes", type=int, default=1_000)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    seed_work_entries(filename, args.entries)
+
+    # pylint: disable=import-outside-toplevel
+    from pony.orm import db_session
+
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker.data import entities as models
+    from productivity_tracker.overlap import IntervalIndex
+
+    with sqlite3.connect(filename) as connection:
+        rows = connection.execute('SELECT id, start, "end" FROM work_entries').fetchall()
+    intervals = [
+        (i, datetime.fromisoformat(start), datetime.fromisoformat(end)) for i, start, end in rows
+    ]
+    first, last = intervals[0][1], intervals[-1][2]
+
+    rng = random.Random(0)
+    probes: List[Tuple[datetime, datetime]] = []
+    for _ in range(args.probes):
+        start = first + timedelta(seconds=rng.randrange(int((last - first).total_seconds())))
+        probes.append((start, start + timedelta(minutes=10)))
+    probe_iter = iter(probes * 2)
+    # NOTE: Within the last day of the history, like the writes of the page, which are for today
+    recent_starts = [last - timedelta(seconds=rng.randrange(86400)) for _ in range(args.probes)]
+    recent_probes = iter([(start, start + timedelta(minutes=10)) for start in recent_starts])
+
+    def probe_sql() -> None:
+        start, end = next(probe_iter)
+        with db_session:
+            models.WorkEntry.select_one_overlapping(start, end)
+
+    def probe_recent_sql() -> None:
+        start, end = next(recent_probes)
+        with db_session:
+            models.WorkEntry.select_one_overlapping(start, end)
+
+    def scan_sql() -> None:
+        start, end = next(probe_iter)
+        with sqlite3.connect(filename) as connection:
+            connection.execute(
+                'SELECT COUNT(*) FROM work_entries WHERE start < ? AND COALESCE("end", ?) > ?',
+                (to_sql_datetime(end), to_sql_datetime(datetime.now()), to_sql_datetime(start)),
+            ).fetchone()
+
+    index = IntervalIndex(intervals)
+    index_probes = iter(probes)
+
+    def probe_index() -> None:
+        start, end = next(index_probes)
+        index.find_overlap(start, end)
+
+    register_probes = iter(probes)
+
+    def register_rejected() -> None:
+        start, end = next(register_probes)
+        try:
+            logic.WorkEntry.register(1, start, end)
+        except logic.LogicException:
+            pass
+
+    print(f"work entries: {len(intervals)}, probes: {args.probes}")
+    print(f"  indexed SQL probe       : {measure(probe_sql, args.probes) * 1e6:10.1f} us/probe")
+    print(f"  ... of the last day     : {measure(probe_recent_sql, args.probes) * 1e6:10.1f} us/probe")
+    print(f"  full scan (reference)   : {measure(scan_sql, min(args.probes, 50)) * 1e6:10.1f} us/probe")
+    print(f"  in-memory IntervalIndex : {measure(probe_index, args.probes) * 1e6:10.1f} us/probe")
+    print(f"  WorkEntry.register      : {measure(register_rejected, args.probes) * 1e6:10.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
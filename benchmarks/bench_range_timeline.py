@@ -0,0 +1,85 @@
+"""Benchmark of the year timeline: totals per month and task against one bar per work entry.
+
+Render cost is the query, the figure and the JSON serialization Streamlit does for every plotly_chart,
+and the payload is the size of that JSON sent to the browser.
+
+Usage:
+    python -m benchmarks.bench_range_timeline [--rows 1000 10000 50000] [--repeat 3]
+"""
+import argparse
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Callable, Tuple
+
+
+def measure(func: Callable[[], str], repeat: int) -> Tuple[float, int]:
+    """Return the best seconds per call and the length of the JSON returned."""
+    best, payload = float("inf"), 0
+    for _ in range(repeat):
+        started = perf_counter()
+        payload = len(func())
+        best = min(best, perf_counter() - started)
+    return best, payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # pylint: disable=import-outside-toplevel
+    import sqlite3
+
+    import plotly.io
+
+    from ._database import bind_temporary_database, seed_work_entries
+
+    filename = bind_temporary_database()
+
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker import charts
+    from productivity_tracker.frames import WorkEntryFrame
+
+    start = date.today().replace(month=1, day=1)
+    end = start.replace(year=start.year + 1)
+    seeded = 0
+    for rows in sorted(args.rows):
+        # NOTE: Each size adds its work entries over the same year, before the ones seeded already
+        with sqlite3.connect(filename) as connection:
+            connection.execute("DELETE FROM work_entries")
+            connection.execute("DELETE FROM tasks")
+        seed_work_entries(
+            filename,
+            rows,
+            task_count=20,
+            until=datetime.combine(end, datetime.min.time()) - timedelta(days=1),
+            span=timedelta(days=360) / rows,
+        )
+        seeded = rows
+        logic.Report.rebuild()
+        logic.cache.clear()
+
+        def render_raw() -> str:
+            # NOTE: What a year view would draw without aggregation, kept here as the reference
+            frame = logic.WorkEntry.acquire_frame_between(start, end)
+            return str(plotly.io.to_json(charts.build_timeline_figure(frame, None), validate=False))
+
+        def render_buckets() -> str:
+            logic.cache.clear()
+            logic.Report.max_raw_bars = 0
+            frame = logic.Report.acquire_range_timeline(start, end, "month")
+            assert not isinstance(frame, WorkEntryFrame), "expected totals"
+            return str(plotly.io.to_json(charts.build_bucket_figure(frame), validate=False))
+
+        raw_seconds, raw_payload = measure(render_raw, args.repeat)
+        bucket_seconds, bucket_payload = measure(render_buckets, args.repeat)
+        print(
+            f"work entries {seeded:6d}: per entry {raw_seconds * 1e3:8.1f} ms {raw_payload / 2**10:8.0f} KiB, "
+            f"per month and task {bucket_seconds * 1e3:6.1f} ms {bucket_payload / 2**10:6.0f} KiB "
+            f"(x{raw_seconds / bucket_seconds:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
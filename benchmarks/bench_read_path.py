@@ -0,0 +1,121 @@
+"""Benchmark of the list screens' read path: plain rows to view models versus Pony entities to view models.
+
+Usage:
+    python -m benchmarks.bench_read_path [--rows 1000 10000 100000] [--repeat 5]
+"""
+import argparse
+import sqlite3
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Callable, List
+
+from ._database import bind_temporary_database, generate_work_entries
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best seconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        best = min(best, perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+
+    # pylint: disable=import-outside-toplevel
+    from pony.orm import db_session
+
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker import view_models
+    from productivity_tracker.data import entities as models
+
+    # NOTE: The read path before the fast path, kept here as the reference
+    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def categories_from_entities() -> List[view_models.ProjectCategory]:
+        return [
+            view_models.ProjectCategory.model_validate(x)
+            for x in models.ProjectCategory.select_all()
+        ]
+
+    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def tasks_from_entities() -> List[view_models.Task]:
+        return [view_models.Task.model_validate(x) for x in models.Task.select_all()]
+
+    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def work_entries_from_entities(__date: date) -> List[view_models.WorkEntry]:
+        return [
+            view_models.WorkEntry.model_validate(x)
+            for x in models.WorkEntry.select_all_finished_by_date(__date)
+        ]
+
+    seeded = 0
+    for i, row_count in enumerate(sorted(args.rows)):
+        # NOTE: Every row count reads its own day, filled with row_count work entries of 100 tasks
+        the_day = date.today() - timedelta(days=i + 2)
+        with sqlite3.connect(filename) as connection:
+            connection.executemany(
+                "INSERT INTO project_categories (name) VALUES (?)",
+                ((f"category-{n}",) for n in range(seeded, row_count)),
+            )
+            connection.executemany(
+                "INSERT INTO tasks (id, name, project_category) VALUES (?, ?, ?)",
+                (
+                    (n + 1, f"task-{n}", f"category-{n}" if n % 2 else None)
+                    for n in range(seeded, row_count)
+                ),
+            )
+            connection.executemany(
+                'INSERT INTO work_entries (task, start, "end") VALUES (?, ?, ?)',
+                generate_work_entries(
+                    row_count,
+                    task_count=100,
+                    until=datetime.combine(the_day + timedelta(days=1), datetime.min.time()),
+                    span=timedelta(days=1) / row_count,
+                ),
+            )
+        seeded = row_count
+
+        def uncached(acquire: Callable[[], object]) -> Callable[[], object]:
+            # NOTE: Measure the read path itself, not the process-wide cache in front of it
+            def wrapper() -> object:
+                logic.cache.clear()
+                return acquire()
+
+            return wrapper
+
+        cases = [
+            (
+                "ProjectCategory.acquire_all",
+                uncached(logic.ProjectCategory.acquire_all),
+                categories_from_entities,
+            ),
+            ("Task.acquire_all", uncached(logic.Task.acquire_all), tasks_from_entities),
+            (
+                "WorkEntry.acquire_all_finished_by_date",
+                lambda: logic.WorkEntry.acquire_all_finished_by_date(the_day),
+                lambda: work_entries_from_entities(the_day),
+            ),
+        ]
+        print(f"rows: {row_count}")
+        for name, fast, reference in cases:
+            # NOTE: Records and pydantic models compare equal when they render the same
+            assert list(map(str, fast())) == list(map(str, reference())), f"{name} differs from the reference"
+            fast_seconds = measure(fast, args.repeat)
+            reference_seconds = measure(reference, args.repeat)
+            print(
+                f"  {name:40s}: rows {fast_seconds * 1e3:9.1f} ms, "
+                f"entities {reference_seconds * 1e3:9.1f} ms "
+                f"(x{reference_seconds / fast_seconds:.1f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
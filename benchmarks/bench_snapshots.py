@@ -0,0 +1,85 @@
+"""Benchmark of the day snapshots shared by every session against each session loading its own copies.
+
+Simulates sessions opening the same day, with another process writing every so often.
+
+Usage:
+    python -m benchmarks.bench_snapshots [--sessions 50] [--rows 500] [--reruns 10] [--write-every 100]
+"""
+import argparse
+import sqlite3
+import tracemalloc
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from typing import Any, List
+
+from ._database import bind_temporary_database, seed_work_entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--write-every", type=int, default=100)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    the_day = date.today() - timedelta(days=1)
+    seed_work_entries(
+        filename,
+        args.rows,
+        task_count=20,
+        until=datetime.combine(date.today(), datetime.min.time()),
+        span=timedelta(days=1) / args.rows,
+    )
+
+    # pylint: disable=import-outside-toplevel
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker.overlap import IntervalIndex
+
+    def load_own_copies() -> Any:
+        # NOTE: What each session held before, kept here as the reference
+        work_entries = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+        in_progress = logic.WorkEntry.acquire_one_in_progress_by_date(the_day)
+        frame = logic.WorkEntry.acquire_frame_by_date(the_day)
+        index = IntervalIndex((w.id, w.start, w.end) for w in work_entries)
+        return work_entries, in_progress, frame, index
+
+    def load_shared() -> Any:
+        return logic.WorkEntry.acquire_day_snapshot(the_day)
+
+    external = sqlite3.connect(filename)
+    print(
+        f"sessions: {args.sessions}, work entries: {args.rows}, reruns per session: {args.reruns}, "
+        f"external write every {args.write_every} reruns"
+    )
+    for round_, (name, load) in enumerate(
+        [("own copies (reference)", load_own_copies), ("shared snapshot", load_shared)]
+    ):
+        logic.snapshots.clear()
+        held: List[Any] = [None] * args.sessions
+        tracemalloc.start()
+        started = perf_counter()
+        for i in range(args.sessions * args.reruns):
+            if i and i % args.write_every == 0:
+                with external:
+                    external.execute(
+                        "INSERT INTO project_categories (name) VALUES (?)", (f"c-{round_}-{i}",)
+                    )
+            held[i % args.sessions] = load()
+        seconds = perf_counter() - started
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"  {name:24s}: {seconds / (args.sessions * args.reruns) * 1e3:7.2f} ms/rerun, "
+            f"{size / 2**20:7.2f} MiB held by all sessions"
+        )
+    snapshots = logic.snapshots
+    print(
+        f"  snapshot cache: hits {snapshots.hits}, misses {snapshots.misses}, "
+        f"invalidations {snapshots.invalidations}, {snapshots.nbytes / 2**10:.1f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark of the task search index against sending every task to the selectboxes.
+
+Sending every task costs str() of each of them per selectbox and rerun, which Streamlit does to label the options.
+The index is built once, takes in new tasks one by one, and answers each search with the top matches only.
+
+Usage:
+    python -m benchmarks.bench_task_search [--tasks 1000 10000 50000] [--limit 50] [--repeat 5]
+"""
+import argparse
+import random
+from time import perf_counter
+from typing import Callable, List
+
+# NOTE: Names are two pseudo-words each, prefixes, typos and ids of which are searched
+QUERIES = ["", "ka", "kamo", "kamoru", "kamorru", "#42"]
+SYLLABLES = ["ka", "mo", "ru", "te", "si", "no", "pa", "ri", "ze", "lu", "bo", "ne", "ta", "gi"]
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best seconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        best = min(best, perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # pylint: disable=import-outside-toplevel
+    from productivity_tracker.search import TaskSearchIndex
+    from productivity_tracker.view_models import ProjectCategoryRecord, TaskRecord
+
+    generator = random.Random(0)
+
+    def word() -> str:
+        return "".join(generator.choices(SYLLABLES, k=generator.randint(2, 4)))
+
+    categories = [ProjectCategoryRecord(word()) for _ in range(100)]
+    for count in args.tasks:
+        tasks = [
+            TaskRecord(
+                i,
+                f"{word()} {word()}",
+                None if i % 10 == 0 else categories[i % len(categories)],
+            )
+            for i in range(1, count + 1)
+        ]
+        recent = generator.sample(range(1, count + 1), 20)
+
+        def label_all() -> List[str]:
+            # NOTE: What every selectbox did on every rerun before, kept here as the reference
+            return [str(task) for task in tasks]
+
+        index = TaskSearchIndex()
+
+        def build() -> None:
+            nonlocal index
+            index = TaskSearchIndex(tasks)
+
+        build_seconds = measure(build, 1)
+        added = TaskRecord(count + 1, "added-task", categories[0])
+        add_seconds = measure(lambda: index.add(added), 1)
+        assert index.search("added-task", 1)[0] is added, "a new task must be found at once"
+        first = index.search(tasks[-1].name, 1)[0]
+        assert first.name == tasks[-1].name, "an exact name must come first"
+
+        label_seconds = measure(label_all, args.repeat)
+        print(
+            f"tasks {count:6d}: label every task {label_seconds * 1e3:7.2f} ms, "
+            f"build the index {build_seconds * 1e3:8.1f} ms, add a task {add_seconds * 1e3:6.3f} ms"
+        )
+        for query in QUERIES:
+
+            def search_and_label() -> List[str]:
+                return [str(task) for task in index.search(query, args.limit, recent)]
+
+            seconds = measure(search_and_label, args.repeat)
+            print(
+                f"    search {query!r:10} top {args.limit}: {seconds * 1e3:7.2f} ms "
+                f"(x{label_seconds / seconds:.1f}), {len(search_and_label())} options"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark of the timeline figure: graph_objects bars over arrays, cached, against plotly.express over a DataFrame.
+
+Render cost includes the JSON serialization Streamlit does for every plotly_chart.
+
+Usage:
+    python -m benchmarks.bench_timeline [--bars 10 1000 10000] [--repeat 5]
+"""
+import argparse
+from datetime import date, datetime, time, timedelta
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best seconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        best = min(best, perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bars", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # pylint: disable=import-outside-toplevel
+    import pandas as pd
+    import plotly.io
+    from plotly import express as px
+
+    from productivity_tracker import charts
+    from productivity_tracker.frames import DATETIME_DTYPE, WorkEntryFrame
+
+    day_start = datetime.combine(date.today(), time.min)
+    schedule = (day_start + timedelta(hours=9), day_start + timedelta(hours=18))
+    now = day_start + timedelta(hours=23, minutes=59)
+
+    def make_frame(bars: int) -> WorkEntryFrame:
+        # NOTE: Bars split the day evenly among 20 tasks, and the last one is in progress
+        span = np.timedelta64(timedelta(hours=23) // bars)
+        starts = np.datetime64(day_start, "us") + span * np.arange(bars)
+        ends = starts + span // 2
+        ends[-1] = np.datetime64("NaT")
+        task_ids = np.arange(bars, dtype=np.int64) % 20 + 1
+        return WorkEntryFrame(
+            ids=np.arange(1, bars + 1, dtype=np.int64),
+            task_ids=task_ids,
+            starts=starts.astype(DATETIME_DTYPE),
+            ends=ends.astype(DATETIME_DTYPE),
+            tasks={task_id: (f"task-{task_id}", None) for task_id in range(1, 21)},
+        )
+
+    for bars in args.bars:
+        frame = make_frame(bars)
+
+        def render_express() -> str:
+            # NOTE: The figure built on every rerun before, kept here as the reference
+            df = pd.DataFrame(
+                {
+                    "job": frame.task_labels(),
+                    "start": frame.starts,
+                    "end": frame.ends_at(now),
+                    "status": np.where(frame.in_progress, "InProgress", "Finished"),
+                }
+            )
+            figure = px.timeline(df, x_start="start", x_end="end", y="job", color="status")
+            figure.update_yaxes(autorange="reversed")
+            figure.add_vline(x=schedule[0])
+            figure.add_vline(x=schedule[1])
+            return str(plotly.io.to_json(figure, validate=False))
+
+        def render_built() -> str:
+            figure = charts.build_timeline_figure(frame, schedule, now)
+            return str(plotly.io.to_json(figure, validate=False))
+
+        cached = charts.build_timeline_figure(frame, schedule, now)
+
+        def render_cached() -> str:
+            charts.timeline_key(frame, schedule)
+            charts.update_in_progress_end(cached, frame, now)
+            return str(plotly.io.to_json(cached, validate=False))
+
+        # NOTE: Both figures must draw the same bars, whichever trace they are in
+        reference = plotly.io.from_json(render_express())
+        built = plotly.io.from_json(render_built())
+        assert sorted(x for trace in reference.data for x in trace.x) == sorted(
+            x for trace in built.data for x in trace.x
+        ), "bars differ from the reference"
+
+        express_seconds = measure(render_express, args.repeat)
+        built_seconds = measure(render_built, args.repeat)
+        cached_seconds = measure(render_cached, args.repeat)
+        print(
+            f"bars {bars:6d}: express {express_seconds * 1e3:8.1f} ms, "
+            f"graph_objects {built_seconds * 1e3:8.1f} ms (x{express_seconds / built_seconds:.1f}), "
+            f"cached {cached_seconds * 1e3:8.1f} ms (x{express_seconds / cached_seconds:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark of the identity-mapped records against pydantic view models built on every rerun.
+
+Measures the time and the memory allocated to build the task list and the work entries of a day,
+and the time to look each work entry's task up in the task list as the task logs do.
+
+Usage:
+    python -m benchmarks.bench_view_models [--tasks 200] [--rows 200] [--repeat 5]
+"""
+import argparse
+import sqlite3
+import tracemalloc
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, Callable, List, Tuple
+
+from ._database import bind_temporary_database, generate_work_entries
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best seconds per call."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = perf_counter()
+        func()
+        best = min(best, perf_counter() - started)
+    return best
+
+
+def allocated(func: Callable[[], object]) -> int:
+    """Return the bytes still allocated by the result of one call."""
+    tracemalloc.start()
+    try:
+        result = func()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    the_day = date.today() - timedelta(days=1)
+    with sqlite3.connect(filename) as connection:
+        connection.executemany(
+            "INSERT INTO project_categories (name) VALUES (?)",
+            ((f"category-{n}",) for n in range(10)),
+        )
+        connection.executemany(
+            "INSERT INTO tasks (id, name, project_category) VALUES (?, ?, ?)",
+            ((n + 1, f"task-{n}", f"category-{n % 10}") for n in range(args.tasks)),
+        )
+        connection.executemany(
+            'INSERT INTO work_entries (task, start, "end") VALUES (?, ?, ?)',
+            generate_work_entries(
+                args.rows,
+                task_count=min(args.tasks, 20),
+                until=datetime.combine(date.today(), datetime.min.time()),
+                span=timedelta(days=1) / args.rows,
+            ),
+        )
+
+    # pylint: disable=import-outside-toplevel
+    from pony.orm import db_session
+
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker import view_models
+    from productivity_tracker.data import entities as models
+
+    with db_session(strict=True):
+        task_rows = list(models.Task.select_all_rows())
+        work_entry_rows = models.WorkEntry.parse_rows(
+            models.WorkEntry.select_rows_between(*models.day_range(the_day))
+        )
+
+    def build_pydantic() -> Tuple[List[Any], List[Any]]:
+        # NOTE: The view models validated from entities on every rerun, kept here as the reference.
+        #       Namespaces stand for the Pony entities, so that only the view models are measured.
+        def entity(task_id: int, name: str, category: str | None) -> SimpleNamespace:
+            project_category = None if category is None else SimpleNamespace(name=category)
+            return SimpleNamespace(id=task_id, name=name, project_category=project_category)
+
+        tasks = [view_models.Task.model_validate(entity(*row)) for row in task_rows]
+        work_entries = [
+            view_models.WorkEntry.model_validate(
+                SimpleNamespace(id=row_id, task=entity(*task), start=start, end=end)
+            )
+            for row_id, start, end, *task in work_entry_rows
+        ]
+        return tasks, work_entries
+
+    def build_records() -> Tuple[List[Any], List[Any]]:
+        # NOTE: One map per data version, so later reruns reuse the records of the first one
+        identity_map = logic.acquire_identity_map()
+        tasks = [identity_map.task(*row) for row in task_rows]
+        return tasks, identity_map.work_entries(work_entry_rows)
+
+    def build_records_fresh() -> Tuple[List[Any], List[Any]]:
+        logic.cache.clear()
+        return build_records()
+
+    reference, fast = build_pydantic(), build_records()
+    assert list(map(str, reference[1])) == list(map(str, fast[1]))
+
+    def index_of(built: Tuple[List[Any], List[Any]]) -> Callable[[], object]:
+        tasks, work_entries = built
+        return lambda: [tasks.index(w.task) for w in work_entries]
+
+    print(f"tasks: {args.tasks}, work entries: {len(work_entry_rows)}")
+    for name, func in [
+        ("pydantic (reference)", build_pydantic),
+        ("records, new version", build_records_fresh),
+        ("records, same version", build_records),
+    ]:
+        seconds = measure(func, args.repeat)
+        print(f"  {name:22s}: {seconds * 1e3:8.2f} ms/rerun, {allocated(func) / 1024:9.1f} KiB")
+    for name, built in [("pydantic (reference)", reference), ("records", fast)]:
+        seconds = measure(index_of(built), args.repeat)
+        print(f"  {name:22s}: task lookups {seconds * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
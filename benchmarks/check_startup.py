@@ -0,0 +1,154 @@
+"""Check the cold start of the application against budgets, based on `python -X importtime`.
+
+Each import runs in a fresh interpreter. Own import time sums the self time of the modules of
+productivity_tracker only, so that the budgets do not depend on how fast Streamlit or NumPy import.
+The command-line client is checked on the modules it imports, and timed as a whole, from a fresh interpreter to its
+output, over the bare interpreter. The median of the runs is taken with headroom, as a single-CPU machine swings
+by tens of milliseconds, so that the timing only catches what the imported modules do not show.
+First render is the first run of main.py through Streamlit's AppTest.
+
+Usage:
+    python -m benchmarks.check_startup [--repeat 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from ._database import bind_temporary_database
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "productivity_tracker"
+
+# NOTE: Modules each import must not pull in, and the budgets of the own import time in milliseconds
+IMPORTS: Dict[str, Tuple[List[str], float]] = {
+    PACKAGE: (["streamlit", "pandas", "plotly.express", "numpy", "pony", f"{PACKAGE}.business_logic"], 5.0),
+    f"{PACKAGE}.business_logic": (["streamlit", "pandas", "plotly.express", "numpy"], 60.0),
+    f"{PACKAGE}.controller": (["pandas", "plotly.express"], 150.0),
+}
+# NOTE: Most of it is Pony ORM and pydantic importing, binding and the command take about 15 ms.
+#       Settings and view models build no pydantic validator on the way, and instrumentation is not imported
+CLI_COMMAND = ["track.py", "--json", "status"]
+CLI_FORBIDDEN = ["streamlit", "pandas", "plotly", "numpy", f"{PACKAGE}.instrumentation"]
+CLI_BUDGET_MS = 400.0
+FIRST_RENDER_BUDGET_SECONDS = 5.0
+
+
+def import_in_fresh_interpreter(module: str, filename: str) -> Tuple[float, List[str]]:
+    """Import a module in a new interpreter.
+
+    Returns:
+        Tuple[float, List[str]]: Own import time in milliseconds and the names of the modules imported
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {module}; print('\\n'.join(sys.modules))",
+        ],
+        cwd=ROOT,
+        env={**os.environ, "FILENAME": filename},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    own_microseconds = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        if name.strip().split(".")[0] == PACKAGE:
+            own_microseconds += int(self_time)
+    return own_microseconds / 1e3, result.stdout.split()
+
+
+def run_in_fresh_interpreter(arguments: List[str], filename: str, importtime: bool = False) -> Tuple[float, str]:
+    """Run the interpreter with the arguments.
+
+    Returns:
+        Tuple[float, str]: Wall-clock milliseconds and what was written to stderr
+    """
+    started = perf_counter()
+    result = subprocess.run(
+        [sys.executable, *(["-X", "importtime"] if importtime else []), *arguments],
+        cwd=ROOT,
+        env={**os.environ, "FILENAME": filename},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return (perf_counter() - started) * 1e3, result.stderr
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    filename = bind_temporary_database()
+    failed = False
+    for module, (forbidden, budget) in IMPORTS.items():
+        timings = []
+        for _ in range(args.repeat):
+            milliseconds, imported = import_in_fresh_interpreter(module, filename)
+            timings.append(milliseconds)
+        best = min(timings)
+        pulled_in = sorted(set(forbidden) & set(imported))
+        ok = best <= budget and not pulled_in
+        failed |= not ok
+        print(
+            f"{'OK' if ok else 'NG'} import {module}: own {best:6.1f} ms (budget {budget:.0f} ms)"
+            + (f", pulls in {pulled_in}" if pulled_in else "")
+        )
+
+    # NOTE: Runs alternate, so that a slow spell of the machine weighs on both the same
+    runs = [
+        (run_in_fresh_interpreter(["-c", "pass"], filename)[0], run_in_fresh_interpreter(CLI_COMMAND, filename)[0])
+        for _ in range(args.repeat)
+    ]
+    over_interpreter = median(client - bare for bare, client in runs)
+    _, stderr = run_in_fresh_interpreter(CLI_COMMAND, filename, importtime=True)
+    imported = {line.split("|")[-1].strip() for line in stderr.splitlines() if line.startswith("import time:")}
+    pulled_in = sorted(
+        name for name in imported if any(name == top or name.startswith(f"{top}.") for top in CLI_FORBIDDEN)
+    )
+    ok = over_interpreter <= CLI_BUDGET_MS and not pulled_in
+    failed |= not ok
+    print(
+        f"{'OK' if ok else 'NG'} {' '.join(CLI_COMMAND)}: {over_interpreter:6.1f} ms over the interpreter "
+        f"(budget {CLI_BUDGET_MS:.0f} ms)" + (f", pulls in {pulled_in[:5]}" if pulled_in else "")
+    )
+
+    # pylint: disable=import-outside-toplevel
+    from streamlit.testing.v1 import AppTest
+
+    from productivity_tracker.data.connection import DatabaseSingleton
+    from productivity_tracker.data.entities import SCHEMA_VERSION
+
+    # NOTE: The database of bind_temporary_database() is current, so its tables are not checked again
+    checked = DatabaseSingleton.get_instance().ensure_mapping(
+        SCHEMA_VERSION, journal_mode="wal", create_tables=True
+    )
+    print(f"{'NG' if checked else 'OK'} tables checked again once current: {checked}")
+    failed |= checked
+
+    app = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=60)
+    started = perf_counter()
+    app.run()
+    seconds = perf_counter() - started
+    ok = not app.exception and seconds <= FIRST_RENDER_BUDGET_SECONDS
+    failed |= not ok
+    print(
+        f"{'OK' if ok else 'NG'} first render: {seconds:.2f} s "
+        f"(budget {FIRST_RENDER_BUDGET_SECONDS:.0f} s), exceptions {[e.value for e in app.exception]}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+"""Benchmark suite of the business and data layers on a synthetic history, checked against a stored baseline.
+
+Times every public method of business_logic, the view-model conversion and the construction of the controller
+against a temporary SQLite file seeded by benchmarks._synthetic, with the caches cleared before each call
+so that what is timed is the load and not a cache hit, unless noted.
+Results are written as JSON. A case is a regression when its median is slower than the baseline's
+by more than the tolerance and by more than the minimum delta, which keeps sub-millisecond noise out,
+after scaling the baseline up by a calibration workload timed at the start, so that a machine running slower
+than when the baseline was recorded does not fail every case.
+
+The baseline is specific to the machine it was recorded on: record it again with --update-baseline
+after changing machines, or after a change that is meant to move the numbers.
+
+Usage:
+    python -m benchmarks.suite [--years 2] [--tasks 2000] [--categories 200] [--seed 0] [--repeat 5]
+        [--output PATH] [--baseline benchmarks/baseline.json] [--tolerance 0.5] [--min-delta-ms 0.5]
+        [--update-baseline]
+"""
+import argparse
+import dataclasses
+import gc
+import inspect
+import json
+import logging
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from importlib.metadata import version
+from itertools import count
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+from ._database import bind_temporary_database
+from ._synthetic import SyntheticCounts, SyntheticSpec, category_name, seed_synthetic
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+PACKAGES = ["pony", "pydantic", "streamlit", "pandas", "numpy"]
+SCHEDULE = (time(9), time(18))
+BATCH_SIZE = 50
+PAGE_SIZE = 1000
+CALIBRATION_REPEAT = 20
+CONFIRM_ATTEMPTS = 2
+ARCHIVE_STEP_DAYS = 30
+
+
+@dataclass
+class Case:
+    run: Callable[[], Any]
+    setup: Callable[[], None] | None = None
+    teardown: Callable[[], None] | None = None
+
+
+def calibrate() -> float:
+    """Return the best milliseconds of a fixed workload of Python and SQLite, to tell how fast the machine is right now."""
+    connection = sqlite3.connect(":memory:")
+    best = float("inf")
+    for _ in range(CALIBRATION_REPEAT):
+        started = perf_counter()
+        connection.execute(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n LIMIT 20000) SELECT sum(i) FROM n"
+        ).fetchone()
+        sorted(str(i) for i in range(20000))
+        best = min(best, (perf_counter() - started) * 1e3)
+    connection.close()
+    return best
+
+
+def measure(case: Case, repeat: int) -> Dict[str, float]:
+    """Return the median and best milliseconds of the case, each call timed alone between its setup and teardown.
+
+    The garbage collector is run before and kept off during each call, like timeit does,
+    so that a collection of what earlier cases left behind is not timed as part of the case.
+    """
+    timings = []
+    for _ in range(repeat):
+        if case.setup is not None:
+            case.setup()
+        gc.collect()
+        gc.disable()
+        try:
+            started = perf_counter()
+            case.run()
+            timings.append((perf_counter() - started) * 1e3)
+        finally:
+            gc.enable()
+        if case.teardown is not None:
+            case.teardown()
+    timings.sort()
+    return {"median_ms": timings[len(timings) // 2], "min_ms": timings[0], "repeat": len(timings)}
+
+
+def build_cases(counts: SyntheticCounts) -> Dict[str, Case]:
+    """Build the cases in the order they run, writes after the reads they would disturb and archival last."""
+    # pylint: disable=import-outside-toplevel
+    import streamlit as st
+    from pony.orm import db_session
+
+    from productivity_tracker import business_logic as logic
+    from productivity_tracker import view_models
+    from productivity_tracker.app_state import AppState
+    from productivity_tracker.controller import Controller
+    from productivity_tracker.data import archive
+    from productivity_tracker.data import entities as models
+
+    today = date.today()
+    last_day = counts.last_day
+    # NOTE: The history ends the day before yesterday, so writes go to yesterday and today without overlapping it
+    yesterday = today - timedelta(days=1)
+    month = (last_day - timedelta(days=30), last_day + timedelta(days=1))
+    year = (last_day - timedelta(days=365), last_day + timedelta(days=1))
+    names = count(1)
+    # NOTE: Two-minute slots of yesterday, each holding a one-minute work entry
+    slots = count(0)
+
+    def cold() -> None:
+        logic.cache.clear()
+        logic.snapshots.clear()
+        logic.search_results.clear()
+
+    def next_period() -> Tuple[datetime, datetime]:
+        start = datetime.combine(yesterday, time.min) + timedelta(minutes=2 * next(slots))
+        return start, start + timedelta(minutes=1)
+
+    def registered_yesterday() -> List[view_models.WorkEntryRecord]:
+        return logic.WorkEntry.acquire_all_finished_by_date(yesterday)
+
+    def in_progress() -> view_models.WorkEntryRecord:
+        work_entry = logic.WorkEntry.acquire_one_in_progress_by_date(today)
+        assert work_entry is not None, "a work entry must be in progress"
+        return work_entry
+
+    def revise_all() -> None:
+        work_entries = registered_yesterday()[:BATCH_SIZE]
+        report = logic.WorkEntry.revise_many(
+            (w.id, w.task.id % 2 + 1, w.start, w.end) for w in work_entries if w.end is not None
+        )
+        assert not report.errors, report.errors
+
+    def revise_one() -> None:
+        work_entry = registered_yesterday()[0]
+        assert work_entry.end is not None
+        logic.WorkEntry.revise(work_entry.id, work_entry.task.id % 2 + 1, work_entry.start, work_entry.end)
+
+    with db_session(strict=True):
+        rows = models.WorkEntry.parse_rows(
+            models.WorkEntry.select_rows_between(*(datetime.combine(day, time.min) for day in month))
+        )
+    tasks = logic.Task.acquire_all()
+    keys = [(task.name, task.project_category and task.project_category.name) for task in tasks[:PAGE_SIZE]]
+
+    def new_session() -> None:
+        cold()
+        for key in list(st.session_state.keys()):
+            del st.session_state[key]
+
+    def construct_controller() -> None:
+        Controller(app_state=AppState(state=st.session_state))
+
+    archive_directory = tempfile.mkdtemp(prefix="my-work-tracker-archive-")
+    archived_steps = count(1)
+
+    def archive_next_step() -> None:
+        # NOTE: Each call moves the next ARCHIVE_STEP_DAYS of the history, so that calls do comparable work
+        horizon_days = (today - counts.first_day).days - ARCHIVE_STEP_DAYS * next(archived_steps)
+        archive.partitions.configure(archive_directory, horizon_days)
+
+    def stop_in_progress() -> None:
+        logic.WorkEntry.stop(in_progress().id)
+
+    return {
+        "ProjectCategory.acquire_all": Case(logic.ProjectCategory.acquire_all, cold),
+        "ProjectCategory.acquire_names_after": Case(
+            lambda: logic.ProjectCategory.acquire_names_after(None, PAGE_SIZE), cold
+        ),
+        "Task.acquire_all": Case(logic.Task.acquire_all, cold),
+        "Task.acquire_ids_by_keys": Case(lambda: logic.Task.acquire_ids_by_keys(keys), cold),
+        "Task.acquire_keys_after": Case(lambda: logic.Task.acquire_keys_after(0, PAGE_SIZE), cold),
+        "Task.acquire_recent_ids": Case(lambda: logic.Task.acquire_recent_ids(20), cold),
+        # NOTE: The index itself outlives the caches, so this is a search against the built index
+        "Task.search": Case(lambda: logic.Task.search("task-01", 50), cold),
+        "WorkEntry.acquire_all_finished_by_date": Case(
+            lambda: logic.WorkEntry.acquire_all_finished_by_date(last_day), cold
+        ),
+        "WorkEntry.acquire_day_snapshot": Case(lambda: logic.WorkEntry.acquire_day_snapshot(last_day), cold),
+        "WorkEntry.acquire_frame_between": Case(lambda: logic.WorkEntry.acquire_frame_between(*month), cold),
+        "WorkEntry.acquire_frame_by_date": Case(lambda: logic.WorkEntry.acquire_frame_by_date(last_day), cold),
+        "WorkEntry.acquire_one_in_progress_by_date": Case(
+            lambda: logic.WorkEntry.acquire_one_in_progress_by_date(last_day), cold
+        ),
+        "WorkEntry.acquire_rows_after": Case(lambda: logic.WorkEntry.acquire_rows_after(0, PAGE_SIZE), cold),
+        "Report.acquire_daily_task_totals": Case(lambda: logic.Report.acquire_daily_task_totals(*year), cold),
+        "Report.acquire_overtime": Case(lambda: logic.Report.acquire_overtime(*year, SCHEDULE), cold),
+        "Report.acquire_range_timeline": Case(lambda: logic.Report.acquire_range_timeline(*year, "month"), cold),
+        "Report.acquire_task_totals": Case(lambda: logic.Report.acquire_task_totals(*year), cold),
+        "Report.acquire_weekly_category_totals": Case(
+            lambda: logic.Report.acquire_weekly_category_totals(*year), cold
+        ),
+        "Report.search_tasks": Case(lambda: logic.Report.search_tasks("task-01", 20), cold),
+        "Report.acquire_worked_within_hours": Case(
+            lambda: logic.Report.acquire_worked_within_hours(*month, SCHEDULE), cold
+        ),
+        "IdentityMap.work_entries (month)": Case(lambda: view_models.IdentityMap().work_entries(rows)),
+        "TaskRecord.__str__ (all tasks)": Case(lambda: [str(task) for task in tasks]),
+        "Controller.__init__ (new session)": Case(construct_controller, new_session),
+        "Controller.__init__ (rerun)": Case(construct_controller),
+        "ProjectCategory.register": Case(lambda: logic.ProjectCategory.register(f"bench-category-{next(names)}")),
+        "ProjectCategory.register_many": Case(
+            lambda: logic.ProjectCategory.register_many(
+                [f"bench-category-{next(names)}" for _ in range(BATCH_SIZE)]
+            )
+        ),
+        "Task.register": Case(lambda: logic.Task.register(f"bench-task-{next(names)}", category_name(1))),
+        "Task.register_many": Case(
+            lambda: logic.Task.register_many(
+                [(f"bench-task-{next(names)}", category_name(1)) for _ in range(BATCH_SIZE)]
+            )
+        ),
+        "WorkEntry.register": Case(lambda: logic.WorkEntry.register(1, *next_period())),
+        "WorkEntry.register_many": Case(
+            lambda: logic.WorkEntry.register_many([(1, *next_period()) for _ in range(BATCH_SIZE)])
+        ),
+        "WorkEntry.revise": Case(revise_one),
+        "WorkEntry.revise_many": Case(revise_all),
+        "WorkEntry.start": Case(lambda: logic.WorkEntry.start(1), teardown=stop_in_progress),
+        "WorkEntry.stop": Case(lambda: logic.WorkEntry.stop(in_progress().id), lambda: logic.WorkEntry.start(1)),
+        "Report.rebuild": Case(logic.Report.rebuild),
+        "Archive.archive": Case(logic.Archive.archive, archive_next_step),
+    }
+
+
+def find_uncovered(cases: Dict[str, Case]) -> List[str]:
+    """Return the public methods of the classes of business_logic which no case times."""
+    from productivity_tracker import business_logic as logic  # pylint: disable=import-outside-toplevel
+
+    methods = []
+    for class_name, cls in inspect.getmembers(logic, inspect.isclass):
+        if cls.__module__ != logic.__name__ or issubclass(cls, Exception):
+            continue
+        methods.extend(
+            f"{class_name}.{name}"
+            for name, member in vars(cls).items()
+            if not name.startswith("_") and isinstance(member, (staticmethod, classmethod))
+        )
+    return sorted(set(methods) - set(cases))
+
+
+def is_regression(result: Dict[str, float], expected_ms: float, tolerance: float, min_delta_ms: float) -> bool:
+    return result["median_ms"] > expected_ms * (1 + tolerance) and result["median_ms"] - expected_ms > min_delta_ms
+
+
+def measure_against(
+    name: str,
+    case: Case,
+    reference: Dict[str, float] | None,
+    baseline_calibration_ms: float,
+    speed: float,
+    args: argparse.Namespace,
+) -> Tuple[Dict[str, float], bool]:
+    """Measure a case, print it against the baseline and tell whether it regressed.
+
+    The median of the baseline is scaled by speed, the calibration of this run over the one of the baseline.
+    A case slower than the baseline is measured again right away, up to CONFIRM_ATTEMPTS times,
+    after calibrating again in case the machine got busy since, and kept as a regression only if it is slower every time.
+    """
+    result = measure(case, args.repeat)
+    if reference is None:
+        print(f"-- {name}: {result['median_ms']:9.2f} ms" + ("" if args.update_baseline else " (not in the baseline)"))
+        return result, False
+    expected_ms = reference["median_ms"] * speed
+    regressed = is_regression(result, expected_ms, args.tolerance, args.min_delta_ms)
+    attempts = CONFIRM_ATTEMPTS
+    while regressed and attempts:
+        attempts -= 1
+        expected_ms = reference["median_ms"] * max(speed, calibrate() / baseline_calibration_ms)
+        result = measure(case, args.repeat)
+        regressed = is_regression(result, expected_ms, args.tolerance, args.min_delta_ms)
+    print(
+        f"{'NG' if regressed else 'OK'} {name}: {result['median_ms']:9.2f} ms "
+        f"(baseline {reference['median_ms']:9.2f} ms, {expected_ms:9.2f} ms at this speed)"
+    )
+    return result, regressed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=float, default=2.0)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--categories", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="where to write the results, next to the database by default")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown of the median, 0.5 for 50%%")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    args = parser.parse_args()
+
+    spec = SyntheticSpec(years=args.years, tasks=args.tasks, categories=args.categories, seed=args.seed)
+    baseline: Dict[str, Any] = {"cases": {}}
+    if not args.update_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"NG no baseline at {args.baseline}, record one with --update-baseline")
+            return 1
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline["meta"]["spec"] != dataclasses.asdict(spec):
+            print(f"NG the baseline was recorded with {baseline['meta']['spec']}, not comparable")
+            return 1
+
+    filename = bind_temporary_database()
+    started = perf_counter()
+    counts = seed_synthetic(filename, spec, last_day=date.today() - timedelta(days=2))
+
+    # pylint: disable=import-outside-toplevel
+    import streamlit  # noqa: F401  # pylint: disable=unused-import
+
+    from productivity_tracker import business_logic as logic
+
+    # NOTE: The controller runs outside of `streamlit run`, which Streamlit warns about on every access
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    logic.Report.rebuild()
+    # NOTE: Built once per process, like in the application
+    logic.Task.search("", 1)
+    # NOTE: Seeded tasks bypass the application, so they are indexed for the full-text search on its first use
+    logic.Report.search_tasks("task", 1)
+    print(
+        f"synthetic history: {counts.work_entries} work entries of {counts.tasks} tasks "
+        f"in {counts.categories} categories, {counts.first_day} to {counts.last_day}, "
+        f"set up in {perf_counter() - started:.1f} s"
+    )
+
+    calibration_ms = calibrate()
+    # NOTE: Only ever loosened, as a quick calibration on a busy machine says little about the cases timed after
+    baseline_calibration_ms = baseline["meta"]["calibration_ms"] if "meta" in baseline else calibration_ms
+    speed = max(calibration_ms / baseline_calibration_ms, 1.0)
+    print(f"calibration: {calibration_ms:.2f} ms, x{speed:.2f} the time of the baseline")
+
+    cases = build_cases(counts)
+    uncovered = find_uncovered(cases)
+    for name in uncovered:
+        print(f"NG {name}: no case")
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "packages": {package: version(package) for package in PACKAGES},
+            "spec": dataclasses.asdict(spec),
+            "work_entries": counts.work_entries,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "calibration_ms": calibration_ms,
+        },
+        "cases": {},
+    }
+    regressions = []
+    for name, case in cases.items():
+        result, regressed = measure_against(
+            name, case, baseline["cases"].get(name), baseline_calibration_ms, speed, args
+        )
+        results["cases"][name] = result
+        if regressed:
+            regressions.append(name)
+
+    output = args.output or os.path.join(os.path.dirname(filename), "results.json")
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"results: {output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+        print(f"baseline updated: {args.baseline}")
+    else:
+        print(f"{len(regressions)} regressions, tolerance {args.tolerance:.0%} and {args.min_delta_ms} ms")
+    return 1 if regressions or uncovered else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
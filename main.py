@@ -3,18 +3,22 @@ import streamlit as st
 from productivity_tracker import colleagues as col
 from productivity_tracker.controller import Controller
 from productivity_tracker.app_state import AppState
+from productivity_tracker.instrumentation import tracer
 
-# --------- init context & controller -------------- #
-app_state = AppState(
-    state=st.session_state,
-)
-controller = Controller(app_state=app_state)
+# NOTE: The whole script is one rerun of the trace, which ends even when Streamlit stops the script to rerun it
+with tracer.rerun():
+    # --------- init context & controller -------------- #
+    app_state = AppState(
+        state=st.session_state,
+    )
+    with tracer.span("controller", "Controller.__init__"):
+        controller = Controller(app_state=app_state)
 
-# --------- init streamlit-------------- #
-st.set_page_config(page_title=app_state.get_language().main_page_title, layout="wide")
+    # --------- init streamlit-------------- #
+    st.set_page_config(page_title=app_state.get_language().main_page_title, layout="wide")
 
-# ダークモードをデフォルトに設定
-st.markdown("""
+    # ダークモードをデフォルトに設定
+    st.markdown("""
 <style>
     .stApp {
         color-scheme: dark;
@@ -26,42 +30,52 @@ st.markdown("""
         background-color: #0e1117;
     }
 </style>
-""", unsafe_allow_html=True)
+    """, unsafe_allow_html=True)
 
-# --------- construct -------------- #
-# TODO: configで読み込んで配置をカスタマイズできるようにする
-row_0 = st.columns([9, 1])
-row_1 = st.columns([1])
-row_2 = st.columns([1, 1])
-row_3 = st.columns([2, 1])
-row_4 = st.columns([1, 1])
+    # --------- construct -------------- #
+    # TODO: configで読み込んで配置をカスタマイズできるようにする
+    row_0 = st.columns([9, 1])
+    row_1 = st.columns([1])
+    row_2 = st.columns([1, 1])
+    row_3 = st.columns([2, 1])
+    row_4 = st.columns([1, 1])
 
-row_0[0].title(app_state.get_language().main_title)
-col.message_area(row_1[0], app_state, controller)
-col.date_selection(row_2[0], app_state, controller)
-col.working_hours_schedule(row_2[1], app_state)
-col.timeline_chart(
-    row_3[0],
-    app_state,
-)
-col.task_timer(
-    row_3[1],
-    app_state,
-    controller,
-)
+    row_0[0].title(app_state.get_language().main_title)
+    col.message_area(row_1[0], app_state, controller)
+    col.date_selection(row_2[0], app_state, controller)
+    col.working_hours_schedule(row_2[1], app_state)
+    col.timeline_chart(
+        row_3[0],
+        app_state,
+    )
+    col.task_timer(
+        row_3[1],
+        app_state,
+        controller,
+    )
 
-col.task_addition_manually(
-    row_3[1],
-    app_state,
-    controller,
-)
-col.task_creation(
-    row_3[1],
-    app_state,
-    controller,
-)
-col.task_logs(
-    row_4[0],
-    app_state,
-    controller,
-)
+    col.task_addition_manually(
+        row_3[1],
+        app_state,
+        controller,
+    )
+    col.task_creation(
+        row_3[1],
+        app_state,
+        controller,
+    )
+    col.task_logs(
+        row_4[0],
+        app_state,
+        controller,
+    )
+    col.task_search(
+        row_4[1],
+        app_state,
+        controller,
+    )
+    if tracer.debug_panel:
+        col.debug_panel(
+            st.container(),
+            app_state,
+        )
@@ -0,0 +1,122 @@
+"""Maintenance commands of My Work Tracker.
+
+Examples:
+    $ python manage.py export work_entries history.jsonl
+    $ python manage.py import tasks tasks.csv
+    $ python manage.py export project_categories - --format csv
+    $ python manage.py rebuild-rollup
+    $ ARCHIVE_DIRECTORY=archive python manage.py archive
+"""
+import argparse
+import sys
+from contextlib import nullcontext
+from typing import IO, ContextManager, List
+
+from productivity_tracker import business_logic as logic
+from productivity_tracker import transfer
+from productivity_tracker.bootstrap import ensure_mapping
+
+
+def open_text(filename: str, mode: str) -> ContextManager[IO[str]]:
+    if filename == "-":
+        return nullcontext(sys.stdout if "w" in mode else sys.stdin)
+    return open(filename, mode, encoding="utf-8", newline="")
+
+
+def get_format(args: argparse.Namespace) -> transfer.Format:
+    if args.format is None:
+        return transfer.Format.from_filename(args.file)
+    return transfer.Format(args.format)
+
+
+def command_export(args: argparse.Namespace) -> int:
+    entity = transfer.Entity(args.entity)
+    file_format = get_format(args)
+    with open_text(args.file, "w") as file:
+        count = transfer.write_rows(
+            entity, transfer.export_rows(entity, args.chunk_size), file, file_format
+        )
+    print(f"Exported {count} {entity.value}.", file=sys.stderr)
+    return 0
+
+
+def command_import(args: argparse.Namespace) -> int:
+    entity = transfer.Entity(args.entity)
+    file_format = get_format(args)
+    registered = 0
+    error_count = 0
+    with open_text(args.file, "r") as file:
+        rows = transfer.read_rows(file, file_format)
+        for report in transfer.import_rows(entity, rows, args.chunk_size):
+            registered += report.registered
+            error_count += len(report.errors)
+            for error in report.errors:
+                print(error, file=sys.stderr)
+    print(
+        f"Imported {registered} {entity.value}, rejected {error_count}.", file=sys.stderr
+    )
+    return 1 if error_count else 0
+
+
+def command_rebuild_rollup(args: argparse.Namespace) -> int:
+    logic.Report.rebuild()
+    print("Rebuilt the daily task totals.", file=sys.stderr)
+    return 0
+
+
+def command_archive(args: argparse.Namespace) -> int:
+    try:
+        moved = logic.Archive.archive()
+    except logic.LogicException as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"Archived {moved} work_entries.", file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    for name, func, help_text in [
+        ("export", command_export, "Export rows to a CSV/JSON Lines file"),
+        ("import", command_import, "Import rows from a CSV/JSON Lines file"),
+    ]:
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument("entity", choices=[e.value for e in transfer.Entity])
+        subparser.add_argument("file", help='File name, or "-" for stdin/stdout')
+        subparser.add_argument(
+            "--format",
+            choices=[f.value for f in transfer.Format],
+            help="File format. Guessed from the file extension by default.",
+        )
+        subparser.add_argument(
+            "--chunk-size", type=int, default=transfer.DEFAULT_CHUNK_SIZE
+        )
+        subparser.set_defaults(func=func)
+
+    subparser = subparsers.add_parser(
+        "rebuild-rollup",
+        help="Recompute the daily task totals that reports read from the work entries",
+    )
+    subparser.set_defaults(func=command_rebuild_rollup)
+
+    subparser = subparsers.add_parser(
+        "archive",
+        help="Move finished work entries older than the horizon into per-year archive files",
+    )
+    subparser.set_defaults(func=command_archive)
+
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    ensure_mapping()
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,49 @@
-from . import business_logic
-from . import controller
-from . import app_state
-from . import locale
-from . import view_models
-from .data import entities
-from .data import connection
+"""My Work Tracker.
 
-# Import classes for forward reference resolution
-from .app_state import AppState
-from .business_logic import ProjectCategory, Task, WorkEntry
-from .view_models import ProjectCategory as ViewProjectCategory, Task as ViewTask, WorkEntry as ViewWorkEntry
+Submodules and the classes re-exported here are imported on first access,
+so that importing the package, e.g. from manage.py, does not import Streamlit nor bind the database.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, Tuple
 
-# Forward reference resolution
-from . import controller
-controller.Controller.model_rebuild()
+if TYPE_CHECKING:
+    from . import app_state, business_logic, controller, locale, view_models
+    from .app_state import AppState
+    from .business_logic import ProjectCategory, Task, WorkEntry
+    from .data import connection, entities
+    from .view_models import (
+        ProjectCategory as ViewProjectCategory,
+        Task as ViewTask,
+        WorkEntry as ViewWorkEntry,
+    )
+
+_SUBMODULES: Dict[str, str] = {
+    "business_logic": ".business_logic",
+    "controller": ".controller",
+    "app_state": ".app_state",
+    "locale": ".locale",
+    "view_models": ".view_models",
+    "entities": ".data.entities",
+    "connection": ".data.connection",
+}
+_ATTRIBUTES: Dict[str, Tuple[str, str]] = {
+    "AppState": (".app_state", "AppState"),
+    "ProjectCategory": (".business_logic", "ProjectCategory"),
+    "Task": (".business_logic", "Task"),
+    "WorkEntry": (".business_logic", "WorkEntry"),
+    "ViewProjectCategory": (".view_models", "ProjectCategory"),
+    "ViewTask": (".view_models", "Task"),
+    "ViewWorkEntry": (".view_models", "WorkEntry"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        value = import_module(_SUBMODULES[name], __name__)
+    elif name in _ATTRIBUTES:
+        module, attribute = _ATTRIBUTES[name]
+        value = getattr(import_module(module, __name__), attribute)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
@@ -1,12 +1,19 @@
 from datetime import date
 from enum import Enum
-from typing import Any, List, cast
+from typing import Any, List, Sequence, Set, cast
 
 from pydantic import BaseModel, Field, PrivateAttr
 from streamlit.runtime.state import SessionStateProxy
 
 from . import locale
-from .view_models import ProjectCategory, Task, WorkEntry
+from .frames import BucketTotalFrame, WorkEntryFrame
+from .overlap import IntervalIndex
+from .view_models import (
+    ProjectCategoryRecord as ProjectCategory,
+    RerunMetrics,
+    TaskRecord as Task,
+    WorkEntryRecord as WorkEntry,
+)
 
 
 class KeyMessageArea(str, Enum):
@@ -30,8 +37,10 @@ class KeyWorkingHoursSchedule(str, Enum):
 
 class KeyTaskTimer(str, Enum):
     __base = "task_timer"
+    text_input = f"{__base}_text_input"
     selectbox = f"{__base}_selectbox"
     selectbox_disabled = f"{selectbox}_disabled"
+    selectbox_options = f"{selectbox}_options"
     button_start = f"{__base}_button_start"
     button_start_disabled = f"{button_start}_disabled"
     button_stop = f"{__base}_button_stop"
@@ -41,12 +50,17 @@ class KeyTaskTimer(str, Enum):
 class KeyTimelineChart(str, Enum):
     __base = "timeline_chart"
     chart = f"{__base}_chart"
+    figure = f"{__base}_figure"
+    radio = f"{__base}_radio"
+    range_frame = f"{__base}_range_frame"
 
 
 class KeyTaskAdditionManually(str, Enum):
     __base = "task_addition_manually"
+    text_input = f"{__base}_text_input"
     selectbox = f"{__base}_selectbox"
     selectbox_disabled = f"{selectbox}_disabled"
+    selectbox_options = f"{selectbox}_options"
     slider = f"{__base}_slider"
     slider_disabled = f"{slider}_disabled"
     button = f"{__base}_button"
@@ -67,9 +81,20 @@ class KeyTaskCreation(str, Enum):
 
 class KeyTaskLogs(str, Enum):
     __base = "task_logs"
+    page = f"{__base}_page"
+    editor = f"{__base}_editor"
+    editor_options = f"{editor}_options"
+    generation = f"{__base}_generation"
+    button = f"{__base}_button"
+
+
+class KeyTaskSearch(str, Enum):
+    __base = "task_search"
+    text_input = f"{__base}_text_input"
+    hits = f"{__base}_hits"
     selectbox = f"{__base}_selectbox"
-    slider = f"{__base}_slider"
     button = f"{__base}_button"
+    button_disabled = f"{button}_disabled"
 
 
 class KeyLanguageSelection(str, Enum):
@@ -77,6 +102,29 @@ class KeyLanguageSelection(str, Enum):
     selectbox = f"{__base}_selectbox"
 
 
+class KeyDataSlices(str, Enum):
+    __base = "data_slices"
+    dirty = f"{__base}_dirty"
+    selected_date = f"{__base}_selected_date"
+    data_version = f"{__base}_data_version"
+    interval_index = f"{__base}_interval_index"
+    rerun_metrics = f"{__base}_rerun_metrics"
+
+
+class DataSlice(str, Enum):
+    """Data read from the database, kept in the session state until a write or a date change makes it dirty.
+
+    Each slice is read by one acquire_* method, and its value is its key in the session state.
+    """
+
+    # NOTE: No private __base here, as the members are iterated
+    tasks = "data_slice_tasks"
+    project_categories = "data_slice_project_categories"
+    work_entries = "data_slice_work_entries"
+    work_entry_in_progress = "data_slice_work_entry_in_progress"
+    work_entry_frame = "data_slice_work_entry_frame"
+
+
 class RadioTaskCreation(str, Enum):
     job = "job"
     category = "category"
@@ -86,6 +134,17 @@ class RadioTaskCreation(str, Enum):
         return [e.value for e in cls]
 
 
+class RadioTimelineZoom(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+    year = "year"
+
+    @classmethod
+    def get_values(cls) -> List[str]:
+        return [e.value for e in cls]
+
+
 class AppState(BaseModel):
     state: SessionStateProxy
     key_message_area: KeyMessageArea = Field(default_factory=lambda: KeyMessageArea)
@@ -96,15 +155,14 @@ class AppState(BaseModel):
     key_task_addition_manually: KeyTaskAdditionManually = Field(default_factory=lambda: KeyTaskAdditionManually)
     key_task_creation: KeyTaskCreation = Field(default_factory=lambda: KeyTaskCreation)
     key_task_logs: KeyTaskLogs = Field(default_factory=lambda: KeyTaskLogs)
+    key_task_search: KeyTaskSearch = Field(default_factory=lambda: KeyTaskSearch)
     key_language_selection: KeyLanguageSelection = Field(default_factory=lambda: KeyLanguageSelection)
+    key_data_slices: KeyDataSlices = Field(default_factory=lambda: KeyDataSlices)
 
     task_creation_radio_values: List[str] = Field(default_factory=lambda: RadioTaskCreation.get_values())
+    timeline_zoom_radio_values: List[str] = Field(default_factory=lambda: RadioTimelineZoom.get_values())
 
     # NOTE: mediatorによって設定される
-    __tasks: List[Task] = PrivateAttr()
-    __work_entries: List[WorkEntry] = PrivateAttr()
-    __work_entry_in_progress: WorkEntry | None = PrivateAttr()
-    __project_categories: List[ProjectCategory] = PrivateAttr()
     __language: locale.Language = PrivateAttr()
 
     def init_state(self, key: str, value: Any) -> None:
@@ -123,30 +181,69 @@ class AppState(BaseModel):
     def get_selected_date(self) -> date:
         return cast(date, self.get_state(self.key_date_selection.input))
 
+    def mark_dirty(self, *data_slices: DataSlice) -> None:
+        """Mark data slices to be read again from the database on the next rerun."""
+        self.state[self.key_data_slices.dirty] = self.get_dirty() | set(data_slices)
+
+    def get_dirty(self) -> Set[DataSlice]:
+        """Return the data slices marked dirty, and the ones never read in this session."""
+        dirty = set(self.get_state(self.key_data_slices.dirty) or ())
+        return dirty | {data_slice for data_slice in DataSlice if data_slice not in self.state}
+
+    def clear_dirty(self) -> None:
+        self.state[self.key_data_slices.dirty] = set()
+
     def set_tasks(self, tasks: List[Task]) -> None:
-        self.__tasks = tasks
+        self.state[DataSlice.tasks] = tasks
 
     def get_tasks(self) -> List[Task]:
-        return self.__tasks
+        return cast(List[Task], self.state[DataSlice.tasks])
 
-    def set_work_entries(self, work_entries: List[WorkEntry]) -> None:
-        self.__work_entries = work_entries
+    def set_work_entries(self, work_entries: Sequence[WorkEntry]) -> None:
+        self.state[DataSlice.work_entries] = work_entries
 
-    def get_work_entries(self) -> List[WorkEntry]:
-        return self.__work_entries
+    def get_work_entries(self) -> Sequence[WorkEntry]:
+        return cast(Sequence[WorkEntry], self.state[DataSlice.work_entries])
 
     def set_work_entry_in_progress(self, work_entry: WorkEntry | None) -> None:
-        self.__work_entry_in_progress = work_entry
+        self.state[DataSlice.work_entry_in_progress] = work_entry
 
     def get_work_entry_in_progress(self) -> WorkEntry | None:
-        return self.__work_entry_in_progress
+        return cast(WorkEntry | None, self.state[DataSlice.work_entry_in_progress])
 
     def set_project_categories(self, project_categories: List[ProjectCategory]) -> None:
-        self.__project_categories = project_categories
+        self.state[DataSlice.project_categories] = project_categories
 
     def get_project_categories(self) -> List[ProjectCategory]:
-        return self.__project_categories
+        return cast(List[ProjectCategory], self.state[DataSlice.project_categories])
+
+    def set_interval_index(self, interval_index: IntervalIndex) -> None:
+        self.state[self.key_data_slices.interval_index] = interval_index
+
+    def get_interval_index(self) -> IntervalIndex:
+        return cast(IntervalIndex, self.state[self.key_data_slices.interval_index])
+
+    def set_work_entry_frame(self, work_entry_frame: WorkEntryFrame) -> None:
+        self.state[DataSlice.work_entry_frame] = work_entry_frame
+
+    def get_work_entry_frame(self) -> WorkEntryFrame:
+        return cast(WorkEntryFrame, self.state[DataSlice.work_entry_frame])
+
+    def set_range_frame(self, range_frame: WorkEntryFrame | BucketTotalFrame | None) -> None:
+        self.state[self.key_timeline_chart.range_frame] = range_frame
+
+    def get_range_frame(self) -> WorkEntryFrame | BucketTotalFrame | None:
+        """Return what the timeline draws instead of the selected date, None when it shows the date."""
+        return cast(
+            WorkEntryFrame | BucketTotalFrame | None,
+            self.get_state(self.key_timeline_chart.range_frame),
+        )
+
+    def set_rerun_metrics(self, rerun_metrics: RerunMetrics) -> None:
+        self.state[self.key_data_slices.rerun_metrics] = rerun_metrics
 
+    def get_rerun_metrics(self) -> RerunMetrics:
+        return cast(RerunMetrics, self.state[self.key_data_slices.rerun_metrics])
 
     def set_language(self, language: locale.Language) -> None:
         self.__language = language
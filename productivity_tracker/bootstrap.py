@@ -0,0 +1,44 @@
+"""Binds the database and applies the settings on first use instead of on import, so that importing the package stays cheap."""
+from threading import Lock
+
+from . import business_logic as logic
+from .config import ChartSettings, DatabaseSettings, InstrumentationSettings
+from .data import archive
+from .data.connection import DatabaseSingleton
+from .data.entities import CREATE_STATEMENTS, SCHEMA_VERSION
+
+_lock = Lock()
+_done = False
+
+
+def ensure_mapping() -> None:
+    """Bind the database configured by DatabaseSettings, generate the mapping and apply the other settings, once per process.
+
+    Must be called before the first use of business_logic, e.g. by the controller and manage.py.
+    """
+    global _done  # pylint: disable=global-statement
+    if _done:
+        return
+    with _lock:
+        if _done:
+            return
+        settings = DatabaseSettings()
+        DatabaseSingleton.get_instance().ensure_mapping(
+            SCHEMA_VERSION,
+            journal_mode=settings.journal_mode,
+            create_tables=settings.create_tables,
+            create_statements=CREATE_STATEMENTS,
+            **settings.dict_bind(),
+        )
+        archive.partitions.configure(settings.archive_directory, settings.archive_horizon_days)
+        logic.snapshots.max_bytes = settings.snapshot_cache_mib * 2**20
+        logic.Report.max_raw_bars = ChartSettings().max_raw_bars
+        # NOTE: Instrumentation is imported only when tracing is asked for, as the command-line client never is
+        tracing = InstrumentationSettings()
+        if tracing.trace_file is not None or tracing.debug_panel:
+            from . import instrumentation  # pylint: disable=import-outside-toplevel
+
+            instrumentation.tracer.configure_once()
+            if instrumentation.tracer.enabled:
+                instrumentation.instrument(logic)
+        _done = True
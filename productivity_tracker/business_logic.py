@@ -1,21 +1,88 @@
-from datetime import date, datetime
-from typing import Final, List
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from functools import wraps
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, Final, Iterable, List, Tuple, TypeVar, cast
 
 from pony.orm import db_session
 from pony.orm.core import TransactionIntegrityError
 
 from . import view_models
+from .cache import DEFAULT_MAX_BYTES, DataVersion, VersionedCache
 from .data import entities as models
+from .data.archive import partitions
+from .data.connection import DatabaseSingleton
+from .overlap import IntervalIndex
+from .search import TaskSearchIndex
+
+# NOTE: Frames and snapshots are imported where they are built, as they import numpy,
+#       which the command-line client never needs and would spend most of its startup on
+if TYPE_CHECKING:
+    from .frames import BucketTotalFrame, WorkEntryFrame
+    from .snapshot import DaySnapshot
 
 # register >  update > delete > acquire-many > acquire-one
 
+# NOTE: Sessions are split by purpose so that readers never queue behind writers:
+#       - acquire_* read in a plain db_session, in autocommit mode where each statement sees the last commit.
+#       - Writes run in db_session(immediate=True), which takes the write lock with BEGIN IMMEDIATE up front,
+#         so their validation and writes see the same data, and keep the transaction short.
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# NOTE: Lists every rerun of every session reads are cached for the process,
+#       and reloaded once the data version changes by our own writes or other processes' commits.
+data_version = DataVersion(DatabaseSingleton.get_instance().data_version)
+cache: VersionedCache[Any] = VersionedCache(data_version)
+# NOTE: Work entries of the days sessions show, one snapshot per day within a memory budget
+snapshots: VersionedCache[DaySnapshot] = VersionedCache(
+    data_version, max_bytes=DEFAULT_MAX_BYTES, sizeof=lambda snapshot: snapshot.nbytes()
+)
+# NOTE: Task search results, one per query typed, apart so typing does not evict the lists
+search_results: VersionedCache[List[view_models.TaskRecord]] = VersionedCache(
+    data_version
+)
+
+
+# NOTE: Tasks are never renamed nor deleted, so the search index outlives data versions
+#       and only takes in the tasks registered since, by their ids
+task_index = TaskSearchIndex()
+_task_index_lock = Lock()
+SEARCH_INDEX_PAGE_SIZE = 1000
+
+
+def acquire_identity_map() -> view_models.IdentityMap:
+    """Return the identity map of the current data version, shared by every session."""
+    return cast(view_models.IdentityMap, cache.get_or_load("IdentityMap", view_models.IdentityMap))
+
+
+def bumps_data_version(func: F) -> F:
+    """Bump the data version once the decorated write returns or raises, after its db_session has ended."""
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return func(*args, **kwargs)
+        finally:
+            data_version.bump()
+
+    return cast(F, wrapper)
+
 
 class LogicException(Exception):
     pass
 
 
+class OverlapException(LogicException):
+    def __init__(self, work_entry_id: int) -> None:
+        message = f"WorkEntry(id={work_entry_id}) overlaps with the specified time."
+        super().__init__(message)
+
+
 class ProjectCategory:
     @staticmethod
+    @bumps_data_version
     def register(name: str) -> None:
         """Register a project category
 
@@ -26,36 +93,89 @@ class ProjectCategory:
             LogicException: Occurs when trying to register same project category name
         """
         try:
-            with db_session(serializable=True, strict=True):
+            with db_session(immediate=True, strict=True):
                 models.ProjectCategory.insert(name)
         except TransactionIntegrityError as error:
             raise LogicException from error
 
     @staticmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def acquire_all() -> List[view_models.ProjectCategory]:
-        """Acquire all project categories and convert to view model
+    @bumps_data_version
+    @db_session(immediate=True, strict=True)  # type: ignore[misc]
+    def register_many(names: Iterable[str]) -> view_models.BatchReport:
+        """Register project categories in a single transaction.
+
+        Names that already exist, in the database or earlier in the batch, are reported and skipped.
+
+        Args:
+            names (Iterable[str]): Project category names
 
         Returns:
-            List[view_models.ProjectCategory]: All project categories
+            view_models.BatchReport: Number of registered categories and errors of rejected ones
         """
+        names = list(names)
+        existing_names = models.ProjectCategory.select_names_in(names)
+
+        valid_names: List[str] = []
+        errors: List[view_models.RowError] = []
+        for i, name in enumerate(names):
+            if name in existing_names:
+                errors.append(
+                    view_models.RowError(row=i, message=f"ProjectCategory({name}) already exists.")
+                )
+                continue
+            existing_names.add(name)
+            valid_names.append(name)
 
-        db_categories = models.ProjectCategory.select_all()
+        models.ProjectCategory.insert_many(valid_names)
+        return view_models.BatchReport(registered=len(valid_names), errors=errors)
 
+    # NOTE: List screens read one statement returning plain rows and build view models without entities.
+    @classmethod
+    def acquire_all(cls) -> List[view_models.ProjectCategoryRecord]:
+        """Acquire all project categories and convert to view model, through the process-wide cache
+
+        Returns:
+            List[view_models.ProjectCategoryRecord]: All project categories
+        """
+        return list(cache.get_or_load("ProjectCategory.acquire_all", cls.__load_all))
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def __load_all() -> List[view_models.ProjectCategoryRecord]:
+        identity_map = acquire_identity_map()
         return [
-            view_models.ProjectCategory.from_orm(db_category) for db_category in db_categories
+            identity_map.project_category(name)
+            for name in models.ProjectCategory.select_all_names()
         ]
 
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_names_after(name: str | None, limit: int) -> List[str]:
+        """Acquire a page of project category names without building view models.
+
+        Args:
+            name (str | None): Last name of the previous page, None for the first page
+            limit (int): Maximum number of names
+
+        Returns:
+            List[str]: Project category names ordered by name
+        """
+        return models.ProjectCategory.select_names_after(name, limit)
+
 
 class Task:
     @staticmethod
-    def register(task_name: str, category_name: str | None = None) -> None:
+    @bumps_data_version
+    def register(task_name: str, category_name: str | None = None) -> int:
         """Register a task.
 
         Args:
             task_name (str): Task name
             category_name (str | None): Category name
 
+        Returns:
+            int: Id of the registered task
+
         Raises:
             LogicException:
                 - Occurs when trying to register same combination of task name and category name.
@@ -63,30 +183,183 @@ class Task:
         """
 
         try:
-            with db_session(serializable=True, strict=True):
+            with db_session(immediate=True, strict=True):
                 if category_name is None:
-                    models.Task.insert(task_name, None)
-                    return
+                    return models.Task.insert(task_name, None)
 
                 db_project_category = models.ProjectCategory.select_one_by_name(category_name)
                 if db_project_category is None:
                     raise LogicException("Project category is specified, but not found.")
-                models.Task.insert(task_name, db_project_category)
+                return models.Task.insert(task_name, db_project_category)
 
         except (TransactionIntegrityError, models.CRUDException) as error:
             raise LogicException(error) from error
 
     @staticmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def acquire_all() -> List[view_models.Task]:
-        """Acquire all tasks and convert to view model
+    @bumps_data_version
+    @db_session(immediate=True, strict=True)  # type: ignore[misc]
+    def register_many(
+        records: Iterable[Tuple[str, str | None]]
+    ) -> view_models.BatchReport:
+        """Register tasks in a single transaction.
+
+        Tasks that already exist, in the database or earlier in the batch,
+        and tasks whose project category cannot be found are reported and skipped.
+
+        Args:
+            records (Iterable[Tuple[str, str | None]]): Task name and project category name
+
+        Returns:
+            view_models.BatchReport: Number of registered tasks and errors of rejected ones
+        """
+        records = list(records)
+        existing_keys = {
+            (name, category_name)
+            for _, name, category_name in models.Task.select_keys_by_names(
+                {name for name, _ in records}
+            )
+        }
+        existing_category_names = models.ProjectCategory.select_names_in(
+            {category_name for _, category_name in records if category_name is not None}
+        )
+
+        valid_records: List[Tuple[str, str | None]] = []
+        errors: List[view_models.RowError] = []
+        for i, (name, category_name) in enumerate(records):
+            label = name if category_name is None else f"{category_name}/{name}"
+            if category_name is not None and category_name not in existing_category_names:
+                message = f"Project category({category_name}) is specified, but not found."
+            elif (name, category_name) in existing_keys:
+                message = f"Task({label}) already exists."
+            else:
+                existing_keys.add((name, category_name))
+                valid_records.append((name, category_name))
+                continue
+            errors.append(view_models.RowError(row=i, message=message))
+
+        models.Task.insert_many(valid_records)
+        return view_models.BatchReport(registered=len(valid_records), errors=errors)
+
+    @classmethod
+    def acquire_all(cls) -> List[view_models.TaskRecord]:
+        """Acquire all tasks and convert to view model, through the process-wide cache
+
+        Returns:
+            List[view_models.TaskRecord]: All tasks
+        """
+        return list(cache.get_or_load("Task.acquire_all", cls.__load_all))
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def __load_all() -> List[view_models.TaskRecord]:
+        identity_map = acquire_identity_map()
+        return [identity_map.task(*row) for row in models.Task.select_all_rows()]
+
+    @classmethod
+    def search(cls, query: str, limit: int) -> List[view_models.TaskRecord]:
+        """Search the tasks best matching the query, recently used ones first among equals, through the process-wide cache of results
+
+        Args:
+            query (str): What the user typed, empty for the recently used tasks
+            limit (int): Maximum number of tasks
 
         Returns:
-            List[view_models.Task]: All tasks
+            List[view_models.TaskRecord]: Tasks best matching first
         """
+        return list(
+            search_results.get_or_load(
+                (query, limit),
+                lambda: cls.__search(query, limit, cls.acquire_recent_ids(limit)),
+            )
+        )
 
-        db_tasks = models.Task.select_all()
-        return [view_models.Task.from_orm(db_task) for db_task in db_tasks]
+    @classmethod
+    def __search(
+        cls, query: str, limit: int, recent: List[int]
+    ) -> List[view_models.TaskRecord]:
+        cache.get_or_load("Task.refresh_search_index", cls.__refresh_search_index)
+        with _task_index_lock:
+            return task_index.search(query, limit, recent)
+
+    @classmethod
+    def __refresh_search_index(cls) -> int:
+        """Add the tasks registered since the last refresh to the search index.
+
+        Returns:
+            int: Number of tasks in the index
+        """
+        with _task_index_lock:
+            if len(task_index) == 0:
+                # NOTE: acquire_all() is ordered by category and name, the index takes ids in order
+                for task in sorted(cls.acquire_all(), key=lambda task: task.id):
+                    task_index.add(task)
+                return len(task_index)
+
+            identity_map = acquire_identity_map()
+            while True:
+                rows = cls.acquire_keys_after(task_index.max_id, SEARCH_INDEX_PAGE_SIZE)
+                for row in rows:
+                    task_index.add(identity_map.task(*row))
+                if len(rows) < SEARCH_INDEX_PAGE_SIZE:
+                    return len(task_index)
+
+    @staticmethod
+    def acquire_recent_ids(limit: int) -> List[int]:
+        """Acquire the ids of the tasks of the latest work entries, through the process-wide cache
+
+        Args:
+            limit (int): Maximum number of tasks
+
+        Returns:
+            List[int]: Task ids, most recently used first
+        """
+        return cast(
+            List[int],
+            cache.get_or_load(
+                ("Task.acquire_recent_ids", limit), lambda: Task.__load_recent_ids(limit)
+            ),
+        )
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def __load_recent_ids(limit: int) -> List[int]:
+        return models.WorkEntry.select_recent_task_ids(limit)
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_ids_by_keys(
+        keys: Iterable[Tuple[str, str | None]]
+    ) -> Dict[Tuple[str, str | None], int]:
+        """Acquire task ids by task name and project category name.
+
+        Args:
+            keys (Iterable[Tuple[str, str | None]]): Task name and project category name
+
+        Returns:
+            Dict[Tuple[str, str | None], int]: Task ids of the keys that exist
+        """
+        keys = set(keys)
+        return {
+            (name, category_name): task_id
+            for task_id, name, category_name in models.Task.select_keys_by_names(
+                {name for name, _ in keys}
+            )
+            if (name, category_name) in keys
+        }
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_keys_after(__id: int, limit: int) -> List[Tuple[int, str, str | None]]:
+        """Acquire a page of task ids and keys without building view models.
+
+        Args:
+            __id (int): Last id of the previous page, 0 for the first page
+            limit (int): Maximum number of tasks
+
+        Returns:
+            List[Tuple[int, str, str | None]]: Task id, task name and project category name ordered by id
+        """
+        return models.Task.select_keys_after(__id, limit)
 
 
 class WorkEntry:
@@ -102,9 +375,43 @@ class WorkEntry:
         """
         return __datetime.replace(second=0, microsecond=0)
 
+    @classmethod
+    def __judge_if_valid_period(cls, start: datetime, end: datetime | None) -> None:
+        """Judge if start and end are a valid period of a work entry.
+
+        Args:
+            start (datetime): Start time
+            end (datetime | None): End time
+
+        Raises:
+            LogicException:  Occurs when future time is set for start datetime or end datetime.
+            LogicException:  Occurs when end datetime is smaller than equal to start datetime.
+            LogicException:  Occurs when start and end are not same dates.
+            LogicException:  Occurs when start datetime is older than the archive horizon.
+        """
+        CURRENT_DATETIME: Final[datetime] = datetime.now()
+        if start > CURRENT_DATETIME:
+            raise LogicException("Start time cannot be set at future time.")
+        if partitions.enabled and start < partitions.cutoff():
+            raise LogicException(
+                f"Work entries before {partitions.cutoff():%Y-%m-%d} are archived and cannot be changed."
+            )
+
+        if end is not None:
+            if end > CURRENT_DATETIME:
+                raise LogicException("End time cannot be set at future time.")
+            if end <= start:
+                raise LogicException("End time must be greater than start time.")
+            if start.date() != end.date():
+                raise LogicException("Start and end must be same dates.")
+
     @classmethod
     def __judge_if_can_upsert_and_get_task(
-        cls, task_id: int, start: datetime, end: datetime | None = None
+        cls,
+        task_id: int,
+        start: datetime,
+        end: datetime | None = None,
+        exclude_id: int | None = None,
     ) -> models.Task:
         """Judge if work entry can be upcert and returns the task if so.
 
@@ -113,37 +420,32 @@ class WorkEntry:
         Args:
             task_id (int): Task id
             start (datetime): Start time
-            end (datetime | None, optional): End time
+            end (datetime | None, optional): End time. None is treated as now.
+            exclude_id (int | None, optional): Work entry id excluded from the overlap check
 
         Raises:
-            LogicException:  Occurs when future time is set for start datetime or end datetime.
             LogicException:  Occurs when specified task id cannot be found.
-            LogicException:  Occurs when end datetime is smaller than equal to start datetime.
-            LogicException:  Occurs when start and end are not same dates.
+            LogicException:  See __judge_if_valid_period()
+            OverlapException:  Occurs when another work entry overlaps with start and end.
 
         Returns:
             models.Task: Task
         """
-        # TODO: 登録期間で重なりがないかの検証を加える
-        CURRENT_DATETIME: Final[datetime] = datetime.now()
-        if start > CURRENT_DATETIME:
-            raise LogicException("Start time cannot be set at future time.")
+        cls.__judge_if_valid_period(start, end)
 
         db_task = models.Task.select_one_by_id(task_id)
         if db_task is None:
             raise LogicException(f"Task(id={task_id}) cannot be found.")
 
-        if end is not None:
-            if end > CURRENT_DATETIME:
-                raise LogicException("End time cannot be set at future time.")
-            if end <= start:
-                raise LogicException("End time must be greater than start time.")
-            if start.date() != end.date():
-                raise LogicException("Start and end must be same dates.")
+        db_work_entry = models.WorkEntry.select_one_overlapping(start, end, exclude_id)
+        if db_work_entry is not None:
+            raise OverlapException(db_work_entry.id)
 
         return db_task
+
     @classmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    @bumps_data_version
+    @db_session(immediate=True, strict=True)  # type: ignore[misc]
     def register(cls, job_id: int, start: datetime, end: datetime) -> None:
         """Register a job record.
 
@@ -155,20 +457,81 @@ class WorkEntry:
         Raises:
             LogicException: See __judge_if_can_upsert_and_get_task()
         """
-        # TODO: マルチタスクを禁止するため、start - endの時間で重なりがあるものがあればその旨をエラーにする。
-
         start = cls.__replace_second_0(start)
         end = cls.__replace_second_0(end)
         db_task= cls.__judge_if_can_upsert_and_get_task(job_id, start, end)
         models.WorkEntry.insert(db_task, start, end)
+        models.DailyTaskTotal.add(start.date(), db_task, (end - start).total_seconds(), 1)
+
+    @classmethod
+    @bumps_data_version
+    @db_session(immediate=True, strict=True)  # type: ignore[misc]
+    def register_many(
+        cls, records: Iterable[Tuple[int, datetime, datetime]], *, truncate: bool = True
+    ) -> view_models.BatchReport:
+        """Register job records in a single transaction.
+
+        Every record is validated like register() and also against the other records of the batch.
+        Invalid records are reported and skipped, and the valid ones are inserted all at once.
+
+        Args:
+            records (Iterable[Tuple[int, datetime, datetime]]): Job ID, start datetime and end datetime
+            truncate (bool): Set seconds to 0 like register(), False to keep the datetimes, e.g. imported ones
+
+        Returns:
+            view_models.BatchReport: Number of registered records and errors of rejected ones
+        """
+        if truncate:
+            records = [
+                (job_id, cls.__replace_second_0(start), cls.__replace_second_0(end))
+                for job_id, start, end in records
+            ]
+        else:
+            records = list(records)
+        existing_task_ids = models.Task.select_ids_in({job_id for job_id, _, _ in records})
+
+        batch_index = IntervalIndex()
+        valid_records: List[Tuple[int, datetime, datetime]] = []
+        errors: List[view_models.RowError] = []
+        for i, (job_id, start, end) in enumerate(records):
+            try:
+                cls.__judge_if_valid_period(start, end)
+                if job_id not in existing_task_ids:
+                    raise LogicException(f"Task(id={job_id}) cannot be found.")
+                db_work_entry = models.WorkEntry.select_one_overlapping(start, end)
+                if db_work_entry is not None:
+                    raise OverlapException(db_work_entry.id)
+                overlapping_row = batch_index.find_overlap(start, end)
+                if overlapping_row is not None:
+                    raise LogicException(f"Row {overlapping_row} overlaps with the specified time.")
+            except LogicException as error:
+                errors.append(view_models.RowError(row=i, message=str(error)))
+                continue
+
+            batch_index.add(i, start, end)
+            valid_records.append((job_id, start, end))
+
+        models.WorkEntry.insert_many(valid_records)
+
+        totals: Dict[Tuple[date, int], Tuple[float, int]] = {}
+        for job_id, start, end in valid_records:
+            seconds, count = totals.get((start.date(), job_id), (0.0, 0))
+            totals[(start.date(), job_id)] = (seconds + (end - start).total_seconds(), count + 1)
+        for (day, job_id), (seconds, count) in totals.items():
+            models.DailyTaskTotal.add(day, models.Task[job_id], seconds, count)
+
+        return view_models.BatchReport(registered=len(valid_records), errors=errors)
 
     @classmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    @bumps_data_version
+    @db_session(immediate=True, strict=True)  # type: ignore[misc]
     def revise(
         cls, work_entry_id: int, job_id: int, start: datetime, end: datetime
     ) -> None:
         """Revise the job record specified by id.
 
+        Seconds of the start and end datetimes are set to 0, unless they are the ones of the record.
+
         Args:
             work_entry_id (int): Job record id
             job_id (int): Job id
@@ -180,18 +543,62 @@ class WorkEntry:
             LogicException: See __judge_if_can_upcert_and_get_job()
         """
         # TODO: 終了したジョブを開始するのに変更できるようにendでnullableを許容する
+        cls.__revise(work_entry_id, job_id, start, end)
+
+    @classmethod
+    @bumps_data_version
+    @db_session(immediate=True, strict=True)  # type: ignore[misc]
+    def revise_many(
+        cls, revisions: Iterable[Tuple[int, int, datetime, datetime]]
+    ) -> view_models.BatchReport:
+        """Revise job records in a single transaction.
+
+        Every revision is validated like revise(), against the job records as revised by the preceding ones.
+        Invalid revisions are reported and skipped, and the valid ones are committed together.
 
+        Args:
+            revisions (Iterable[Tuple[int, int, datetime, datetime]]): Job record id, job id, start datetime and end datetime
+
+        Returns:
+            view_models.BatchReport: Number of revised records and errors of rejected ones
+        """
+        revised = 0
+        errors: List[view_models.RowError] = []
+        for i, (work_entry_id, job_id, start, end) in enumerate(revisions):
+            try:
+                cls.__revise(work_entry_id, job_id, start, end)
+            except LogicException as error:
+                errors.append(view_models.RowError(row=i, message=str(error)))
+                continue
+            revised += 1
+        return view_models.BatchReport(registered=revised, errors=errors)
+
+    @classmethod
+    def __revise(cls, work_entry_id: int, job_id: int, start: datetime, end: datetime) -> None:
+        """Revise the job record specified by id, validating before any change.
+
+        This private function must be used inside db_session.
+        """
         db_work_entry = models.WorkEntry.select_one_by_id(work_entry_id)
         if db_work_entry is None:
             raise LogicException(f"WorkEntry(id={work_entry_id}) cannot be found")
 
-        start = cls.__replace_second_0(start)
-        end = cls.__replace_second_0(end)
-        db_task = WorkEntry.__judge_if_can_upsert_and_get_task(job_id, start, end)
+        # NOTE: Only revised datetimes are truncated, so that revising the task alone keeps
+        #       the seconds of the entry, e.g. imported, and an entry shorter than a minute valid
+        if start != db_work_entry.start:
+            start = cls.__replace_second_0(start)
+        if end != db_work_entry.end:
+            end = cls.__replace_second_0(end)
+        db_task = WorkEntry.__judge_if_can_upsert_and_get_task(
+            job_id, start, end, work_entry_id
+        )
+        models.DailyTaskTotal.add_work_entry(db_work_entry, -1)
         models.WorkEntry.update(db_work_entry, db_task, start, end)
+        models.DailyTaskTotal.add_work_entry(db_work_entry)
 
     @classmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    @bumps_data_version
+    @db_session(immediate=True, strict=True)  # type: ignore[misc]
     def start(cls, job_id: int) -> None:
         """Start a job record specified by job id.
 
@@ -211,12 +618,20 @@ class WorkEntry:
                 f"WorkEntry(id={work_entry_in_progress.id}) is already started."
             )
 
-        start = cls.__replace_second_0(datetime.now())
-        db_task= cls.__judge_if_can_upsert_and_get_task(job_id, start, None)
+        start = cls.__replace_second_0(current_datetime)
+        # NOTE: A work entry stopped earlier within this minute would overlap the truncated start,
+        #       so start right where it ended instead.
+        db_work_entry_latest = models.WorkEntry.select_one_overlapping(
+            start, current_datetime, latest=True
+        )
+        if db_work_entry_latest is not None and db_work_entry_latest.end is not None:
+            start = max(start, db_work_entry_latest.end)
+        db_task = cls.__judge_if_can_upsert_and_get_task(job_id, start, None)
         models.WorkEntry.insert(db_task, start)
 
     @classmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    @bumps_data_version
+    @db_session(immediate=True, strict=True)  # type: ignore[misc]
     def stop(cls, work_entry_id: int) -> None:
         """Stop a job record specified by job record id.
 
@@ -236,26 +651,404 @@ class WorkEntry:
             raise LogicException(f"WorkEntry(id={work_entry_id}) is already stopped.")
 
         models.WorkEntry.update_end(db_work_entry, current_datetime)
+        models.DailyTaskTotal.add_work_entry(db_work_entry)
 
-    # TODO: docstring
+    # NOTE: Archive partitions are attached on demand, which SQLite refuses inside a transaction,
+    #       so the acquire methods reading them must keep a plain db_session.
     @classmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
-    def acquire_all_finished_by_date(cls, __date: date) -> List[view_models.WorkEntry]:
-        db_work_entries = models.WorkEntry.select_all_finished_by_date(__date)
-        return [
-            view_models.WorkEntry.from_orm(db_work_entry)
-            for db_work_entry in db_work_entries
-        ]
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_all_finished_by_date(cls, __date: date) -> List[view_models.WorkEntryRecord]:
+        """Acquire all finished work entries of the date, archived ones included, and convert to view model
+
+        Their tasks are the same objects as the ones acquired by Task.acquire_all() at the same data version.
+
+        Args:
+            __date (date): Date
+
+        Returns:
+            List[view_models.WorkEntryRecord]: Work entries ordered by start datetime and id
+        """
+        rows = cls.__select_rows_between(*models.day_range(__date))
+        return acquire_identity_map().work_entries(models.WorkEntry.parse_rows(rows))
+
+    @classmethod
+    def acquire_day_snapshot(cls, __date: date) -> DaySnapshot:
+        """Acquire the work entries of the date as a snapshot shared by every session, through the process-wide cache
+
+        Args:
+            __date (date): Date
+
+        Returns:
+            DaySnapshot: Finished and in progress work entries of the date, as records and as columns
+        """
+        return snapshots.get_or_load(__date, lambda: cls.__load_day_snapshot(__date))
 
-    # TODO: docstring
     @classmethod
-    @db_session(serializable=True, strict=True)  # type: ignore[misc]
+    def __load_day_snapshot(cls, __date: date) -> DaySnapshot:
+        from .snapshot import DaySnapshot  # pylint: disable=import-outside-toplevel
+
+        return DaySnapshot.build(
+            __date,
+            cls.acquire_all_finished_by_date(__date),
+            cls.acquire_one_in_progress_by_date(__date),
+            cls.acquire_frame_by_date(__date),
+        )
+
+    @classmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_frame_by_date(cls, __date: date) -> WorkEntryFrame:
+        """Acquire the finished and in progress work entries of the date, archived ones included, as columns
+
+        Args:
+            __date (date): Date
+
+        Returns:
+            WorkEntryFrame: Work entries ordered by start datetime and id
+        """
+        from .frames import WorkEntryFrame  # pylint: disable=import-outside-toplevel
+
+        return WorkEntryFrame.from_rows(
+            cls.__select_rows_between(*models.day_range(__date), include_in_progress=True)
+        )
+
+    @classmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_frame_between(cls, start: date, end: date) -> WorkEntryFrame:
+        """Acquire the finished work entries of the days, archived ones included, as columns
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+
+        Returns:
+            WorkEntryFrame: Work entries ordered by start datetime and id
+        """
+        from .frames import WorkEntryFrame  # pylint: disable=import-outside-toplevel
+
+        return WorkEntryFrame.from_rows(
+            cls.__select_rows_between(
+                datetime.combine(start, time.min), datetime.combine(end, time.min)
+            )
+        )
+
+    @staticmethod
+    def __select_rows_between(
+        start: datetime, end: datetime, *, include_in_progress: bool = False
+    ) -> List[models.WorkEntryTextRow]:
+        rows = models.WorkEntry.select_rows_between(
+            start, end, include_in_progress=include_in_progress
+        )
+
+        archived_rows = models.WorkEntry.select_archived_rows_between(start, end)
+        if archived_rows:
+            ids = {row[0] for row in rows}
+            rows.extend(row for row in archived_rows if row[0] not in ids)
+            rows.sort(key=lambda row: (row[1], row[0]))
+        return rows
+
+    @classmethod
+    @db_session(strict=True)  # type: ignore[misc]
     def acquire_one_in_progress_by_date(
         cls, __date: date
-    ) -> view_models.WorkEntry | None:
+    ) -> view_models.WorkEntryRecord | None:
+        """Acquire the work entry in progress started on the date and convert to view model
+
+        Args:
+            __date (date): Date
+
+        Returns:
+            view_models.WorkEntryRecord | None: Returns None if there is no such work entry.
+        """
         db_work_entry = models.WorkEntry.select_one_in_progress_by_date(__date)
         if db_work_entry is None:
             return None
 
-        return view_models.WorkEntry.from_orm(db_work_entry)
+        db_task = db_work_entry.task
+        category_name = None if db_task.project_category is None else db_task.project_category.name
+        return view_models.WorkEntryRecord(
+            db_work_entry.id,
+            acquire_identity_map().task(db_task.id, db_task.name, category_name),
+            db_work_entry.start,
+            db_work_entry.end,
+        )
+
+    @classmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_rows_after(
+        cls, __id: int, limit: int
+    ) -> List[Tuple[int, str, str | None, datetime, datetime | None]]:
+        """Acquire a page of work entries, archived ones included, without building view models.
+
+        Args:
+            __id (int): Last id of the previous page, 0 for the first page
+            limit (int): Maximum number of work entries
+
+        Returns:
+            List[Tuple[int, str, str | None, datetime, datetime | None]]:
+                Work entry id, task name, project category name, start datetime and end datetime ordered by id
+        """
+        return models.WorkEntry.select_rows_after(__id, limit)
+
+
+class Report:
+    """Aggregations read from the daily task totals, except where noted."""
+
+    # NOTE: Set from ChartSettings by bootstrap.ensure_mapping()
+    max_raw_bars: int = 2000
+
+    @staticmethod
+    def rebuild() -> None:
+        """Recompute the daily task totals from all finished work entries, archived ones included."""
+        years = partitions.years()
+        with db_session(strict=True):
+            partitions.attach(years)
+        with db_session(immediate=True, strict=True):
+            models.DailyTaskTotal.rebuild(years)
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_daily_task_totals(start: date, end: date) -> List[view_models.DailyTaskTotal]:
+        """Acquire the totals per day and task.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+
+        Returns:
+            List[view_models.DailyTaskTotal]: Totals ordered by day and task id
+        """
+        return [
+            view_models.DailyTaskTotal(
+                day=day, task_id=task_id, total_seconds=total_seconds, entry_count=entry_count
+            )
+            for day, task_id, total_seconds, entry_count in models.DailyTaskTotal.select_all_between(
+                start, end
+            )
+        ]
+
+    @staticmethod
+    def acquire_range_timeline(
+        start: date, end: date, bucket: str
+    ) -> WorkEntryFrame | BucketTotalFrame:
+        """Acquire what the timeline of several days draws, through the process-wide cache.
+
+        The work entries themselves as long as they are no more than max_raw_bars,
+        otherwise their totals per bucket and task, so that the bars drawn stay bounded whatever the range.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+            bucket (str): "day" or "month", buckets of the totals
+
+        Returns:
+            WorkEntryFrame | BucketTotalFrame: Finished work entries, archived ones included, or their totals
+        """
+        return cast(
+            "WorkEntryFrame | BucketTotalFrame",
+            cache.get_or_load(
+                ("RangeTimeline", start, end, bucket, Report.max_raw_bars),
+                lambda: Report.__load_range_timeline(start, end, bucket, Report.max_raw_bars),
+            ),
+        )
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def __load_range_timeline(
+        start: date, end: date, bucket: str, max_raw_bars: int
+    ) -> WorkEntryFrame | BucketTotalFrame:
+        count = models.WorkEntry.count_finished_between(
+            datetime.combine(start, time.min), datetime.combine(end, time.min)
+        )
+        if count <= max_raw_bars:
+            return WorkEntry.acquire_frame_between(start, end)
+        from .frames import BucketTotalFrame  # pylint: disable=import-outside-toplevel
+
+        return BucketTotalFrame.from_rows(
+            bucket, models.DailyTaskTotal.select_bucket_totals_between(start, end, bucket)
+        )
+
+    @staticmethod
+    def search_tasks(query: str, limit: int) -> List[view_models.TaskSearchHit]:
+        """Search the tasks whose name or project category name contains every term of the query,
+        with the last day they were worked on and their totals, through the process-wide cache.
+
+        Unlike Task.search(), which ranks the tasks held in memory for the selectboxes,
+        this reads the full-text index and the daily task totals in one query.
+
+        Args:
+            query (str): Terms separated by spaces, empty for no task
+            limit (int): Maximum number of tasks
+
+        Returns:
+            List[view_models.TaskSearchHit]: Tasks best matching first, most recently worked first among equals
+        """
+        if not query.strip():
+            return []
+        cache.get_or_load("TaskSearch.catch_up", Report.__catch_up_task_search)
+        return list(
+            cache.get_or_load(
+                ("TaskSearch", query, limit), lambda: Report.__search_tasks(query, limit)
+            )
+        )
+
+    @staticmethod
+    def __catch_up_task_search() -> bool:
+        """Index the tasks inserted outside of the application, e.g. by hand, once per data version.
+
+        Returns:
+            bool: Whether any task had to be indexed
+        """
+        with db_session(strict=True):
+            if not models.TaskSearch.lags():
+                return False
+        with db_session(immediate=True, strict=True):
+            models.TaskSearch.catch_up()
+        return True
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def __search_tasks(query: str, limit: int) -> List[view_models.TaskSearchHit]:
+        return [
+            view_models.TaskSearchHit(
+                task_id=task_id,
+                task_name=name,
+                project_category=category_name,
+                last_day=None if last_day is None else date.fromisoformat(last_day),
+                total_seconds=total_seconds,
+                entry_count=entry_count,
+            )
+            for task_id, name, category_name, last_day, total_seconds, entry_count in (
+                models.TaskSearch.select_hits(query, limit)
+            )
+        ]
+
+    @staticmethod
+    def acquire_task_totals(start: date, end: date) -> Dict[int, float]:
+        """Acquire the total seconds per task.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+
+        Returns:
+            Dict[int, float]: Total seconds by task id
+        """
+        task_totals: Dict[int, float] = {}
+        for total in Report.acquire_daily_task_totals(start, end):
+            task_totals[total.task_id] = task_totals.get(total.task_id, 0.0) + total.total_seconds
+        return task_totals
+
+    @staticmethod
+    @db_session(strict=True)  # type: ignore[misc]
+    def acquire_weekly_category_totals(
+        start: date, end: date
+    ) -> List[view_models.CategoryTotal]:
+        """Acquire the totals per week, starting on Monday, and project category.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+
+        Returns:
+            List[view_models.CategoryTotal]: Totals ordered by week
+        """
+        weekly_totals: Dict[Tuple[date, str | None], view_models.CategoryTotal] = {}
+        for day, category_name, total_seconds, entry_count in (
+            models.DailyTaskTotal.select_category_totals_between(start, end)
+        ):
+            week = day - timedelta(days=day.weekday())
+            weekly_total = weekly_totals.setdefault(
+                (week, category_name),
+                view_models.CategoryTotal(
+                    period_start=week,
+                    project_category=category_name,
+                    total_seconds=0.0,
+                    entry_count=0,
+                ),
+            )
+            weekly_total.total_seconds += total_seconds
+            weekly_total.entry_count += entry_count
+        return list(weekly_totals.values())
+
+    @staticmethod
+    def acquire_overtime(
+        start: date, end: date, scheduled_working_time: Tuple[time, time]
+    ) -> List[view_models.DailyOvertime]:
+        """Acquire worked time against the working hours schedule per day worked.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+            scheduled_working_time (Tuple[time, time]): Scheduled start and end of work
+
+        Returns:
+            List[view_models.DailyOvertime]: Worked and scheduled seconds ordered by day
+        """
+        scheduled_seconds = (
+            datetime.combine(start, scheduled_working_time[1])
+            - datetime.combine(start, scheduled_working_time[0])
+        ).total_seconds()
+
+        worked_seconds: Dict[date, float] = {}
+        for total in Report.acquire_daily_task_totals(start, end):
+            worked_seconds[total.day] = worked_seconds.get(total.day, 0.0) + total.total_seconds
+        return [
+            view_models.DailyOvertime(
+                day=day, worked_seconds=seconds, scheduled_seconds=scheduled_seconds
+            )
+            for day, seconds in worked_seconds.items()
+        ]
+
+    @staticmethod
+    def acquire_worked_within_hours(
+        start: date, end: date, scheduled_working_time: Tuple[time, time]
+    ) -> Dict[date, float]:
+        """Acquire the seconds worked within the working hours schedule per day worked.
+
+        Unlike the other reports, this reads the work entries, because the daily task totals
+        cannot tell which part of a work entry falls within the working hours.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+            scheduled_working_time (Tuple[time, time]): Scheduled start and end of work
+
+        Returns:
+            Dict[date, float]: Seconds within the working hours by day, ordered by day
+        """
+        frame = WorkEntry.acquire_frame_between(start, end)
+        return frame.clip_to_working_hours(*scheduled_working_time).total_seconds_by_day()
+
+
+class Archive:
+    @staticmethod
+    def archive() -> int:
+        """Move finished work entries started before the archive horizon into the per-year archive partitions.
+
+        Each month is moved in its own short transaction, so the application can keep serving meanwhile.
+        Daily task totals are kept as they are, so reports are not affected.
+
+        Raises:
+            LogicException: Occurs when the archive directory is not configured.
+
+        Returns:
+            int: Number of moved work entries
+        """
+        if not partitions.enabled:
+            raise LogicException("Archive directory is not configured.")
+
+        cutoff = partitions.cutoff()
+        with db_session(strict=True):
+            years = models.WorkEntry.select_years_finished_before(cutoff)
+            partitions.attach(years, create=True)
 
+        moved = 0
+        for year in years:
+            for month in range(1, 13):
+                start = datetime(year, month, 1)
+                if start >= cutoff:
+                    break
+                end = min(datetime(year + month // 12, month % 12 + 1, 1), cutoff)
+                with db_session(immediate=True, strict=True):
+                    moved += models.WorkEntry.move_to_archive(year, start, end)
+        return moved
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Generic, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+Version = Tuple[int, int]
+
+DEFAULT_MAXSIZE = 128
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+class DataVersion:
+    """Version of the data in the database, changing whenever it may have changed.
+
+    It combines a counter bumped by our own writes with a version read from the database,
+    which covers the writes of other processes.
+    """
+
+    def __init__(self, read_external: Callable[[], int]) -> None:
+        """
+        Args:
+            read_external (Callable[[], int]): Returns a number that changes when other connections commit,
+                e.g. DatabaseSingleton.data_version
+        """
+        self.__read_external = read_external
+        self.__local = 0
+        self.__lock = Lock()
+
+    def bump(self) -> None:
+        """Mark the data as changed by our own write."""
+        with self.__lock:
+            self.__local += 1
+
+    def current(self) -> Version:
+        return self.__local, self.__read_external()
+
+
+class VersionedCache(Generic[T]):
+    """Process-wide LRU cache whose entries are valid for the data version they were loaded at.
+
+    It is shared by the threads Streamlit runs each session in, so every access holds a lock.
+    Loading runs outside the lock, so two threads missing at once may both load.
+    Entries of other data versions are dropped whenever an entry is stored, as they cannot be hit anymore.
+    """
+
+    def __init__(
+        self,
+        version: DataVersion,
+        maxsize: int = DEFAULT_MAXSIZE,
+        *,
+        max_bytes: int | None = None,
+        sizeof: Callable[[T], int] | None = None,
+    ) -> None:
+        """
+        Args:
+            version (DataVersion): Data version entries are tagged with
+            maxsize (int): Maximum number of entries, the least recently used one is evicted beyond it
+            max_bytes (int | None): Memory budget of the entries as measured by sizeof, None for no budget
+            sizeof (Callable[[T], int] | None): Returns the approximate bytes of a value, required with max_bytes
+        """
+        if max_bytes is not None and sizeof is None:
+            raise ValueError("sizeof is required with max_bytes")
+        self.version = version
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.nbytes = 0
+        self.__sizeof = sizeof
+        self.__entries: OrderedDict[Hashable, Tuple[Version, T, int]] = OrderedDict()
+        self.__lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get_or_load(self, key: Hashable, load: Callable[[], T]) -> T:
+        """Return the value cached for the key at the current data version, or load and cache it.
+
+        Args:
+            key (Hashable): Cache key
+            load (Callable[[], T]): Loads the value from the database
+
+        Returns:
+            T: Cached or loaded value
+        """
+        # NOTE: Read the version before loading, so a write during loading leaves a stale entry behind
+        #       which the next call reloads, instead of a stale entry tagged with the new version
+        version = self.version.current()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = load()
+        size = 0 if self.__sizeof is None else self.__sizeof(value)
+        with self.__lock:
+            # NOTE: A thread storing a value loaded at an older version drops the newer entries too,
+            #       which costs a reload but never serves stale data
+            for stale_key in [k for k, e in self.__entries.items() if e[0] != version]:
+                self.nbytes -= self.__entries.pop(stale_key)[2]
+                self.invalidations += 1
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[2]
+            self.__entries[key] = (version, value, size)
+            self.nbytes += size
+            # NOTE: The entry just stored is kept even if it alone exceeds the budget
+            while len(self.__entries) > 1 and (
+                len(self.__entries) > self.maxsize
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+            ):
+                self.nbytes -= self.__entries.popitem(last=False)[1][2]
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.nbytes = 0
@@ -0,0 +1,148 @@
+"""Plotly figures built straight from the arrays of WorkEntryFrame, without pandas nor plotly.express."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Hashable, Tuple
+
+import numpy as np
+from plotly import graph_objects as go
+
+from .frames import BucketTotalFrame, WorkEntryFrame
+from .instrumentation import traced
+
+FINISHED = "Finished"
+IN_PROGRESS = "InProgress"
+ONE_MILLISECOND = np.timedelta64(1, "ms")
+ONE_MINUTE = np.timedelta64(1, "m")
+# NOTE: Numbers only in customdata, as per bar strings would be copied and serialized one by one
+HOVER_TEMPLATE = "%{y}<br>%{base|%H:%M} for %{customdata:.0f} min"
+RANGE_HOVER_TEMPLATE = "%{y}<br>%{base|%m/%d %H:%M} for %{customdata:.0f} min"
+BUCKET_HOVER_TEMPLATES = {
+    "day": "%{fullData.name}<br>%{x|%m/%d}: %{y:.1f} h in %{customdata:.0f} entries",
+    "month": "%{fullData.name}<br>%{x|%Y/%m}: %{y:.1f} h in %{customdata:.0f} entries",
+}
+# NOTE: Periods of the buckets in the notation of plotly, so that each bar spans its day or month
+BUCKET_PERIODS = {"day": 86_400_000, "month": "M1"}
+
+
+def timeline_key(
+    frame: WorkEntryFrame | BucketTotalFrame, schedule: Tuple[datetime, datetime] | None
+) -> Hashable:
+    """Key of the timeline figure, which changes with the work entries or the working hours only.
+
+    Args:
+        frame (WorkEntryFrame | BucketTotalFrame): Work entries or their totals
+        schedule (Tuple[datetime, datetime] | None): Start and end of the working hours, None for several days
+
+    Returns:
+        Hashable: Key
+    """
+    return frame.fingerprint(), schedule
+
+
+@traced("chart")
+def build_timeline_figure(
+    frame: WorkEntryFrame,
+    schedule: Tuple[datetime, datetime] | None,
+    now: datetime | None = None,
+) -> go.Figure:
+    """Build the timeline of the work entries as horizontal bars, one trace per status.
+
+    Bars are laid out the way plotly.express.timeline does, starting at base and lasting x milliseconds.
+
+    Args:
+        frame (WorkEntryFrame): Work entries
+        schedule (Tuple[datetime, datetime] | None): Start and end of the working hours, drawn as vertical lines.
+            None for work entries of several days, whose bars are labeled with their date.
+        now (datetime | None): Current datetime, datetime.now() by default
+
+    Returns:
+        go.Figure: Figure
+    """
+    labels = frame.task_labels()
+    ends = frame.ends_at(now)
+    in_progress = frame.in_progress
+    figure = go.Figure()
+    for status, mask in ((FINISHED, ~in_progress), (IN_PROGRESS, in_progress)):
+        if not mask.any():
+            continue
+        starts = frame.starts[mask]
+        figure.add_trace(
+            go.Bar(
+                name=status,
+                orientation="h",
+                base=starts,
+                x=(ends[mask] - starts) / ONE_MILLISECOND,
+                y=labels[mask],
+                customdata=(ends[mask] - starts) / ONE_MINUTE,
+                hovertemplate=HOVER_TEMPLATE if schedule is not None else RANGE_HOVER_TEMPLATE,
+                legendgroup=status,
+            )
+        )
+    figure.update_layout(
+        barmode="overlay",
+        legend_title_text="status",
+        xaxis={"type": "date"},
+        yaxis={"autorange": "reversed"},
+    )
+    if schedule is not None:
+        figure.add_vline(x=schedule[0])
+        figure.add_vline(x=schedule[1])
+    return figure
+
+
+@traced("chart")
+def build_bucket_figure(frame: BucketTotalFrame) -> go.Figure:
+    """Build the totals of several days as stacked columns, one bar per task and bucket.
+
+    Args:
+        frame (BucketTotalFrame): Totals per bucket and task
+
+    Returns:
+        go.Figure: Figure
+    """
+    hours = frame.total_seconds / 3600
+    figure = go.Figure()
+    for task_id in np.unique(frame.task_ids).tolist():
+        mask = frame.task_ids == task_id
+        figure.add_trace(
+            go.Bar(
+                name=frame.task_label(task_id),
+                x=frame.buckets[mask],
+                y=hours[mask],
+                customdata=frame.entry_counts[mask],
+                hovertemplate=BUCKET_HOVER_TEMPLATES[frame.bucket],
+                xperiod=BUCKET_PERIODS[frame.bucket],
+                xperiodalignment="middle",
+            )
+        )
+    figure.update_layout(
+        barmode="stack",
+        legend_title_text="job",
+        xaxis={"type": "date"},
+        yaxis={"title": {"text": "hours"}},
+    )
+    return figure
+
+
+def update_in_progress_end(
+    figure: go.Figure, frame: WorkEntryFrame, now: datetime | None = None
+) -> None:
+    """Stretch the bars of the work entries in progress up to now, leaving the rest of the figure as is.
+
+    Args:
+        figure (go.Figure): Figure built by build_timeline_figure() from the same frame
+        frame (WorkEntryFrame): Work entries
+        now (datetime | None): Current datetime, datetime.now() by default
+    """
+    in_progress = frame.in_progress
+    if not in_progress.any():
+        return
+    starts = frame.starts[in_progress]
+    ends = frame.ends_at(now)[in_progress]
+    figure.update_traces(
+        x=(ends - starts) / ONE_MILLISECOND,
+        customdata=(ends - starts) / ONE_MINUTE,
+        selector={"name": IN_PROGRESS},
+    )
+
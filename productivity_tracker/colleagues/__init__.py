@@ -1,7 +1,9 @@
 from .date_selection import date_selection
+from .debug_panel import debug_panel
 from .task_addition_manually import task_addition_manually
 from .task_creation import task_creation
 from .task_logs import task_logs
+from .task_search import task_search
 from .task_timer import task_timer
 from .message_area import message_area
 from .timeline_chart import timeline_chart
@@ -9,9 +11,11 @@ from .working_hours_schedule import working_hours_schedule
 
 __all__ = [
     "date_selection",
+    "debug_panel",
     "task_addition_manually",
     "task_creation",
     "task_logs",
+    "task_search",
     "task_timer",
     "message_area",
     "timeline_chart",
@@ -2,8 +2,10 @@ from streamlit.delta_generator import DeltaGenerator
 
 from ..controller import Controller
 from ..app_state import AppState
+from ..instrumentation import traced
 
 
+@traced("render")
 def date_selection(
     gen: DeltaGenerator, app_state: AppState, controller: Controller
 ) -> None:
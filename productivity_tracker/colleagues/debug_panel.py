@@ -0,0 +1,57 @@
+from typing import Dict, Tuple
+
+from streamlit.delta_generator import DeltaGenerator
+
+from ..app_state import AppState
+from ..instrumentation import tracer
+
+# NOTE: Statements are grouped by their first characters, which tell the table and the clause
+STATEMENT_PREFIX = 120
+
+
+def debug_panel(
+    gen: DeltaGenerator,
+    app_state: AppState,
+) -> None:
+    """Draw the spans of the current rerun so far, which is every colleague drawn before this one."""
+    trace = tracer.current()
+    if trace is None:
+        return
+
+    language = app_state.get_language()
+    expander = gen.expander(language.debug_panel_expander)
+    expander.caption(language.debug_panel_caption)
+    self_ms_by_kind = trace.self_ms_by_kind()
+    columns = expander.columns(max(len(self_ms_by_kind), 1))
+    for column, (kind, self_ms) in zip(columns, sorted(self_ms_by_kind.items())):
+        column.metric(kind, f"{self_ms:.1f} ms")
+
+    spans = trace.ordered()
+    expander.dataframe(
+        {
+            "kind": [span.kind for span in spans],
+            "name": ["  " * span.depth + span.name for span in spans],
+            "start (ms)": [round(span.start_ms, 2) for span in spans],
+            "duration (ms)": [round(span.duration_ms, 2) for span in spans],
+            "self (ms)": [round(span.self_ms, 2) for span in spans],
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    statements: Dict[str, Tuple[int, float]] = {}
+    for span in spans:
+        if span.kind == "sql":
+            count, total_ms = statements.get(span.name[:STATEMENT_PREFIX], (0, 0.0))
+            statements[span.name[:STATEMENT_PREFIX]] = (count + 1, total_ms + span.duration_ms)
+    if statements:
+        slowest = sorted(statements.items(), key=lambda item: -item[1][1])
+        expander.dataframe(
+            {
+                "statement": [sql for sql, _ in slowest],
+                "count": [count for _, (count, _) in slowest],
+                "total (ms)": [round(total_ms, 2) for _, (_, total_ms) in slowest],
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
@@ -2,8 +2,10 @@ from streamlit.delta_generator import DeltaGenerator
 
 from ..controller import Controller
 from ..app_state import AppState
+from ..instrumentation import traced
 
 
+@traced("render")
 def message_area(
     gen: DeltaGenerator,
     app_state: AppState,
@@ -6,8 +6,10 @@ from streamlit.delta_generator import DeltaGenerator
 
 from ..controller import Controller
 from ..app_state import AppState
+from ..instrumentation import traced
 
 
+@traced("render")
 def task_addition_manually(
     gen: DeltaGenerator,
     app_state: AppState,
@@ -19,10 +21,17 @@ def task_addition_manually(
     with gen.expander(
         app_state.get_language().job_addition_manually_expander, expanded=True
     ):
+        st.text_input(
+            app_state.get_language().job_addition_manually_text_input,
+            key=app_state.key_task_addition_manually.text_input,
+            disabled=app_state.get_state(
+                app_state.key_task_addition_manually.selectbox_disabled
+            ),
+        )
         st.selectbox(
             app_state.get_language().job_addition_manually_selectbox,
             key=app_state.key_task_addition_manually.selectbox,
-            options=app_state.get_tasks(),
+            options=app_state.get_state(app_state.key_task_addition_manually.selectbox_options),
             disabled=app_state.get_state(
                 app_state.key_task_addition_manually.selectbox_disabled
             ),
@@ -3,8 +3,10 @@ from streamlit.delta_generator import DeltaGenerator
 
 from ..controller import Controller
 from ..app_state import AppState
+from ..instrumentation import traced
 
 
+@traced("render")
 def task_creation(
     gen: DeltaGenerator,
     app_state: AppState,
@@ -1,38 +1,73 @@
+import math
+
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
 
 from ..controller import Controller
 from ..app_state import AppState
+from ..instrumentation import traced
+
+PAGE_SIZE = 20
 
 
+@traced("render")
 def task_logs(
     gen: DeltaGenerator,
     app_state: AppState,
     controller: Controller,
 ) -> None:
-    for i, work_entry in enumerate(app_state.get_work_entries()):
-        key_selectbox = f"{app_state.key_task_logs.selectbox}_{i}"
-        key_slider = f"{app_state.key_task_logs.slider}_{i}"
-        key_button = f"{app_state.key_task_logs.button}_{i}"
+    work_entries = app_state.get_work_entries()
+    if not work_entries:
+        return
 
-        with gen.expander(str(work_entry), expanded=False):
-            st.selectbox(
-                app_state.get_language().job_logs_selectbox,
-                key=key_selectbox,
-                options=app_state.get_tasks(),
-                index=app_state.get_tasks().index(work_entry.task),
-            )
+    language = app_state.get_language()
+    page_count = math.ceil(len(work_entries) / PAGE_SIZE)
+    page = gen.number_input(
+        language.job_logs_page,
+        key=app_state.key_task_logs.page,
+        min_value=1,
+        max_value=page_count,
+        value=1,
+    )
+    # NOTE: Only the visible page is handed to the editor, whatever the number of work entries
+    offset = (min(int(page), page_count) - 1) * PAGE_SIZE
+    visible = work_entries[offset : offset + PAGE_SIZE]
 
-            time_start = work_entry.start.time()
-            time_end = work_entry.end.time()
-            st.slider(
-                app_state.get_language().job_logs_slider,
-                key=key_slider,
-                value=(time_start, time_end),
-            )
-            st.button(
-                app_state.get_language().job_logs_button,
-                key=key_button,
-                on_click=controller.click_edit_work_entry,
-                args=(key_selectbox, key_slider, work_entry.id),
-            )
+    # NOTE: Only the tasks of the page and the recently used ones are offered, not every task
+    tasks = [
+        *app_state.get_state(app_state.key_task_logs.editor_options),
+        *(w.task for w in visible),
+    ]
+    labels = {task.id: str(task) for task in tasks}
+    # NOTE: A new key after every revision drops the edits of the previous editor
+    key_editor = f"{app_state.key_task_logs.editor}_{offset}_{app_state.get_state(app_state.key_task_logs.generation) or 0}"
+    gen.data_editor(
+        {
+            "id": [w.id for w in visible],
+            "task": [labels[w.task.id] for w in visible],
+            "start": [w.start.time() for w in visible],
+            "end": [w.end.time() if w.end is not None else None for w in visible],
+        },
+        key=key_editor,
+        hide_index=True,
+        num_rows="fixed",
+        column_config={
+            "id": st.column_config.NumberColumn("#", disabled=True),
+            "task": st.column_config.SelectboxColumn(
+                language.job_logs_selectbox, options=list(labels.values()), required=True
+            ),
+            "start": st.column_config.TimeColumn(
+                language.job_logs_start, format="HH:mm", step=60, required=True
+            ),
+            "end": st.column_config.TimeColumn(
+                language.job_logs_end, format="HH:mm", step=60, required=True
+            ),
+        },
+        use_container_width=True,
+    )
+    gen.button(
+        language.job_logs_button,
+        key=app_state.key_task_logs.button,
+        on_click=controller.click_revise_work_entries,
+        args=(key_editor, [w.id for w in visible]),
+    )
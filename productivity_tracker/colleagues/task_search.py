@@ -0,0 +1,50 @@
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+from ..controller import Controller
+from ..app_state import AppState
+from ..instrumentation import traced
+
+
+@traced("render")
+def task_search(
+    gen: DeltaGenerator,
+    app_state: AppState,
+    controller: Controller,
+) -> None:
+    language = app_state.get_language()
+    with gen.expander(language.job_search_expander):
+        st.text_input(
+            language.job_search_text_input,
+            key=app_state.key_task_search.text_input,
+        )
+        hits = app_state.get_state(app_state.key_task_search.hits)
+        if not hits:
+            return
+
+        st.dataframe(
+            {
+                "task": [str(hit) for hit in hits],
+                "last_day": [hit.last_day for hit in hits],
+                "hours": [hit.total_seconds / 3600 for hit in hits],
+                "entries": [hit.entry_count for hit in hits],
+            },
+            hide_index=True,
+            column_config={
+                "task": st.column_config.TextColumn(language.job_search_job),
+                "last_day": st.column_config.DateColumn(language.job_search_last_day),
+                "hours": st.column_config.NumberColumn(language.job_search_hours, format="%.1f"),
+                "entries": st.column_config.NumberColumn(language.job_search_entries),
+            },
+        )
+        st.selectbox(
+            language.job_search_selectbox,
+            key=app_state.key_task_search.selectbox,
+            options=hits,
+        )
+        st.button(
+            language.job_search_button,
+            key=app_state.key_task_search.button,
+            on_click=controller.click_show_search_hit,
+            disabled=app_state.get_state(app_state.key_task_search.button_disabled),
+        )
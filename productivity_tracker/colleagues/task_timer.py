@@ -1,20 +1,32 @@
+from datetime import datetime, timedelta
+
+import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
 
 from ..controller import Controller
 from ..app_state import AppState
+from ..instrumentation import traced
+
+# NOTE: How often the elapsed time of the work entry in progress is refreshed
+TICK = timedelta(seconds=1)
 
 
-# TODO: 現在の実行状況も確認できると良い
+@traced("render")
 def task_timer(
     gen: DeltaGenerator,
     app_state: AppState,
     controller: Controller,
 ) -> None:
 
+    gen.text_input(
+        app_state.get_language().job_timer_text_input,
+        key=app_state.key_task_timer.text_input,
+        disabled=app_state.get_state(app_state.key_task_timer.selectbox_disabled),
+    )
     gen.selectbox(
         app_state.get_language().job_timer_selectbox,
         key=app_state.key_task_timer.selectbox,
-        options=app_state.get_tasks(),
+        options=app_state.get_state(app_state.key_task_timer.selectbox_options),
         disabled=app_state.get_state(app_state.key_task_timer.selectbox_disabled),
     )
     gen.button(
@@ -29,3 +41,25 @@ def task_timer(
         disabled=app_state.get_state(app_state.key_task_timer.button_stop_disabled),
         on_click=controller.click_stop_task,
     )
+
+    # NOTE: The elapsed time ticks in a fragment, which reruns alone without the controller nor the rest of the page
+    if app_state.get_work_entry_in_progress() is not None:
+        with gen:
+            st.fragment(draw_elapsed_time, run_every=TICK)(app_state)
+
+
+def draw_elapsed_time(app_state: AppState) -> None:
+    """Draw the elapsed time of the work entry in progress, read as of the last full rerun.
+
+    Runs as a fragment on every tick, so it must neither query the database nor touch other widgets.
+    """
+    work_entry = app_state.get_work_entry_in_progress()
+    if work_entry is None:
+        return
+    elapsed = int((datetime.now() - work_entry.start).total_seconds())
+    hours, rest = divmod(max(elapsed, 0), 3600)
+    st.metric(
+        app_state.get_language().job_timer_metric,
+        f"{hours}:{rest // 60:02d}:{rest % 60:02d}",
+        help=str(work_entry.task),
+    )
@@ -1,76 +1,81 @@
-from datetime import datetime, time
-from typing import Tuple, TypedDict
+from datetime import datetime, time, timedelta
+from typing import Tuple
 
-import pandas as pd
-from plotly import express as px
+import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
 
 from ..app_state import AppState
+from ..frames import WorkEntryFrame
+from ..instrumentation import traced
 
-
-class FigDict(TypedDict):
-    job_id: int
-    job: str
-    start: datetime
-    end: datetime
-    status: str
+# NOTE: How often the bars in progress are stretched to now, bars being drawn by the minute
+TICK = timedelta(seconds=10)
 
 
+@traced("render")
 def timeline_chart(
     gen: DeltaGenerator,
     app_state: AppState,
 ) -> None:
 
-    work_entries = app_state.get_work_entries()
-    work_entry_in_progress = app_state.get_work_entry_in_progress()
+    gen.radio(
+        app_state.get_language().timeline_chart_radio,
+        key=app_state.key_timeline_chart.radio,
+        options=app_state.timeline_zoom_radio_values,
+        horizontal=True,
+    )
 
-    dict_work_entries = [
-        FigDict(
-            # TODO: 長い場合に備えてリミット設けて...表記
-            job_id=work_entry.task.id,
-            job=str(work_entry.task),
-            start=work_entry.start,
-            end=work_entry.end,  # type: ignore[typeddict-item]
-            status="Finished",
-        )
-        for work_entry in work_entries
-    ]
+    range_frame = app_state.get_range_frame()
+    work_entry_frame = app_state.get_work_entry_frame() if range_frame is None else range_frame
+    if len(work_entry_frame) == 0:
+        return
 
-    if work_entry_in_progress is not None:
-        dict_work_entry = FigDict(
-            # TODO: 長い場合に備えてリミット設けて...表記
-            job_id=work_entry_in_progress.task.id,
-            job=str(work_entry_in_progress.task),
-            start=work_entry_in_progress.start,
-            end=datetime.now(),
-            status="InProgress",
-        )
-        dict_work_entries.append(dict_work_entry)
+    # NOTE: Only the bars in progress change between full reruns, so only a timeline having any ticks,
+    #       in a fragment which reruns alone without the controller nor the rest of the page
+    live = isinstance(work_entry_frame, WorkEntryFrame) and bool(work_entry_frame.in_progress.any())
+    with gen:
+        st.fragment(draw_timeline, run_every=TICK if live else None)(app_state)
 
-    if dict_work_entries == []:
-        return
 
-    df = pd.DataFrame(dict_work_entries)
+@traced("render")
+def draw_timeline(app_state: AppState) -> None:
+    """Draw the timeline of the work entries as of the last full rerun, up to now.
 
-    fig = px.timeline(
-        df,
-        x_start="start",
-        x_end="end",
-        y="job",
-        color="status",
-    )
-    fig.update_yaxes(autorange="reversed")
+    Runs as a fragment on every tick, so it must neither query the database nor touch other widgets.
+    """
+    range_frame = app_state.get_range_frame()
+    work_entry_frame = app_state.get_work_entry_frame() if range_frame is None else range_frame
 
-    selected_date = app_state.get_selected_date()
-    scheduled_working_time: Tuple[time, time] = app_state.get_state(
-        app_state.key_working_hours_schedule.slider
-    )
-    scheduled_working_datetime = (
-        datetime.combine(selected_date, scheduled_working_time[0]),
-        datetime.combine(selected_date, scheduled_working_time[1]),
-    )
-    fig.add_vline(x=scheduled_working_datetime[0])
-    fig.add_vline(x=scheduled_working_datetime[1])
-    gen.plotly_chart(
+    # NOTE: Imported on the first chart drawn, as plotly takes long to import
+    # pylint: disable=import-outside-toplevel
+    from .. import charts
+
+    scheduled_working_datetime: Tuple[datetime, datetime] | None = None
+    if range_frame is None:
+        selected_date = app_state.get_selected_date()
+        scheduled_working_time: Tuple[time, time] = app_state.get_state(
+            app_state.key_working_hours_schedule.slider
+        )
+        scheduled_working_datetime = (
+            datetime.combine(selected_date, scheduled_working_time[0]),
+            datetime.combine(selected_date, scheduled_working_time[1]),
+        )
+
+    # NOTE: The figure is rebuilt only when the work entries or the schedule change,
+    #       otherwise only the bars in progress are stretched to now
+    key = charts.timeline_key(work_entry_frame, scheduled_working_datetime)
+    cached = app_state.get_state(app_state.key_timeline_chart.figure)
+    if cached is not None and cached[0] == key:
+        fig = cached[1]
+        if isinstance(work_entry_frame, WorkEntryFrame):
+            charts.update_in_progress_end(fig, work_entry_frame)
+    else:
+        if isinstance(work_entry_frame, WorkEntryFrame):
+            fig = charts.build_timeline_figure(work_entry_frame, scheduled_working_datetime)
+        else:
+            fig = charts.build_bucket_figure(work_entry_frame)
+        app_state.set_state(app_state.key_timeline_chart.figure, (key, fig))
+
+    st.plotly_chart(
         fig, key=app_state.key_timeline_chart.chart, use_container_width=True
     )
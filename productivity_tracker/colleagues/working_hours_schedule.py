@@ -4,8 +4,10 @@ from typing import Tuple
 from streamlit.delta_generator import DeltaGenerator
 
 from ..app_state import AppState
+from ..instrumentation import traced
 
 
+@traced("render")
 def working_hours_schedule(
     gen: DeltaGenerator,
     app_state: AppState,
@@ -1,14 +1,82 @@
-from typing import Any, Dict
+import os
+from dataclasses import dataclass, fields
+from types import NoneType, UnionType
+from typing import Any, Dict, get_args
 
-from pydantic_settings import BaseSettings
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off"}
 
 
+def parse_value(annotation: Any, value: str) -> Any:
+    """Convert the value of an environment variable to the type of a settings field.
+
+    Raises:
+        ValueError: Occurs when the value is not one of the type.
+    """
+    if isinstance(annotation, UnionType):
+        (annotation,) = (arg for arg in get_args(annotation) if arg is not NoneType)
+    if annotation is bool:
+        if value.lower() not in TRUE_VALUES | FALSE_VALUES:
+            raise ValueError(f"invalid boolean: {value!r}")
+        return value.lower() in TRUE_VALUES
+    return annotation(value)
+
+
+class BaseSettings:
+    """Dataclass whose fields are overridden by the environment variables of the same name, case-insensitively.
+
+    Stands in for pydantic-settings, as importing it and building a validator would take
+    a fifth of the startup of the command-line client.
+    """
+
+    def __post_init__(self) -> None:
+        environ = {name.lower(): value for name, value in os.environ.items()}
+        for field in fields(self):  # type: ignore[arg-type]
+            if field.name in environ:
+                try:
+                    setattr(self, field.name, parse_value(field.type, environ[field.name]))
+                except ValueError as error:
+                    raise ValueError(f"{field.name.upper()}: {error}") from error
+
+
+@dataclass
 class DatabaseSettings(BaseSettings):
     # NOTE: https://docs.ponyorm.org/api_reference.html?highlight=create_db#supported-databases
     provider: str = "sqlite"
     filename: str = "/Users/kyo/development/Projects/my-work-tracker/sqlite.db"
     create_db: bool = True
     create_tables: bool = True
+    # NOTE: WAL lets readers go on while a writer commits, instead of failing with "database is locked".
+    #       timeout is how many seconds a connection waits for a lock held by another process.
+    journal_mode: str = "wal"
+    timeout: float = 5.0
+    # NOTE: Finished work entries older than the horizon are moved to per-year files in this directory
+    #       by `python manage.py archive`. None disables archival.
+    archive_directory: str | None = None
+    archive_horizon_days: int = 365
+    # NOTE: Memory budget of the work entries shared by every session, least recently shown days go first
+    snapshot_cache_mib: int = 64
 
     def dict_bind(self) -> Dict[str, Any]:
-        return self.model_dump(include={"provider", "filename", "create_db"})
+        return {
+            "provider": self.provider,
+            "filename": self.filename,
+            "create_db": self.create_db,
+            "timeout": self.timeout,
+        }
+
+
+@dataclass
+class ChartSettings(BaseSettings):
+    # NOTE: Week, month and year views draw one bar per work entry up to this many work entries,
+    #       and one bar per task and day or month beyond
+    max_raw_bars: int = 2000
+
+
+@dataclass
+class InstrumentationSettings(BaseSettings):
+    # NOTE: Each rerun is appended to this file as a JSON line of its SQL, business logic and render spans.
+    #       None writes no file.
+    trace_file: str | None = None
+    # NOTE: Shows the spans of the current rerun at the bottom of the page
+    debug_panel: bool = False
@@ -1,38 +1,43 @@
-from datetime import date, datetime
-from typing import Any
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
 
 from pydantic import BaseModel
 
 from . import locale, business_logic as logic, app_state
-from .config import DatabaseSettings
-from .data.connection import DatabaseSingleton
+from .app_state import AppState, DataSlice
+from .bootstrap import ensure_mapping
+from .view_models import RerunMetrics
 
-# init database
-settings = DatabaseSettings()
-db = DatabaseSingleton.get_instance()
-db.bind(**settings.dict_bind())
-db.generate_mapping(create_tables=settings.create_tables)
+# NOTE: Slices showing the selected date, to be read again when it changes
+DATED_SLICES = (
+    DataSlice.work_entries,
+    DataSlice.work_entry_in_progress,
+    DataSlice.work_entry_frame,
+)
+
+# NOTE: Tasks sent to the browser per selectbox, the best matches of what the user searched
+TASK_OPTIONS_LIMIT = 50
+# NOTE: Tasks shown by the history search, the best matches only
+SEARCH_HITS_LIMIT = 20
 
 
 class Controller(BaseModel):
-    app_state: "AppState"
+    app_state: AppState
 
     def __init__(self, **data: Any) -> None:
         super().__init__(**data)
+        ensure_mapping()
 
         # 日付の初期化・取得
         self.app_state.init_state(self.app_state.key_date_selection.input, date.today())
         selected_date: date = self.app_state.get_selected_date()
 
-        # DBからデータを取得してapp_stateにセット
-        self.app_state.set_tasks(logic.Task.acquire_all())
-        self.app_state.set_work_entries(
-            logic.WorkEntry.acquire_all_finished_by_date(selected_date)
-        )
-        self.app_state.set_work_entry_in_progress(
-            logic.WorkEntry.acquire_one_in_progress_by_date(selected_date)
-        )
-        self.app_state.set_project_categories(logic.ProjectCategory.acquire_all())
+        # DBから変更のあったデータだけを取得してapp_stateにセット
+        self.__reload_dirty_slices(selected_date)
+
+        # 期間表示のデータを取得してapp_stateにセット
+        self.__load_range_frame(selected_date)
 
         # 言語設定
         self.app_state.set_language(locale.LanguageEN())
@@ -45,6 +50,77 @@ class Controller(BaseModel):
         self.__change_state_task_creation()
         self.__change_state_task_addition_manually()
 
+        # 検索に合うタスクだけを選択肢にする
+        self.__search_tasks(
+            self.app_state.key_task_timer.text_input,
+            self.app_state.key_task_timer.selectbox,
+            self.app_state.key_task_timer.selectbox_options,
+        )
+        self.__search_tasks(
+            self.app_state.key_task_addition_manually.text_input,
+            self.app_state.key_task_addition_manually.selectbox,
+            self.app_state.key_task_addition_manually.selectbox_options,
+        )
+        self.app_state.set_state(
+            self.app_state.key_task_logs.editor_options,
+            logic.Task.search("", TASK_OPTIONS_LIMIT),
+        )
+
+        # 履歴の検索
+        self.__search_history()
+
+    def __load_range_frame(self, selected_date: date) -> None:
+        """Set what the timeline draws for the week, month or year of the selected date.
+
+        Read through the process-wide cache, so reruns at the same data version cost no query.
+        """
+        self.app_state.init_state(
+            self.app_state.key_timeline_chart.radio, app_state.RadioTimelineZoom.day.value
+        )
+        zoom = self.app_state.get_state(self.app_state.key_timeline_chart.radio)
+        match app_state.RadioTimelineZoom(zoom):
+            case app_state.RadioTimelineZoom.day:
+                self.app_state.set_range_frame(None)
+                return
+            case app_state.RadioTimelineZoom.week:
+                start = selected_date - timedelta(days=selected_date.weekday())
+                end, bucket = start + timedelta(days=7), "day"
+            case app_state.RadioTimelineZoom.month:
+                start = selected_date.replace(day=1)
+                end, bucket = (start + timedelta(days=31)).replace(day=1), "day"
+            case app_state.RadioTimelineZoom.year:
+                start = selected_date.replace(month=1, day=1)
+                end, bucket = start.replace(year=start.year + 1), "month"
+        self.app_state.set_range_frame(logic.Report.acquire_range_timeline(start, end, bucket))
+
+    def __search_tasks(self, key_text_input: str, key_selectbox: str, key_options: str) -> None:
+        """Set the tasks best matching the search of a selectbox as its options, instead of every task.
+
+        The selected task stays among the options, so that the selection survives a new search.
+        """
+        query = self.app_state.get_state(key_text_input) or ""
+        options = logic.Task.search(query, TASK_OPTIONS_LIMIT)
+        selected = self.app_state.get_state(key_selectbox)
+        if selected is not None and selected not in options:
+            options.insert(0, selected)
+        self.app_state.set_state(key_options, options)
+
+    def __search_history(self) -> None:
+        """Set the tasks matching the history search with their last day and totals, none until something is typed."""
+        query = self.app_state.get_state(self.app_state.key_task_search.text_input) or ""
+        hits = logic.Report.search_tasks(query, SEARCH_HITS_LIMIT)
+        self.app_state.set_state(self.app_state.key_task_search.hits, hits)
+
+        # NOTE: A new search selects its best match, so that the button is enabled before the selectbox is drawn
+        selected = self.app_state.get_state(self.app_state.key_task_search.selectbox)
+        if hits and selected not in hits:
+            selected = hits[0]
+            self.app_state.set_state(self.app_state.key_task_search.selectbox, selected)
+        self.app_state.set_state(
+            self.app_state.key_task_search.button_disabled,
+            not hits or selected.last_day is None,
+        )
+
     def __change_state_task_timer(self) -> None:
         disabled_selectbox: bool = True
         disabled_button_start: bool = True
@@ -164,21 +240,108 @@ class Controller(BaseModel):
         self.app_state.init_state(self.app_state.key_message_area.error, None)
         self.app_state.init_state(self.app_state.key_message_area.exception, None)
 
+    def __reload_dirty_slices(self, selected_date: date) -> None:
+        """Read the dirty data slices from the database, and keep the others from the previous rerun.
+
+        Everything is dirty once the data version differs from the one seen by this session,
+        as another session or process has written since.
+        """
+        key = self.app_state.key_data_slices
+        # NOTE: Read the version before reading, so a write meanwhile makes the next rerun read everything
+        version = logic.data_version.current()
+        if self.app_state.get_state(key.data_version) != version:
+            self.app_state.mark_dirty(*DataSlice)
+        if self.app_state.get_state(key.selected_date) != selected_date:
+            self.app_state.mark_dirty(*DATED_SLICES)
+
+        dirty = self.app_state.get_dirty()
+        if DataSlice.tasks in dirty:
+            self.app_state.set_tasks(logic.Task.acquire_all())
+        if DataSlice.project_categories in dirty:
+            self.app_state.set_project_categories(logic.ProjectCategory.acquire_all())
+        if dirty.intersection(DATED_SLICES):
+            # NOTE: Every session showing the date references the same snapshot instead of its own copy
+            snapshot = logic.WorkEntry.acquire_day_snapshot(selected_date)
+            if DataSlice.work_entries in dirty:
+                self.app_state.set_work_entries(snapshot.work_entries)
+            if DataSlice.work_entry_in_progress in dirty:
+                self.app_state.set_work_entry_in_progress(snapshot.work_entry_in_progress)
+            if DataSlice.work_entry_frame in dirty:
+                self.app_state.set_work_entry_frame(snapshot.work_entry_frame)
+            self.app_state.set_interval_index(snapshot.interval_index)
+
+        self.app_state.set_state(key.data_version, version)
+        self.app_state.set_state(key.selected_date, selected_date)
+        self.app_state.clear_dirty()
+        self.app_state.set_rerun_metrics(
+            RerunMetrics(
+                reloaded=[s.name for s in DataSlice if s in dirty],
+                skipped=[s.name for s in DataSlice if s not in dirty],
+            )
+        )
+
+    @contextmanager
+    def __writing(self, *data_slices: DataSlice) -> Iterator[None]:
+        """Mark the data slices a write changes dirty.
+
+        The data version the write leaves behind is taken as seen if this session had seen the one before,
+        so that the next rerun reads only these slices instead of everything.
+        """
+        key = self.app_state.key_data_slices.data_version
+        seen = self.app_state.get_state(key)
+        before = logic.data_version.current()
+        try:
+            yield
+        finally:
+            self.app_state.mark_dirty(*data_slices)
+            # NOTE: A commit of another process between the write and here goes unnoticed
+            #       until the data version changes again, which is the price of not reading everything
+            if before == seen:
+                self.app_state.set_state(key, logic.data_version.current())
+
     def __set_error(self, error: Exception) -> None:
         self.app_state.set_state(self.app_state.key_message_area.error, error)
 
+    def __judge_if_overlapping(
+        self, start: datetime, end: datetime, exclude_id: int | None = None
+    ) -> bool:
+        # NOTE: Reject conflicts against the selected date without a round trip to the database
+        overlapping_id = self.app_state.get_interval_index().find_overlap(
+            start, end, exclude_id
+        )
+        if overlapping_id is None:
+            return False
+
+        self.__set_error(logic.OverlapException(overlapping_id))
+        return True
+
     def click_today(self) -> None:
         self.app_state.set_state(self.app_state.key_date_selection.input, date.today())
 
+    def click_show_search_hit(self) -> None:
+        hit = self.app_state.get_state(self.app_state.key_task_search.selectbox)
+        if hit is None or hit.last_day is None:
+            return
+        self.app_state.set_state(self.app_state.key_date_selection.input, hit.last_day)
+
     def click_start_task(self) -> None:
         job = self.app_state.get_state(self.app_state.key_task_timer.selectbox)
-        logic.WorkEntry.start(job.id)
+        # NOTE: Fails e.g. when a work entry of an earlier day is still in progress and so overlaps now
+        try:
+            with self.__writing(DataSlice.work_entry_in_progress, DataSlice.work_entry_frame):
+                logic.WorkEntry.start(job.id)
+        except logic.LogicException as error:
+            self.__set_error(error)
 
     def click_stop_task(self) -> None:
         job_record_in_progress = self.app_state.get_work_entry_in_progress()
         if job_record_in_progress is None:
             raise Exception("!?!?!?")
-        logic.WorkEntry.stop(job_record_in_progress.id)
+        try:
+            with self.__writing(*DATED_SLICES):
+                logic.WorkEntry.stop(job_record_in_progress.id)
+        except logic.LogicException as error:
+            self.__set_error(error)
 
     def click_create_task_or_category(self) -> None:
         value_radio = self.app_state.get_state(self.app_state.key_task_creation.radio)
@@ -189,12 +352,14 @@ class Controller(BaseModel):
         try:
             match value_radio:
                 case app_state.RadioTaskCreation.job.value:
-                    if value_checkbox:
-                        logic.Task.register(value_input)
-                    else:
-                        logic.Task.register(value_input, value_category.name)
+                    with self.__writing(DataSlice.tasks):
+                        if value_checkbox:
+                            logic.Task.register(value_input)
+                        else:
+                            logic.Task.register(value_input, value_category.name)
                 case app_state.RadioTaskCreation.category.value:
-                    logic.ProjectCategory.register(value_input)
+                    with self.__writing(DataSlice.project_categories):
+                        logic.ProjectCategory.register(value_input)
                 case _:
                     # TODO: handle error properly
                     raise Exception("!?!?!?")
@@ -206,29 +371,63 @@ class Controller(BaseModel):
         start_time, end_time = self.app_state.get_state(
             self.app_state.key_task_addition_manually.slider
         )
+        start = datetime.combine(self.app_state.get_selected_date(), start_time)
+        end = datetime.combine(self.app_state.get_selected_date(), end_time)
+        if self.__judge_if_overlapping(start, end):
+            return
         try:
-            logic.WorkEntry.register(
-                job.id,
-                datetime.combine(self.app_state.get_selected_date(), start_time),
-                datetime.combine(self.app_state.get_selected_date(), end_time),
-            )
+            with self.__writing(DataSlice.work_entries, DataSlice.work_entry_frame):
+                logic.WorkEntry.register(job.id, start, end)
         except logic.LogicException as error:
             self.__set_error(error)
 
-    def click_edit_work_entry(
-        self, key_selectbox: str, key_slider: str, job_record_id: int
-    ) -> None:
-        job = self.app_state.get_state(key_selectbox)
-        time_start, time_end = self.app_state.get_state(key_slider)
-        try:
-            logic.WorkEntry.revise(
-                job_record_id,
-                job.id,
-                datetime.combine(self.app_state.get_selected_date(), time_start),
-                datetime.combine(self.app_state.get_selected_date(), time_end),
+    def click_revise_work_entries(self, key_editor: str, work_entry_ids: List[int]) -> None:
+        """Revise the rows edited in the work log editor together, in one transaction.
+
+        Args:
+            key_editor (str): Key of the data editor
+            work_entry_ids (List[int]): Work entry ids of the rows shown in the editor, in order
+        """
+        edited_rows: Dict[int, Dict[str, Any]] = (self.app_state.get_state(key_editor) or {}).get(
+            "edited_rows", {}
+        )
+        if not edited_rows:
+            return
+
+        # NOTE: Rows are read through maps by id and by label instead of searching lists per row
+        tasks = {str(task): task.id for task in self.app_state.get_tasks()}
+        work_entries = {w.id: w for w in self.app_state.get_work_entries()}
+        selected_date = self.app_state.get_selected_date()
+        revisions: List[Tuple[int, int, datetime, datetime]] = []
+        for row, edited in sorted(edited_rows.items()):
+            work_entry = work_entries[work_entry_ids[int(row)]]
+            task_id = tasks.get(edited["task"], -1) if "task" in edited else work_entry.task.id
+            start = self.__combine(selected_date, edited.get("start"), work_entry.start)
+            end = self.__combine(selected_date, edited.get("end"), work_entry.end)
+            revisions.append((work_entry.id, task_id, start, end))
+
+        with self.__writing(DataSlice.work_entries, DataSlice.work_entry_frame):
+            report = logic.WorkEntry.revise_many(revisions)
+        # NOTE: Drop the edits, so that the editor shows the rows as they are now
+        key_generation = self.app_state.key_task_logs.generation
+        self.app_state.set_state(key_generation, (self.app_state.get_state(key_generation) or 0) + 1)
+        if report.errors:
+            self.__set_error(
+                logic.LogicException(
+                    "\n".join(f"#{revisions[e.row][0]}: {e.message}" for e in report.errors)
+                )
             )
-        except logic.LogicException as error:
-            self.__set_error(error)
+
+    @staticmethod
+    def __combine(selected_date: date, edited: time | str | None, original: datetime | None) -> datetime:
+        """Datetime of an edited cell, or of the work entry when the cell was not edited."""
+        if edited is None:
+            if original is None:
+                raise logic.LogicException("The end of a work entry in progress cannot be revised")
+            return original
+        if isinstance(edited, str):
+            edited = time.fromisoformat(edited)
+        return datetime.combine(selected_date, edited)
 
     def draw_message(self) -> None:
         self.app_state.set_state(self.app_state.key_message_area.info, None)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+import re
+from datetime import date, datetime, time, timedelta
+from typing import List
+
+from .connection import DatabaseSingleton
+
+FILENAME_PATTERN = re.compile(r"^work_entries_(\d{4})\.db$")
+
+# NOTE: Same columns as entities.WorkEntry, without the foreign key which cannot span databases
+TABLE_DDL = (
+    'CREATE TABLE IF NOT EXISTS "{schema}"."work_entries" ('
+    '"id" INTEGER PRIMARY KEY, "task" INTEGER NOT NULL, '
+    '"start" DATETIME NOT NULL, "end" DATETIME NOT NULL)'
+)
+INDEX_DDL = (
+    'CREATE INDEX IF NOT EXISTS "{schema}"."idx_work_entries__start" '
+    'ON "work_entries" ("start")'
+)
+
+
+class ArchiveException(Exception):
+    pass
+
+
+class ArchivePartitions:
+    """Per-year SQLite databases holding finished work entries older than the horizon.
+
+    Each partition is a file named work_entries_YYYY.db in the archive directory,
+    attached to the connection as the schema archive_YYYY on demand.
+    SQLite refuses to attach a database inside a transaction,
+    so attach() must be called before the db_session starts one.
+    """
+
+    def __init__(self) -> None:
+        self.directory: str | None = None
+        self.horizon_days: int = 365
+
+    def configure(self, directory: str | None, horizon_days: int) -> None:
+        """Set where partitions are stored and how old work entries must be to be archived.
+
+        Args:
+            directory (str | None): Archive directory, None to disable archival
+            horizon_days (int): Work entries started before this many days ago are archived
+        """
+        self.directory = directory
+        self.horizon_days = horizon_days
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def cutoff(self) -> datetime:
+        """Return the datetime before which started work entries are archived."""
+        return datetime.combine(date.today() - timedelta(days=self.horizon_days), time.min)
+
+    @staticmethod
+    def schema(year: int) -> str:
+        return f"archive_{year}"
+
+    def filename(self, year: int) -> str:
+        if self.directory is None:
+            raise ArchiveException("Archive directory is not configured.")
+        return os.path.join(self.directory, f"work_entries_{year}.db")
+
+    def years(self) -> List[int]:
+        """Return the years having a partition file, in ascending order."""
+        if self.directory is None or not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            int(match.group(1))
+            for match in map(FILENAME_PATTERN.match, os.listdir(self.directory))
+            if match is not None
+        )
+
+    def covering(self, start: datetime, end: datetime) -> List[int]:
+        """Return the years having a partition that may hold work entries started within [start, end).
+
+        Args:
+            start (datetime): Inclusive lower bound
+            end (datetime): Exclusive upper bound
+
+        Returns:
+            List[int]: Years in ascending order
+        """
+        if not self.enabled or start >= self.cutoff():
+            return []
+        return [year for year in self.years() if start.year <= year <= end.year]
+
+    def attach(self, years: List[int], *, create: bool = False) -> None:
+        """Attach the partitions of the years to the current connection unless attached yet.
+
+        This must be used inside db_session before any transaction starts.
+
+        Args:
+            years (List[int]): Years
+            create (bool): Create the partition files and tables if they do not exist
+        """
+        db = DatabaseSingleton.get_instance()
+        if create and self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+        attached = set(db.fetch_all("SELECT name FROM pragma_database_list"))
+        for year in years:
+            schema = self.schema(year)
+            if (schema,) not in attached:
+                if not create and not os.path.exists(self.filename(year)):
+                    continue
+                db.fetch_all(f'ATTACH DATABASE ? AS "{schema}"', [self.filename(year)])
+            if create:
+                db.fetch_all(TABLE_DDL.format(schema=schema))
+                db.fetch_all(INDEX_DDL.format(schema=schema))
+
+
+partitions = ArchivePartitions()
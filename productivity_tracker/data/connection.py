@@ -1,12 +1,35 @@
 from __future__ import annotations
 
-from pony.orm import Database
+import sqlite3
+from contextlib import closing, contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Iterator, List, Sequence, Tuple, cast
+
+from pony.orm import Database, db_session
+
+StatementListener = Callable[[str], None]
+StatementTimer = Callable[[str, float, float], None]
 
 
 class InstantiationError(Exception):
     pass
 
 
+class StatementCounter:
+    """Collects the SQL statements executed while it is listening"""
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    def __call__(self, sql: str) -> None:
+        self.statements.append(sql)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
 class DatabaseSingleton(Database):  # type: ignore[misc]
     """Singleton inheriting from pony.orm.Database"""
 
@@ -16,6 +39,11 @@ class DatabaseSingleton(Database):  # type: ignore[misc]
 
         # Set private singleton property in order not to allow you to recreate instance
         cls._singleton: DatabaseSingleton = super().__new__(cls)
+        cls._singleton._statement_listeners = []
+        cls._singleton._statement_timers = []
+        cls._singleton._watcher = None
+        cls._singleton._watcher_lock = Lock()
+        cls._singleton._mapping_lock = Lock()
 
         return cls._singleton
 
@@ -23,5 +51,212 @@ class DatabaseSingleton(Database):  # type: ignore[misc]
     def get_instance(cls) -> DatabaseSingleton:
         return cls._singleton
 
+    def add_statement_listener(self, listener: StatementListener) -> None:
+        """Register a callable invoked with the SQL of every statement the database executes.
+
+        Args:
+            listener (StatementListener): Callable receiving the SQL statement
+        """
+        self._statement_listeners = [*self._statement_listeners, listener]
+
+    def remove_statement_listener(self, listener: StatementListener) -> None:
+        """Unregister a callable registered by add_statement_listener().
+
+        Args:
+            listener (StatementListener): Callable receiving the SQL statement
+        """
+        self._statement_listeners = [
+            registered for registered in self._statement_listeners if registered is not listener
+        ]
+
+    def add_statement_timer(self, timer: StatementTimer) -> None:
+        """Register a callable invoked after every statement the database executes, with how long it took.
+
+        Args:
+            timer (StatementTimer): Callable receiving the SQL statement, its perf_counter() start and seconds
+        """
+        self._statement_timers = [*self._statement_timers, timer]
+
+    def remove_statement_timer(self, timer: StatementTimer) -> None:
+        """Unregister a callable registered by add_statement_timer().
+
+        Args:
+            timer (StatementTimer): Callable receiving the SQL statement, its perf_counter() start and seconds
+        """
+        self._statement_timers = [
+            registered for registered in self._statement_timers if registered is not timer
+        ]
+
+    @contextmanager
+    def count_statements(self) -> Iterator[StatementCounter]:
+        """Count the SQL statements executed within the context.
+
+        Yields:
+            StatementCounter: Counter of the statements
+        """
+        counter = StatementCounter()
+        self.add_statement_listener(counter)
+        try:
+            yield counter
+        finally:
+            self.remove_statement_listener(counter)
+
+    def _exec_sql(
+        self,
+        sql: str,
+        arguments: Any = None,
+        returning_id: bool = False,
+        start_transaction: bool = False,
+    ) -> Any:
+        # NOTE: Every statement of Pony, both generated and raw, goes through this method
+        for listener in self._statement_listeners:
+            listener(sql)
+        timers = self._statement_timers
+        if not timers:
+            return super()._exec_sql(sql, arguments, returning_id, start_transaction)
+        # NOTE: Covers the execution and the first row SQLite steps to, not the rows the caller fetches afterwards
+        started = perf_counter()
+        try:
+            return super()._exec_sql(sql, arguments, returning_id, start_transaction)
+        finally:
+            seconds = perf_counter() - started
+            for timer in timers:
+                timer(sql, started, seconds)
+
+    def fetch_all(
+        self, sql: str, arguments: Sequence[Any] | None = None
+    ) -> List[Tuple[Any, ...]]:
+        """Execute a raw statement and fetch all rows, without starting a transaction by itself.
+
+        Unlike Database.select() and Database.execute(), neither the SQL is parsed for $parameters
+        nor a transaction is started, so statements such as ATTACH can run in autocommit mode.
+        This method must be used inside db_session, and joins its transaction if any.
+
+        Args:
+            sql (str): SQL statement with the provider's placeholders
+            arguments (Sequence[Any] | None): Arguments
+
+        Returns:
+            List[Tuple[Any, ...]]: Rows as returned by the DB-API driver
+        """
+        # NOTE: Pony runs executemany for a list of arguments, so a tuple is always passed
+        if arguments is not None:
+            arguments = tuple(arguments)
+        return list(self._exec_sql(sql, arguments).fetchall())
+
+    def use_journal_mode(self, journal_mode: str) -> None:
+        """Set SQLite's journal mode on every new connection, e.g. "wal".
+
+        This must be called before bind(), so that the first connection is covered too.
+
+        Args:
+            journal_mode (str): Value of PRAGMA journal_mode
+        """
+
+        @self.on_connect(provider="sqlite")
+        def set_journal_mode(_: Database, connection: Any) -> None:
+            cursor = connection.cursor()
+            cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+            cursor.close()
+
+    def ensure_mapping(
+        self,
+        schema_version: int,
+        *,
+        journal_mode: str,
+        create_tables: bool,
+        create_statements: Sequence[str] = (),
+        **bind_options: Any,
+    ) -> bool:
+        """Bind the database and generate the mapping on the first call, and do nothing afterwards.
+
+        Checking and creating the tables costs a query per table, so it is skipped
+        when SQLite's PRAGMA user_version of the file already equals schema_version,
+        and user_version is set once the tables and create_statements have been created.
+
+        Args:
+            schema_version (int): Version of the entities, bumped whenever they change
+            journal_mode (str): Value of PRAGMA journal_mode, see use_journal_mode()
+            create_tables (bool): Create the missing tables
+            create_statements (Sequence[str]): Statements creating what the entities do not map, e.g. virtual tables,
+                run along with the tables and so idempotent
+            **bind_options (Any): Arguments of bind()
+
+        Returns:
+            bool: Whether the tables were checked. Returns False if the mapping already existed or the schema was current.
+        """
+        with self._mapping_lock:
+            if self.schema is not None:
+                return False
+            self.use_journal_mode(journal_mode)
+            self.bind(**bind_options)
+            current = self.__read_user_version() == schema_version
+            self.generate_mapping(
+                check_tables=not current, create_tables=create_tables and not current
+            )
+            # NOTE: Without create_tables, what create_statements make may still be missing,
+            #       so user_version is left for a later start creating them to set
+            if create_tables and not current:
+                with db_session(strict=True):
+                    for statement in create_statements:
+                        self.execute(statement)
+                self.__write_user_version(schema_version)
+            return not current
+
+    def __file_of_user_version(self) -> str | None:
+        if self.provider_name != "sqlite":
+            return None
+        pool = self.provider.pool
+        if pool.is_shared_memory_db or pool.filename == ":memory:":
+            return None
+        return cast(str, pool.filename)
+
+    def __read_user_version(self) -> int | None:
+        filename = self.__file_of_user_version()
+        if filename is None:
+            return None
+        with closing(sqlite3.connect(filename)) as connection:
+            return int(connection.execute("PRAGMA user_version").fetchone()[0])
+
+    def __write_user_version(self, schema_version: int) -> None:
+        filename = self.__file_of_user_version()
+        if filename is None:
+            return
+        with closing(sqlite3.connect(filename)) as connection:
+            connection.execute(f"PRAGMA user_version = {int(schema_version)}")
+
+    def data_version(self) -> int:
+        """Return SQLite's PRAGMA data_version as seen by a dedicated connection.
+
+        The value changes whenever another connection commits to the database file,
+        which includes the connections of Pony in this process as well as other processes.
+        Unlike the other methods, this does not need db_session.
+
+        Returns:
+            int: Data version. Always 0 for in-memory databases and other providers.
+        """
+        if self.provider_name != "sqlite":
+            return 0
+        pool = self.provider.pool
+        if pool.is_shared_memory_db or pool.filename == ":memory:":
+            return 0
+        with self._watcher_lock:
+            if self._watcher is None:
+                self._watcher = sqlite3.connect(pool.filename, check_same_thread=False)
+            return int(self._watcher.execute("PRAGMA data_version").fetchone()[0])
+
+    def execute_many(self, sql: str, arguments: List[Sequence[Any]]) -> None:
+        """Execute a statement once per argument row with a single executemany call.
+
+        This method must be used inside db_session, and joins its transaction.
+
+        Args:
+            sql (str): SQL statement with the provider's placeholders
+            arguments (List[Sequence[Any]]): Arguments of each row
+        """
+        if not arguments:
+            return
+        self._exec_sql(sql, arguments, start_transaction=True)
+
 
 DatabaseSingleton()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import List, cast
+from datetime import date, datetime, time, timedelta
+from functools import cache
+from typing import Any, Iterable, List, Set as SetType, Tuple, cast
 
 try:
     from typing import TypeAlias
@@ -17,13 +18,46 @@ from pony.orm import (
     Required,
     Set,
     composite_key,
+    flush,
+    select,
 )
 from pony.orm.core import CacheIndexError
+from pony.utils import datetime2timestamp, timestamp2datetime
 
+from .archive import partitions
 from .connection import DatabaseSingleton
 
 Date: TypeAlias = date
 DateTime: TypeAlias = datetime
+# NOTE: Plain rows read by the fast path of list screens, which skips entity instantiation.
+#       Work entry rows come with datetimes as stored, "YYYY-MM-DD HH:MM:SS.ffffff",
+#       which sort the same as the datetimes and can be parsed in bulk by NumPy.
+TaskRow: TypeAlias = Tuple[int, str, "str | None"]
+WorkEntryTextRow: TypeAlias = Tuple[int, str, "str | None", int, str, "str | None"]
+WorkEntryRow: TypeAlias = Tuple[int, DateTime, "DateTime | None", int, str, "str | None"]
+BucketTotalTextRow: TypeAlias = Tuple[str, int, str, "str | None", float, int]
+TaskSearchRow: TypeAlias = Tuple[int, str, "str | None", "str | None", float, int]
+# NOTE: Latest work entries read to find the recently used tasks
+RECENT_SCAN_ROWS = 1000
+# NOTE: Characters of a stored date that make up each bucket of the daily totals
+BUCKET_LENGTHS = {"day": 10, "month": 7}
+
+# NOTE: Bump whenever an entity or CREATE_STATEMENTS changes,
+#       so that the tables are checked and created again on the next start
+SCHEMA_VERSION = 3
+# NOTE: Duration of a finished work entry in days, indexed so that the longest one is read in logarithmic time
+DURATION_DAYS = 'julianday("end") - julianday("start")'
+# NOTE: Full-text index of the tasks, one row per task whose rowid is the task id.
+#       The trigram tokenizer matches any substring of 3 characters or more, whatever the language,
+#       e.g. Japanese names which have no spaces between words.
+#       The index on duration bounds how far back an overlap probe looks.
+CREATE_STATEMENTS = (
+    'CREATE VIRTUAL TABLE IF NOT EXISTS "task_search" '
+    "USING fts5(name, project_category, tokenize='trigram')",
+    f'CREATE INDEX IF NOT EXISTS "idx_work_entries__duration" ON "work_entries" ({DURATION_DAYS})',
+)
+# NOTE: Shortest term the trigram index can match, shorter ones are looked for in every row
+TRIGRAM_LENGTH = 3
 
 db: Database = DatabaseSingleton.get_instance()
 
@@ -32,6 +66,22 @@ class CRUDException(Exception):
     pass
 
 
+def day_range(__date: Date) -> Tuple[DateTime, DateTime]:
+    """Return the half-open datetime range [start, end) covering the date.
+
+    Comparing the raw column against both bounds lets SQLite serve the predicate
+    from an index, whereas ``column.date() == date`` forces a full table scan.
+
+    Args:
+        __date (date): Date
+
+    Returns:
+        Tuple[datetime, datetime]: Midnight of the date and midnight of the next date
+    """
+    day_start = datetime.combine(__date, time.min)
+    return day_start, day_start + timedelta(days=1)
+
+
 class DataAlreadyExistsError(CRUDException):
     def __init__(self, entity: db.Entity) -> None:
         message = f"{entity} is already exists."
@@ -58,6 +108,21 @@ class ProjectCategory(db.Entity):  # type: ignore[misc]
         except CacheIndexError as error:
             raise CRUDException from error
 
+    @classmethod
+    def insert_many(cls, names: Iterable[str]) -> None:
+        """Insert project categories to the database with a single executemany call.
+
+        This must be used inside db_session after the names are validated.
+
+        Args:
+            names (Iterable[str]): Project category names
+        """
+        flush()
+        db.execute_many(
+            f'INSERT INTO "{cls._table_}" ("{cls.name.column}") VALUES (?)',
+            [(name,) for name in names],
+        )
+
     @classmethod
     def select_all(cls) -> List[ProjectCategory]:
         """Select all project categories from the database.
@@ -70,6 +135,52 @@ class ProjectCategory(db.Entity):  # type: ignore[misc]
             cls.select().order_by(lambda x: x.name)[:],
         )
 
+    @classmethod
+    def select_all_names(cls) -> List[str]:
+        """Select all project category names from the database without instantiating entities.
+
+        Returns:
+            List[str]: All project category names ordered by name
+        """
+        return [name for name, in db.fetch_all(cls._sql_all_names())]
+
+    @classmethod
+    @cache
+    def _sql_all_names(cls) -> str:
+        return f'SELECT "{cls.name.column}" FROM "{cls._table_}" ORDER BY 1'
+
+    @classmethod
+    def select_names_in(cls, names: Iterable[str]) -> SetType[str]:
+        """Select the names of project categories that exist among the given names from the database.
+
+        Args:
+            names (Iterable[str]): Project category names
+
+        Returns:
+            Set[str]: Names that exist in the database
+        """
+        names = list(names)
+        return set(cast(List[str], select(x.name for x in cls if x.name in names)[:]))
+
+    @classmethod
+    def select_names_after(cls, name: str | None, limit: int) -> List[str]:
+        """Select a page of project category names following the given name from the database.
+
+        Pages are read by keyset pagination, so no entity is instantiated and each page costs one index probe.
+
+        Args:
+            name (str | None): Last name of the previous page, None for the first page
+            limit (int): Maximum number of names
+
+        Returns:
+            List[str]: Project category names ordered by name
+        """
+        if name is None:
+            query = select(x.name for x in cls)
+        else:
+            query = select(x.name for x in cls if x.name > name)
+        return cast(List[str], query.order_by(1)[:limit])
+
     @classmethod
     def select_one_by_name(cls, name: str) -> ProjectCategory | None:
         """Select a project category by name from the database.
@@ -89,12 +200,13 @@ class Task(db.Entity):  # type: ignore[misc]
     name = Required(str)
     project_category = Optional("ProjectCategory")
     work_entries = Set("WorkEntry")
+    daily_task_totals = Set("DailyTaskTotal")
     composite_key(name, project_category)
 
     # TODO: docstring修正
     @classmethod
-    def insert(cls, name: str, project_category: ProjectCategory | None = None) -> None:
-        """Insert a task to the database.
+    def insert(cls, name: str, project_category: ProjectCategory | None = None) -> int:
+        """Insert a task to the database and return its id.
         Establish a relationship between task and project category if project category is given as argument.
 
         Raises CRUDException explicitly when trying to insert task whose project category is None and that is already inserted to the database the database.
@@ -118,9 +230,30 @@ class Task(db.Entity):  # type: ignore[misc]
             raise DataAlreadyExistsError(db_task)
 
         try:
-            cls(name=name, project_category=project_category)
+            db_task = cls(name=name, project_category=project_category)
         except CacheIndexError as error:
             raise CRUDException from error
+        # NOTE: The id is assigned by the insert, which flush() runs before the search index takes the task in
+        flush()
+        TaskSearch.catch_up()
+        return cast(int, db_task.id)
+
+    @classmethod
+    def insert_many(cls, records: Iterable[Tuple[str, str | None]]) -> None:
+        """Insert tasks to the database with a single executemany call.
+
+        This must be used inside db_session after the records are validated.
+
+        Args:
+            records (Iterable[Tuple[str, str | None]]): Task name and project category name
+        """
+        flush()
+        db.execute_many(
+            f'INSERT INTO "{cls._table_}" ("{cls.name.column}", "{cls.project_category.column}") '
+            "VALUES (?, ?)",
+            list(records),
+        )
+        TaskSearch.catch_up()
 
     @classmethod
     def select_all(cls) -> List[Task]:
@@ -134,6 +267,77 @@ class Task(db.Entity):  # type: ignore[misc]
             cls.select().order_by(lambda x: (x.project_category.name, x.name))[:],
         )
 
+    @classmethod
+    def select_all_rows(cls) -> List[TaskRow]:
+        """Select all tasks from the database without instantiating entities.
+
+        Returns:
+            List[Tuple[int, str, str | None]]:
+                Task id, task name and project category name ordered by project category name and task name
+        """
+        return cast(List[TaskRow], db.fetch_all(cls._sql_all_rows()))
+
+    @classmethod
+    @cache
+    def _sql_all_rows(cls) -> str:
+        # NOTE: The project category column holds its name, the primary key, so no join is needed
+        return (
+            f'SELECT "{cls.id.column}", "{cls.name.column}", "{cls.project_category.column}" '
+            f'FROM "{cls._table_}" ORDER BY 3, 2'
+        )
+
+    @classmethod
+    def select_keys_by_names(
+        cls, names: Iterable[str]
+    ) -> List[Tuple[int, str, str | None]]:
+        """Select the ids and keys of tasks having one of the given names from the database.
+
+        Args:
+            names (Iterable[str]): Task names
+
+        Returns:
+            List[Tuple[int, str, str | None]]: Task id, task name and project category name
+        """
+        names = list(names)
+        return cast(
+            List[Tuple[int, str, str | None]],
+            select((x.id, x.name, x.project_category.name) for x in cls if x.name in names)[:],
+        )
+
+    @classmethod
+    def select_keys_after(
+        cls, __id: int, limit: int
+    ) -> List[Tuple[int, str, str | None]]:
+        """Select a page of task ids and keys following the given id from the database.
+
+        Pages are read by keyset pagination, so no entity is instantiated and each page costs one index probe.
+
+        Args:
+            __id (int): Last id of the previous page, 0 for the first page
+            limit (int): Maximum number of tasks
+
+        Returns:
+            List[Tuple[int, str, str | None]]: Task id, task name and project category name ordered by id
+        """
+        return cast(
+            List[Tuple[int, str, str | None]],
+            select((x.id, x.name, x.project_category.name) for x in cls if x.id > __id)
+            .order_by(1)[:limit],
+        )
+
+    @classmethod
+    def select_ids_in(cls, ids: Iterable[int]) -> SetType[int]:
+        """Select the ids of tasks that exist among the given ids from the database.
+
+        Args:
+            ids (Iterable[int]): Task ids
+
+        Returns:
+            Set[int]: Ids that exist in the database
+        """
+        ids = list(ids)
+        return set(cast(List[int], select(x.id for x in cls if x.id in ids)[:]))
+
     @classmethod
     def select_one_by_id(cls, __id: int) -> Task | None:
         """Select a task by id from the database.
@@ -151,8 +355,8 @@ class WorkEntry(db.Entity):  # type: ignore[misc]
     _table_ = "work_entries"
     id = PrimaryKey(int, auto=True)
     task = Required("Task")
-    start = Required(datetime, precision=6)
-    end = Optional(datetime, precision=6)
+    start = Required(datetime, precision=6, index="idx_work_entries__start")
+    end = Optional(datetime, precision=6, index="idx_work_entries__end")
 
     @classmethod
     def insert(cls, task: Task, start: DateTime, end: DateTime | None = None) -> None:
@@ -165,6 +369,30 @@ class WorkEntry(db.Entity):  # type: ignore[misc]
         """
         cls(task=task, start=start, end=end)
 
+    @classmethod
+    def insert_many(cls, records: Iterable[Tuple[int, DateTime, DateTime | None]]) -> None:
+        """Insert work entries to the database with a single executemany call.
+
+        Rows are written straight to the table without instantiating entities,
+        so this must be used inside db_session after the records are validated.
+
+        Args:
+            records (Iterable[Tuple[int, datetime, datetime | None]]): Task id, start datetime and end datetime
+        """
+        flush()
+        db.execute_many(
+            f'INSERT INTO "{cls._table_}" '
+            f'("{cls.task.column}", "{cls.start.column}", "{cls.end.column}") VALUES (?, ?, ?)',
+            [
+                (
+                    task_id,
+                    datetime2timestamp(start),
+                    None if end is None else datetime2timestamp(end),
+                )
+                for task_id, start, end in records
+            ],
+        )
+
     @classmethod
     def update(
         cls,
@@ -199,16 +427,288 @@ class WorkEntry(db.Entity):  # type: ignore[misc]
     def select_all_finished_by_date(cls, __date: Date) -> List[WorkEntry]:
         """Select all finished work entries filtered by date from the database.
 
+        Args:
+            __date (date): Date
+
         Returns:
             List[WorkEntry]: All finished work entries filtered by date, and ordered by start datetime and id
         """
+        return cls.select_all_finished_between(*day_range(__date))
+
+    @classmethod
+    def select_all_finished_between(
+        cls, start: DateTime, end: DateTime
+    ) -> List[WorkEntry]:
+        """Select all finished work entries within the half-open range [start, end).
+
+        A work entry is within the range when both its start and end datetime are.
+        The predicate compares the raw columns so that it is served by the index on start.
+
+        Args:
+            start (datetime): Inclusive lower bound
+            end (datetime): Exclusive upper bound
+
+        Returns:
+            List[WorkEntry]: Finished work entries within the range, ordered by start datetime and id
+        """
         return cast(
             List[WorkEntry],
             cls.select(
-                lambda w: w.start.date() == __date and w.end.date() == __date
-            ).order_by(lambda x: (x.start, x.id))[:],
+                lambda w: w.start >= start
+                and w.start < end
+                and w.end is not None
+                and w.end < end
+            )
+            .order_by(lambda x: (x.start, x.id))
+            .prefetch(cls.task)[:],
+        )
+
+    @classmethod
+    def select_rows_between(
+        cls, start: DateTime, end: DateTime, *, include_in_progress: bool = False
+    ) -> List[WorkEntryTextRow]:
+        """Select work entries within the half-open range [start, end) without instantiating entities.
+
+        Same predicate as select_all_finished_between(), run as one prepared statement joined to the tasks.
+        Pending changes of the db_session are not seen, so this is meant for read-only sessions.
+
+        Args:
+            start (datetime): Inclusive lower bound
+            end (datetime): Exclusive upper bound
+            include_in_progress (bool): Also select work entries in progress started within the range
+
+        Returns:
+            List[Tuple[int, str, str | None, int, str, str | None]]:
+                Work entry id, start datetime, end datetime as stored, task id, task name and
+                project category name ordered by start datetime and id. End is None if in progress.
+        """
+        bounds = (datetime2timestamp(start), datetime2timestamp(end), datetime2timestamp(end))
+        return cast(
+            List[WorkEntryTextRow],
+            db.fetch_all(
+                cls._sql_rows_between("main", include_in_progress) + " ORDER BY 2, 1", bounds
+            ),
         )
 
+    @classmethod
+    @cache
+    def _sql_rows_between(cls, schema: str, include_in_progress: bool) -> str:
+        end_condition = f'w."{cls.end.column}" < ?'
+        if include_in_progress:
+            end_condition = f'(w."{cls.end.column}" IS NULL OR {end_condition})'
+        return (
+            f'SELECT w."{cls.id.column}", w."{cls.start.column}", w."{cls.end.column}", '
+            f't."{Task.id.column}", t."{Task.name.column}", t."{Task.project_category.column}" '
+            f'FROM "{schema}"."{cls._table_}" AS w '
+            f'JOIN "main"."{Task._table_}" AS t ON t."{Task.id.column}" = w."{cls.task.column}" '
+            f'WHERE w."{cls.start.column}" >= ? AND w."{cls.start.column}" < ? '
+            f"AND {end_condition}"
+        )
+
+    @staticmethod
+    def parse_rows(rows: List[WorkEntryTextRow]) -> List[WorkEntryRow]:
+        """Parse the datetimes of rows read by select_rows_between() or select_archived_rows_between()."""
+        # NOTE: fromisoformat() parses the format Pony stores datetimes in,
+        #       several times faster than timestamp2datetime()
+        parse = datetime.fromisoformat
+        return [
+            (row_id, parse(start), None if end is None else parse(end), task_id, name, category_name)
+            for row_id, start, end, task_id, name, category_name in rows
+        ]
+
+    @classmethod
+    def select_rows_after(
+        cls, __id: int, limit: int
+    ) -> List[Tuple[int, str, str | None, DateTime, DateTime | None]]:
+        """Select a page of work entries following the given id from the database.
+
+        Pages are read by keyset pagination, so no entity is instantiated and each page costs one index probe.
+
+        Args:
+            __id (int): Last id of the previous page, 0 for the first page
+            limit (int): Maximum number of work entries
+
+        Returns:
+            List[Tuple[int, str, str | None, datetime, datetime | None]]:
+                Work entry id, task name, project category name, start datetime and end datetime ordered by id
+        """
+        rows = list(
+            cast(
+                List[Tuple[int, str, str | None, DateTime, DateTime | None]],
+                select(
+                    (w.id, w.task.name, w.task.project_category.name, w.start, w.end)
+                    for w in cls
+                    if w.id > __id
+                ).order_by(1)[:limit],
+            )
+        )
+
+        # NOTE: Archived work entries keep their ids, so every partition is paged by the same key,
+        #       and the copies left in two databases by an interrupted archival are exported once
+        years = partitions.years()
+        partitions.attach(years)
+        exported = {row[0] for row in rows}
+        for year in years:
+            archived_rows = db.fetch_all(
+                "SELECT w.id, t.name, t.project_category, w.start, w.end "
+                f'FROM "{partitions.schema(year)}"."work_entries" AS w '
+                f'JOIN "main"."{Task._table_}" AS t ON t.id = w.task '
+                "WHERE w.id > ? ORDER BY w.id LIMIT ?",
+                [__id, limit],
+            )
+            rows.extend(
+                (row_id, name, category_name, timestamp2datetime(start), timestamp2datetime(end))
+                for row_id, name, category_name, start, end in archived_rows
+                if row_id not in exported
+            )
+            exported.update(row[0] for row in archived_rows)
+        if years:
+            rows = sorted(rows)[:limit]
+        return rows
+
+    @classmethod
+    def select_archived_rows_between(cls, start: DateTime, end: DateTime) -> List[WorkEntryTextRow]:
+        """Select archived work entries within the half-open range [start, end) from the archive partitions.
+
+        Only the partitions covering the range are queried, and none if the range is newer than the archive horizon.
+        The partitions are attached on demand, so this must be used before the db_session starts a transaction.
+
+        Args:
+            start (datetime): Inclusive lower bound
+            end (datetime): Exclusive upper bound
+
+        Returns:
+            List[Tuple[int, str, str | None, int, str, str | None]]:
+                Same rows as select_rows_between(), ordered by start datetime and id
+        """
+        years = partitions.covering(start, end)
+        if not years:
+            return []
+
+        partitions.attach(years)
+        bounds = (datetime2timestamp(start), datetime2timestamp(end), datetime2timestamp(end))
+        # NOTE: UNION drops the identical copies left in two partitions by an interrupted archival
+        return cast(
+            List[WorkEntryTextRow],
+            db.fetch_all(
+                " UNION ".join(
+                    cls._sql_rows_between(partitions.schema(year), False) for year in years
+                )
+                + " ORDER BY 2, 1",
+                bounds * len(years),
+            ),
+        )
+
+    @classmethod
+    def select_recent_task_ids(cls, limit: int) -> List[int]:
+        """Select the tasks of the latest work entries from the database, without archived ones.
+
+        Only the latest RECENT_SCAN_ROWS work entries are read, by the index on start,
+        so that the cost does not grow with the history.
+
+        Args:
+            limit (int): Maximum number of tasks
+
+        Returns:
+            List[int]: Task ids, the task of the latest work entry first
+        """
+        rows = db.fetch_all(cls._sql_recent_task_ids(), (RECENT_SCAN_ROWS,))
+        return list(dict.fromkeys(task_id for task_id, in rows))[:limit]
+
+    @classmethod
+    @cache
+    def _sql_recent_task_ids(cls) -> str:
+        return (
+            f'SELECT "{cls.task.column}" FROM "{cls._table_}" '
+            f'ORDER BY "{cls.start.column}" DESC LIMIT ?'
+        )
+
+    @classmethod
+    def count_finished_between(cls, start: DateTime, end: DateTime) -> int:
+        """Count the finished work entries within the half-open range [start, end), archived ones included.
+
+        Same predicate as select_rows_between(), counted on the index on start without reading the rows,
+        so that callers can tell whether the range is small enough to be drawn entry by entry.
+        The partitions are attached on demand, so this must be used before the db_session starts a transaction.
+
+        Args:
+            start (datetime): Inclusive lower bound
+            end (datetime): Exclusive upper bound
+
+        Returns:
+            int: Number of work entries
+        """
+        bounds = (datetime2timestamp(start), datetime2timestamp(end), datetime2timestamp(end))
+        years = partitions.covering(start, end)
+        partitions.attach(years)
+        schemas = tuple(["main"] + [partitions.schema(year) for year in years])
+        return cast(int, db.fetch_all(cls._sql_count_between(schemas), bounds * len(schemas))[0][0])
+
+    @classmethod
+    @cache
+    def _sql_count_between(cls, schemas: Tuple[str, ...]) -> str:
+        # NOTE: UNION over the ids drops the copies left in two databases by an interrupted archival
+        return "SELECT COUNT(*) FROM (" + " UNION ".join(
+            f'SELECT "{cls.id.column}" FROM "{schema}"."{cls._table_}" '
+            f'WHERE "{cls.start.column}" >= ? AND "{cls.start.column}" < ? '
+            f'AND "{cls.end.column}" < ?'
+            for schema in schemas
+        ) + ")"
+
+    @classmethod
+    def select_years_finished_before(cls, __datetime: DateTime) -> List[int]:
+        """Select the years of finished work entries started before the datetime from the database.
+
+        Args:
+            __datetime (datetime): Exclusive upper bound of start datetime
+
+        Returns:
+            List[int]: Years in ascending order
+        """
+        return sorted(
+            set(
+                cast(
+                    List[int],
+                    select(
+                        w.start.year
+                        for w in cls
+                        if w.start < __datetime and w.end is not None
+                    )[:],
+                )
+            )
+        )
+
+    @classmethod
+    def move_to_archive(cls, year: int, start: DateTime, end: DateTime) -> int:
+        """Move finished work entries started within [start, end) to the archive partition of the year.
+
+        The partition must be attached and created beforehand by archive.partitions.attach().
+        Copying skips rows that a previous interrupted run already copied, so the move can be retried.
+
+        Args:
+            year (int): Year of the partition
+            start (datetime): Inclusive lower bound
+            end (datetime): Exclusive upper bound
+
+        Returns:
+            int: Number of moved work entries
+        """
+        flush()
+        bounds = {"start": datetime2timestamp(start), "end": datetime2timestamp(end)}
+        condition = (
+            f'"{cls.start.column}" >= $start AND "{cls.start.column}" < $end '
+            f'AND "{cls.end.column}" IS NOT NULL'
+        )
+        db.execute(
+            f'INSERT OR IGNORE INTO "{partitions.schema(year)}"."work_entries" '
+            f'SELECT "{cls.id.column}", "{cls.task.column}", '
+            f'"{cls.start.column}", "{cls.end.column}" '
+            f'FROM "main"."{cls._table_}" WHERE {condition}',
+            bounds,
+        )
+        cursor = db.execute(f'DELETE FROM "main"."{cls._table_}" WHERE {condition}', bounds)
+        return int(cursor.rowcount)
+
     @classmethod
     def select_one_by_id(cls, __id: int) -> WorkEntry | None:
         """Select a work entry by id from the database.
@@ -229,50 +729,388 @@ class WorkEntry(db.Entity):  # type: ignore[misc]
         In progress work entry is equal to the end column has None.
 
         Args:
-            __date (int): Date
+            __date (date): Date
 
         Returns:
             WorkEntry | None: Returns None if there is no such object.
         """
-
+        day_start, day_end = day_range(__date)
         return cast(
             WorkEntry | None,
-            cls.get(lambda w: w.start.date() == __date and w.end is None),
+            cls.select(lambda w: w.start >= day_start and w.start < day_end and w.end is None)
+            .prefetch(cls.task)
+            .get(),
+        )
+
+    @classmethod
+    def select_one_overlapping(
+        cls,
+        start: DateTime,
+        end: DateTime | None,
+        exclude_id: int | None = None,
+        *,
+        latest: bool = False,
+    ) -> WorkEntry | None:
+        """Select a work entry overlapping the half-open range [start, end) from the database.
+
+        Every work entry that may overlap the range is checked, not only the latest one started before it,
+        as databases written before overlaps were rejected may hold work entries overlapping each other.
+        Finished ones are sought on the index on start, between the end of the range and
+        its start minus the longest duration stored, which the index on duration gives in logarithmic time.
+        Its cost is therefore the work entries started within that lookback, a day or so as
+        finished work entries are written within a date, whether the range is today or far in the past.
+        Work entries in progress are sought on the index on end.
+        An open end, both of the range and of the stored work entry, is treated as now.
+
+        Args:
+            start (datetime): Start datetime
+            end (datetime | None): End datetime
+            exclude_id (int | None): Work entry id to ignore, e.g. the work entry being revised
+            latest (bool): Select the one ending last, in progress first, instead of any of them.
+                Every overlapping work entry is read to sort them, so meant for short ranges of today
+
+        Returns:
+            WorkEntry | None: Returns None if there is no such object.
+        """
+        current_datetime = datetime.now()
+        if end is None:
+            end = current_datetime
+        # NOTE: Raw statements do not see the pending changes of the db_session, e.g. earlier revisions of a batch
+        flush()
+        # NOTE: A work entry in progress ends now, so it overlaps only ranges starting before now
+        include_in_progress = start < current_datetime
+        start_text, end_text = datetime2timestamp(start), datetime2timestamp(end)
+        arguments: Tuple[Any, ...] = (end_text, start_text, start_text, exclude_id)
+        if include_in_progress:
+            arguments += (end_text, exclude_id)
+        rows = db.fetch_all(cls._sql_overlapping(include_in_progress, latest), arguments)
+        if not rows:
+            return None
+        return cls.select_one_by_id(rows[0][0])
+
+    @classmethod
+    @cache
+    def _sql_overlapping(cls, include_in_progress: bool, latest: bool) -> str:
+        table, id_, start, end = (
+            f'"{cls._table_}"',
+            f'"{cls.id.column}"',
+            f'"{cls.start.column}"',
+            f'"{cls.end.column}"',
+        )
+        # NOTE: Same expression as the index on duration, so that MAX() reads its last entry only.
+        #       A second of slack covers the rounding of julianday().
+        lookback = (
+            f"datetime(julianday(?) - (SELECT MAX({DURATION_DAYS}) FROM {table}) - 1 / 86400.0)"
+        )
+        sql = (
+            f'SELECT {id_}, 0 AS in_progress, {end} FROM {table} INDEXED BY "idx_work_entries__start" '
+            f"WHERE {start} < ? AND {start} >= {lookback} AND {end} > ? AND {id_} IS NOT ?"
+        )
+        if include_in_progress:
+            sql += (
+                f' UNION ALL SELECT {id_}, 1, {end} FROM {table} INDEXED BY "idx_work_entries__end" '
+                f"WHERE {end} IS NULL AND {start} < ? AND {id_} IS NOT ?"
+            )
+        if latest:
+            sql += f" ORDER BY in_progress DESC, {end} DESC"
+        return sql + " LIMIT 1"
+
+
+class DailyTaskTotal(db.Entity):  # type: ignore[misc]
+    """Rollup of finished work entries per day and task.
+
+    Kept up to date in the same transaction as every write of finished work entries,
+    so that reports read O(days x tasks) rows instead of O(work entries).
+    """
+
+    _table_ = "daily_task_totals"
+    day = Required(date)
+    task = Required("Task")
+    total_seconds = Required(float)
+    entry_count = Required(int)
+    PrimaryKey(day, task)
+
+    @classmethod
+    def add(cls, day: Date, task: Task, seconds: float, count: int) -> None:
+        """Add seconds and entry count to the total of the day and task in the database.
+
+        Negative values subtract, and the total is deleted when no entry remains.
+
+        Args:
+            day (date): Date
+            task (Task): Task
+            seconds (float): Seconds to add
+            count (int): Number of work entries to add
+        """
+        db_total = cast(DailyTaskTotal | None, cls.get(day=day, task=task))
+        if db_total is None:
+            db_total = cls(day=day, task=task, total_seconds=0.0, entry_count=0)
+        db_total.total_seconds += seconds
+        db_total.entry_count += count
+        if db_total.entry_count <= 0:
+            db_total.delete()
+            # NOTE: The deleted total keeps its primary key in the cache until flushed,
+            #       so adding to the same day and task again in this session, e.g. by a revision, would fail
+            flush()
+
+    @classmethod
+    def add_work_entry(cls, work_entry: WorkEntry, sign: int = 1) -> None:
+        """Add a finished work entry to the totals in the database, or subtract it if sign is -1.
+
+        Work entries in progress are not counted until they are stopped.
+
+        Args:
+            work_entry (WorkEntry): Work entry
+            sign (int): 1 to add, -1 to subtract
+        """
+        if work_entry.end is None:
+            return
+        seconds = (work_entry.end - work_entry.start).total_seconds()
+        cls.add(work_entry.start.date(), work_entry.task, sign * seconds, sign)
+
+    @classmethod
+    def rebuild(cls, archived_years: List[int]) -> None:
+        """Recompute all totals from the finished work entries in the database.
+
+        Args:
+            archived_years (List[int]): Years of the archive partitions to include, attached beforehand
+        """
+        flush()
+        db.execute(f'DELETE FROM "{cls._table_}"')
+        # NOTE: Datetimes are stored as "YYYY-MM-DD HH:MM:SS.ffffff",
+        #       so the first 10 characters are the day in the format dates are stored
+        start, end = f'"{WorkEntry.start.column}"', f'"{WorkEntry.end.column}"'
+        # NOTE: UNION over the ids drops the copies left in two databases by an interrupted archival
+        columns = f'"{WorkEntry.id.column}", "{WorkEntry.task.column}", {start}, {end}'
+        source = " UNION ".join(
+            [f'SELECT {columns} FROM "main"."{WorkEntry._table_}"']
+            + [
+                f'SELECT {columns} FROM "{partitions.schema(year)}"."work_entries"'
+                for year in archived_years
+            ]
+        )
+        db.execute(
+            f'INSERT INTO "{cls._table_}" ('
+            f'"{cls.day.column}", "{cls.task.column}", '
+            f'"{cls.total_seconds.column}", "{cls.entry_count.column}"'
+            ") "
+            f'SELECT substr({start}, 1, 10), "{WorkEntry.task.column}", '
+            f"SUM(ROUND((julianday({end}) - julianday({start})) * 86400.0, 3)), COUNT(*) "
+            f"FROM ({source}) WHERE {end} IS NOT NULL "
+            "GROUP BY 1, 2"
+        )
+
+    @classmethod
+    def select_all_between(
+        cls, start: Date, end: Date
+    ) -> List[Tuple[Date, int, float, int]]:
+        """Select the totals per day and task within the half-open range [start, end) from the database.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+
+        Returns:
+            List[Tuple[date, int, float, int]]: Day, task id, total seconds and entry count ordered by day and task id
+        """
+        return cast(
+            List[Tuple[Date, int, float, int]],
+            select(
+                (x.day, x.task.id, x.total_seconds, x.entry_count)
+                for x in cls
+                if x.day >= start and x.day < end
+            ).order_by(1, 2)[:],
+        )
+
+    @classmethod
+    def select_bucket_totals_between(
+        cls, start: Date, end: Date, bucket: str
+    ) -> List[BucketTotalTextRow]:
+        """Select the totals per bucket and task within the half-open range [start, end) from the database.
+
+        Buckets are summed up from the daily totals by SQLite, so the rows are O(buckets x tasks)
+        whatever the number of work entries.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+            bucket (str): "day" or "month"
+
+        Returns:
+            List[Tuple[str, int, str, str | None, float, int]]:
+                First day of the bucket as "YYYY-MM-DD" or "YYYY-MM", task id, task name, project category name,
+                total seconds and entry count ordered by bucket and task id
+        """
+        return cast(
+            List[BucketTotalTextRow],
+            db.fetch_all(
+                cls._sql_bucket_totals_between(BUCKET_LENGTHS[bucket]),
+                (start.isoformat(), end.isoformat()),
+            ),
+        )
+
+    @classmethod
+    @cache
+    def _sql_bucket_totals_between(cls, length: int) -> str:
+        # NOTE: Dates are stored as "YYYY-MM-DD", so their prefix is the bucket they fall in
+        day = f'x."{cls.day.column}"'
+        return (
+            f'SELECT substr({day}, 1, {length}), t."{Task.id.column}", t."{Task.name.column}", '
+            f't."{Task.project_category.column}", '
+            f'SUM(x."{cls.total_seconds.column}"), SUM(x."{cls.entry_count.column}") '
+            f'FROM "{cls._table_}" AS x '
+            f'JOIN "{Task._table_}" AS t ON t."{Task.id.column}" = x."{cls.task.column}" '
+            f"WHERE {day} >= ? AND {day} < ? "
+            "GROUP BY 1, 2 ORDER BY 1, 2"
+        )
+
+    @classmethod
+    def select_category_totals_between(
+        cls, start: Date, end: Date
+    ) -> List[Tuple[Date, str | None, float, int]]:
+        """Select the totals per day and project category within the half-open range [start, end) from the database.
+
+        Args:
+            start (date): Inclusive first day
+            end (date): Exclusive last day
+
+        Returns:
+            List[Tuple[date, str | None, float, int]]: Day, project category name, total seconds and entry count ordered by day
+        """
+        return cast(
+            List[Tuple[Date, str | None, float, int]],
+            select(
+                (x.day, x.task.project_category.name, sum(x.total_seconds), sum(x.entry_count))
+                for x in cls
+                if x.day >= start and x.day < end
+            ).order_by(1)[:],
         )
 
-    # FIXME: comment out
-    # @classmethod
-    # def count_overlap_forward(cls, start: DateTime) -> int:
-    #     # FIXME: 実装
-    #     pass
-
-    # @classmethod
-    # def count_overlap_inward(cls, start: DateTime, end: DateTime) -> int:
-    #     # FIXME: 実装
-    #     pass
-
-    # @classmethod
-    # def count_overlap_backward(cls, end: DateTime) -> int:
-    #     CURRENT_DATETIME: Final[datetime] = datetime.now()
-    #     # fmt: off
-    #     query = [
-    #         "SELECT",
-    #             "COUNT(*)",
-    #         "FROM (",
-    #             "SELECT",
-    #                 f"{cls.start.column},",
-    #                 "CASE",
-    #                     f"WHEN {cls.end.column} is NULL THEN $CURRENT_DATETIME",
-    #                     f"ELSE {cls.end.column}",
-    #                     "END",
-    #                     f"AS replaced_end",
-    #             f"FROM {cls._table_}",
-    #             "WHERE",
-    #                 f"$end > {cls.start.column}",
-    #                 f"AND $end <= replaced_end"
-    #         ")",
-    #     ]
-    #     # fmt: on
-
-    #     return db.select(" ".join(query))[0]
 
+class TaskSearch:
+    """Full-text index of the task names and their project category names, in the task_search virtual table.
+
+    Tasks are never renamed nor deleted, so the index is kept in sync by taking in the tasks
+    inserted since its last row, by their ids, in the same transaction as the inserts.
+    Project categories are not indexed on their own, as what is searched for are tasks,
+    but their names are indexed with the tasks in them.
+    """
+
+    _table_ = "task_search"
+
+    @classmethod
+    def catch_up(cls) -> None:
+        """Index the tasks inserted since the last indexed one in the database.
+
+        This must be used inside db_session after the tasks are flushed.
+        """
+        db.execute(cls._sql_catch_up())
+
+    @classmethod
+    @cache
+    def _sql_catch_up(cls) -> str:
+        return (
+            f'INSERT INTO "{cls._table_}" (rowid, name, project_category) '
+            f'SELECT "{Task.id.column}", "{Task.name.column}", "{Task.project_category.column}" '
+            f'FROM "{Task._table_}" WHERE "{Task.id.column}" > ({cls._sql_last_id()})'
+        )
+
+    @classmethod
+    def lags(cls) -> bool:
+        """Return whether the database has tasks which are not indexed, e.g. inserted by hand or by older versions.
+
+        Returns:
+            bool: True if catch_up() has tasks to index
+        """
+        ((lags,),) = db.fetch_all(cls._sql_lags())
+        return bool(lags)
+
+    @classmethod
+    @cache
+    def _sql_lags(cls) -> str:
+        return (
+            f'SELECT coalesce((SELECT max("{Task.id.column}") FROM "{Task._table_}"), 0) '
+            f"> ({cls._sql_last_id()})"
+        )
+
+    @classmethod
+    @cache
+    def _sql_last_id(cls) -> str:
+        # NOTE: FTS5 serves ORDER BY rowid DESC from its index, whereas max(rowid) scans the table
+        return f'SELECT coalesce((SELECT rowid FROM "{cls._table_}" ORDER BY rowid DESC LIMIT 1), 0)'
+
+    @staticmethod
+    def parse_query(query: str) -> Tuple[str, List[str]]:
+        """Split what the user typed into a MATCH expression and short terms, every term having to match.
+
+        Terms are matched as substrings, never as FTS5 syntax, so that quotes, operators or asterisks
+        typed by the user are taken as they are.
+
+        Args:
+            query (str): Terms separated by spaces
+
+        Returns:
+            Tuple[str, List[str]]: MATCH expression of the terms the trigram index can match, empty if none,
+                and the shorter terms
+        """
+        phrases: List[str] = []
+        short_terms: List[str] = []
+        for term in query.split():
+            if len(term) >= TRIGRAM_LENGTH:
+                phrases.append('"' + term.replace('"', '""') + '"')
+            else:
+                short_terms.append(term)
+        return " ".join(phrases), short_terms
+
+    @classmethod
+    def select_hits(cls, query: str, limit: int) -> List[TaskSearchRow]:
+        """Select the tasks matching the query with their last day and totals from the database, in one query.
+
+        Matches are found by the full-text index, best ranked first, and only these tasks are looked up
+        in the daily totals by their task index, so the cost grows with the matches instead of the history.
+        Days and totals are those of the finished work entries, archived ones included.
+
+        Args:
+            query (str): Terms separated by spaces, see parse_query()
+            limit (int): Maximum number of tasks
+
+        Returns:
+            List[Tuple[int, str, str | None, str | None, float, int]]:
+                Task id, task name, project category name, last day worked as "YYYY-MM-DD" or None if never,
+                total seconds and entry count, best matching first and most recently worked first among equals
+        """
+        expression, short_terms = cls.parse_query(query)
+        if not expression and not short_terms:
+            return []
+        args: List[object] = [expression] if expression else []
+        for term in short_terms:
+            args.extend((term, term))
+        args.append(limit)
+        return cast(
+            List[TaskSearchRow],
+            db.fetch_all(cls._sql_hits(bool(expression), len(short_terms)), tuple(args)),
+        )
+
+    @classmethod
+    @cache
+    def _sql_hits(cls, match: bool, short_term_count: int) -> str:
+        conditions = [f'"{cls._table_}" MATCH ?'] if match else []
+        # NOTE: Not LIKE, which Pony makes case sensitive on its connections, unlike the trigram index
+        conditions += [
+            "(instr(lower(name), lower(?)) OR instr(lower(coalesce(project_category, '')), lower(?)))"
+        ] * short_term_count
+        day = f'x."{DailyTaskTotal.day.column}"'
+        return (
+            "WITH matched AS ("
+            f'SELECT rowid AS id, {"rank" if match else "0"} AS rank FROM "{cls._table_}" '
+            f"WHERE {' AND '.join(conditions)} "
+            # NOTE: Without terms to rank by, the latest tasks are taken
+            f"ORDER BY {'rank' if match else 'rowid DESC'} LIMIT ?"
+            ") "
+            f'SELECT t."{Task.id.column}", t."{Task.name.column}", t."{Task.project_category.column}", '
+            f'max({day}), coalesce(sum(x."{DailyTaskTotal.total_seconds.column}"), 0.0), '
+            f'coalesce(sum(x."{DailyTaskTotal.entry_count.column}"), 0) '
+            f'FROM matched AS m JOIN "{Task._table_}" AS t ON t."{Task.id.column}" = m.id '
+            f'LEFT JOIN "{DailyTaskTotal._table_}" AS x ON x."{DailyTaskTotal.task.column}" = m.id '
+            "GROUP BY m.id, m.rank ORDER BY m.rank, 4 DESC"
+        )
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from . import view_models
+from .data import entities as models
+
+# NOTE: Datetimes are naive local times, held as microseconds since the epoch like datetime64 does
+DATETIME_DTYPE = "datetime64[us]"
+ONE_SECOND = np.timedelta64(1, "s")
+
+
+class WorkEntryFrame:
+    """Columnar batch of work entries backed by NumPy arrays, for charts and aggregation.
+
+    Each work entry is one position in the arrays. Tasks are kept once in a lookup table
+    instead of once per work entry, and work entries in progress have NaT as end datetime.
+    """
+
+    __slots__ = ("ids", "task_ids", "starts", "ends", "tasks")
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        task_ids: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        tasks: Dict[int, Tuple[str, str | None]],
+    ) -> None:
+        """
+        Args:
+            ids (np.ndarray): Work entry ids as int64
+            task_ids (np.ndarray): Task ids as int64
+            starts (np.ndarray): Start datetimes as datetime64[us]
+            ends (np.ndarray): End datetimes as datetime64[us], NaT if in progress
+            tasks (Dict[int, Tuple[str, str | None]]): Task name and project category name by task id
+        """
+        self.ids = ids
+        self.task_ids = task_ids
+        self.starts = starts
+        self.ends = ends
+        self.tasks = tasks
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[models.WorkEntryTextRow]) -> WorkEntryFrame:
+        """Fill the arrays straight from query results.
+
+        Datetimes are parsed from the stored text by NumPy in bulk, never as datetime objects.
+
+        Args:
+            rows (Sequence[models.WorkEntryTextRow]): Rows read by models.WorkEntry.select_rows_between()
+
+        Returns:
+            WorkEntryFrame: Work entries in the order of the rows
+        """
+        count = len(rows)
+        return cls(
+            ids=np.fromiter((row[0] for row in rows), dtype=np.int64, count=count),
+            task_ids=np.fromiter((row[3] for row in rows), dtype=np.int64, count=count),
+            starts=np.array([row[1] for row in rows], dtype=DATETIME_DTYPE),
+            ends=np.array([row[2] for row in rows], dtype=DATETIME_DTYPE),
+            tasks={row[3]: (row[4], row[5]) for row in rows},
+        )
+
+    def fingerprint(self) -> int:
+        """Hash of the work entries and their tasks, equal for frames of equal content.
+
+        Work entries in progress hash the same until they are stopped, whatever the time.
+        """
+        return hash(
+            (
+                self.ids.tobytes(),
+                self.task_ids.tobytes(),
+                self.starts.tobytes(),
+                self.ends.tobytes(),
+                frozenset(self.tasks.items()),
+            )
+        )
+
+    @property
+    def in_progress(self) -> np.ndarray:
+        """Boolean mask of the work entries in progress."""
+        return np.isnat(self.ends)
+
+    def ends_at(self, now: datetime | None = None) -> np.ndarray:
+        """End datetimes, with now for the work entries in progress.
+
+        Args:
+            now (datetime | None): Current datetime, datetime.now() by default
+
+        Returns:
+            np.ndarray: End datetimes as datetime64[us]
+        """
+        if now is None:
+            now = datetime.now()
+        return np.where(self.in_progress, np.datetime64(now, "us"), self.ends)
+
+    def durations(self, now: datetime | None = None) -> np.ndarray:
+        """Seconds of each work entry, counting the ones in progress until now.
+
+        Args:
+            now (datetime | None): Current datetime, datetime.now() by default
+
+        Returns:
+            np.ndarray: Seconds as float64
+        """
+        return (self.ends_at(now) - self.starts) / ONE_SECOND
+
+    def total_seconds_by_task(self, now: datetime | None = None) -> Dict[int, float]:
+        """Sum the seconds per task.
+
+        Args:
+            now (datetime | None): Current datetime, datetime.now() by default
+
+        Returns:
+            Dict[int, float]: Total seconds by task id
+        """
+        task_ids, inverse = np.unique(self.task_ids, return_inverse=True)
+        totals = np.bincount(inverse, weights=self.durations(now), minlength=len(task_ids))
+        return dict(zip(task_ids.tolist(), totals.tolist()))
+
+    def total_seconds_by_day(self, now: datetime | None = None) -> Dict[date, float]:
+        """Sum the seconds per day the work entries started on.
+
+        Args:
+            now (datetime | None): Current datetime, datetime.now() by default
+
+        Returns:
+            Dict[date, float]: Total seconds by day
+        """
+        days, inverse = np.unique(self.starts.astype("datetime64[D]"), return_inverse=True)
+        totals = np.bincount(inverse, weights=self.durations(now), minlength=len(days))
+        return dict(zip(days.astype(date).tolist(), totals.tolist()))
+
+    def clip_to_working_hours(
+        self, begin: time, end: time, now: datetime | None = None
+    ) -> WorkEntryFrame:
+        """Clip each work entry to the working hours of the day it started on.
+
+        Work entries entirely outside the working hours are dropped,
+        and the ones in progress are clipped as if they ended now.
+
+        Args:
+            begin (time): Start of the working hours
+            end (time): End of the working hours
+            now (datetime | None): Current datetime, datetime.now() by default
+
+        Returns:
+            WorkEntryFrame: Clipped work entries, none of them in progress
+        """
+        days = self.starts.astype("datetime64[D]").astype(DATETIME_DTYPE)
+        lower = days + np.timedelta64(datetime.combine(date.min, begin) - datetime.min)
+        upper = days + np.timedelta64(datetime.combine(date.min, end) - datetime.min)
+        starts = np.maximum(self.starts, lower)
+        ends = np.minimum(self.ends_at(now), upper)
+        keep = ends > starts
+        return WorkEntryFrame(
+            ids=self.ids[keep],
+            task_ids=self.task_ids[keep],
+            starts=starts[keep],
+            ends=ends[keep],
+            tasks=self.tasks,
+        )
+
+    def task_label(self, task_id: int) -> str:
+        """Label of a task, same as str() of view_models.Task."""
+        name, category_name = self.tasks[task_id]
+        return view_models.format_task(task_id, name, category_name)
+
+    def task_labels(self) -> np.ndarray:
+        """Label of the task of each work entry, built once per task.
+
+        Returns:
+            np.ndarray: Labels as object array
+        """
+        task_ids, inverse = np.unique(self.task_ids, return_inverse=True)
+        labels = np.array([self.task_label(task_id) for task_id in task_ids.tolist()], dtype=object)
+        return labels[inverse]
+
+
+class BucketTotalFrame:
+    """Columnar totals per bucket of days and task, backed by NumPy arrays, for range charts.
+
+    Each position is one task within one bucket, a day or a month, so the size is bounded by
+    buckets x tasks instead of the number of work entries.
+    """
+
+    __slots__ = ("bucket", "buckets", "task_ids", "total_seconds", "entry_counts", "tasks")
+
+    def __init__(
+        self,
+        bucket: str,
+        buckets: np.ndarray,
+        task_ids: np.ndarray,
+        total_seconds: np.ndarray,
+        entry_counts: np.ndarray,
+        tasks: Dict[int, Tuple[str, str | None]],
+    ) -> None:
+        """
+        Args:
+            bucket (str): "day" or "month"
+            buckets (np.ndarray): First day of each bucket as datetime64[D]
+            task_ids (np.ndarray): Task ids as int64
+            total_seconds (np.ndarray): Total seconds as float64
+            entry_counts (np.ndarray): Numbers of work entries as int64
+            tasks (Dict[int, Tuple[str, str | None]]): Task name and project category name by task id
+        """
+        self.bucket = bucket
+        self.buckets = buckets
+        self.task_ids = task_ids
+        self.total_seconds = total_seconds
+        self.entry_counts = entry_counts
+        self.tasks = tasks
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+    @classmethod
+    def from_rows(cls, bucket: str, rows: Sequence[models.BucketTotalTextRow]) -> BucketTotalFrame:
+        """Fill the arrays straight from query results.
+
+        Args:
+            bucket (str): "day" or "month"
+            rows (Sequence[models.BucketTotalTextRow]): Rows read by models.DailyTaskTotal.select_bucket_totals_between()
+
+        Returns:
+            BucketTotalFrame: Totals in the order of the rows
+        """
+        count = len(rows)
+        return cls(
+            bucket=bucket,
+            # NOTE: NumPy reads "YYYY-MM" as the first day of the month
+            buckets=np.array([row[0] for row in rows], dtype="datetime64[D]"),
+            task_ids=np.fromiter((row[1] for row in rows), dtype=np.int64, count=count),
+            total_seconds=np.fromiter((row[4] for row in rows), dtype=np.float64, count=count),
+            entry_counts=np.fromiter((row[5] for row in rows), dtype=np.int64, count=count),
+            tasks={row[1]: (row[2], row[3]) for row in rows},
+        )
+
+    def fingerprint(self) -> int:
+        """Hash of the totals and their tasks, equal for frames of equal content."""
+        return hash(
+            (
+                self.bucket,
+                self.buckets.tobytes(),
+                self.task_ids.tobytes(),
+                self.total_seconds.tobytes(),
+                self.entry_counts.tobytes(),
+                frozenset(self.tasks.items()),
+            )
+        )
+
+    def task_label(self, task_id: int) -> str:
+        """Label of a task, same as str() of view_models.Task."""
+        name, category_name = self.tasks[task_id]
+        return view_models.format_task(task_id, name, category_name)
@@ -0,0 +1,216 @@
+"""Spans of the SQL statements, business logic calls and colleague renders of each rerun, for finding where time goes.
+
+Disabled unless InstrumentationSettings asks for a trace file or the debug panel. When disabled,
+business logic is left unwrapped and the statement hook is not installed, so what remains is a check per render.
+"""
+from __future__ import annotations
+
+import inspect
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, TypeVar, cast
+
+from .config import InstrumentationSettings
+from .data.connection import DatabaseSingleton
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class Span:
+    kind: str
+    name: str
+    depth: int
+    start_ms: float
+    duration_ms: float
+    # NOTE: Duration without the nested spans, e.g. a business logic call without its SQL
+    self_ms: float
+
+
+class RerunTrace:
+    """Spans of one rerun of the script, recorded by the thread running it."""
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now()
+        self.spans: List[Span] = []
+        self.__origin = perf_counter()
+        # NOTE: Seconds spent in the nested spans of each open span, innermost last
+        self.__children: List[float] = []
+
+    @contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        self.__children.append(0.0)
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            seconds = perf_counter() - started
+            self.__record(kind, name, started, seconds, self.__children.pop())
+
+    def add(self, kind: str, name: str, started: float, seconds: float) -> None:
+        """Record a span without nested spans which has already ended, e.g. a statement."""
+        self.__record(kind, name, started, seconds, 0.0)
+
+    def __record(self, kind: str, name: str, started: float, seconds: float, children: float) -> None:
+        if self.__children:
+            self.__children[-1] += seconds
+        self.spans.append(
+            Span(
+                kind=kind,
+                name=name,
+                depth=len(self.__children),
+                start_ms=(started - self.__origin) * 1e3,
+                duration_ms=seconds * 1e3,
+                self_ms=(seconds - children) * 1e3,
+            )
+        )
+
+    def ordered(self) -> List[Span]:
+        """Return the spans in the order they started, each before the spans nested in it."""
+        return sorted(self.spans, key=lambda span: (span.start_ms, span.depth))
+
+    def self_ms_by_kind(self) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.kind] = totals.get(span.kind, 0.0) + span.self_ms
+        return totals
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(timespec="milliseconds"),
+            "duration_ms": (perf_counter() - self.__origin) * 1e3,
+            "statements": sum(span.kind == "sql" for span in self.spans),
+            "self_ms_by_kind": self.self_ms_by_kind(),
+            "spans": [asdict(span) for span in self.ordered()],
+        }
+
+
+class Tracer:
+    """Collects the spans of the rerun each thread runs, and writes each finished rerun to the trace file."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.debug_panel = False
+        self.trace_file: str | None = None
+        self.__current: ContextVar[RerunTrace | None] = ContextVar("rerun_trace", default=None)
+        self.__configured = False
+        self.__lock = Lock()
+        # NOTE: Bound once, as each access to a method makes a new bound method,
+        #       which remove_statement_timer() would not find by identity
+        self.__statement_timer = self.__time_statement
+
+    def configure_once(self) -> None:
+        """Apply InstrumentationSettings on the first call, and do nothing afterwards."""
+        if self.__configured:
+            return
+        with self.__lock:
+            if self.__configured:
+                return
+            settings = InstrumentationSettings()
+            self.configure(settings.trace_file, settings.debug_panel)
+
+    def configure(self, trace_file: str | None, debug_panel: bool) -> None:
+        """Enable tracing if there is anywhere to show it, and hook into the statements of the database.
+
+        Settings are not read anymore once this has been called.
+
+        Args:
+            trace_file (str | None): File each rerun is appended to as a JSON line, None for no file
+            debug_panel (bool): Whether the debug panel is drawn
+        """
+        self.trace_file = trace_file
+        self.debug_panel = debug_panel
+        enabled = trace_file is not None or debug_panel
+        if enabled and not self.enabled:
+            DatabaseSingleton.get_instance().add_statement_timer(self.__statement_timer)
+        elif self.enabled and not enabled:
+            DatabaseSingleton.get_instance().remove_statement_timer(self.__statement_timer)
+        self.enabled = enabled
+        self.__configured = True
+
+    def current(self) -> RerunTrace | None:
+        """Return the trace of the rerun this thread runs, None when disabled or outside of a rerun."""
+        return self.__current.get()
+
+    @contextmanager
+    def rerun(self) -> Iterator[RerunTrace | None]:
+        """Trace a rerun of the script, and append it to the trace file once it ends, even by st.rerun()."""
+        self.configure_once()
+        if not self.enabled:
+            yield None
+            return
+        trace = RerunTrace()
+        token = self.__current.set(trace)
+        try:
+            yield trace
+        finally:
+            self.__current.reset(token)
+            if self.trace_file is not None:
+                line = json.dumps(trace.to_json())
+                with self.__lock, open(self.trace_file, "a", encoding="utf-8") as file:
+                    file.write(line + "\n")
+
+    @contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        trace = self.__current.get()
+        if trace is None:
+            yield
+            return
+        with trace.span(kind, name):
+            yield
+
+    def __time_statement(self, sql: str, started: float, seconds: float) -> None:
+        trace = self.__current.get()
+        if trace is not None:
+            trace.add("sql", sql, started, seconds)
+
+
+tracer = Tracer()
+
+
+def traced(kind: str) -> Callable[[F], F]:
+    """Record each call of the decorated function as a span of the current rerun, if any."""
+
+    def decorator(func: F) -> F:
+        name = func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            trace = tracer.current()
+            if trace is None:
+                return func(*args, **kwargs)
+            with trace.span(kind, name):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def instrument(module: ModuleType, kind: str = "logic") -> None:
+    """Wrap the public static and class methods of the classes defined in the module with traced().
+
+    Calls between them, e.g. a report reading another one, go through the class and are nested spans.
+    Called once by bootstrap.ensure_mapping() when the tracer is enabled, so that nothing is wrapped otherwise.
+
+    Args:
+        module (ModuleType): Module, e.g. business_logic
+        kind (str): Kind of the spans
+    """
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        if cls.__module__ != module.__name__ or issubclass(cls, BaseException):
+            continue
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_"):
+                continue
+            if isinstance(member, staticmethod):
+                setattr(cls, name, staticmethod(traced(kind)(member.__func__)))
+            elif isinstance(member, classmethod):
+                setattr(cls, name, classmethod(traced(kind)(member.__func__)))
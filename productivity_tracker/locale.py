@@ -11,6 +11,7 @@ class Language(BaseModel):
     date_selection_button: StrictStr
     # job_addition_manually
     job_addition_manually_expander: StrictStr
+    job_addition_manually_text_input: StrictStr
     job_addition_manually_selectbox: StrictStr
     job_addition_manually_slider: StrictStr
     job_addition_manually_button: StrictStr
@@ -23,20 +24,37 @@ class Language(BaseModel):
     job_creation_button: StrictStr
     # job_logs
     job_logs_selectbox: StrictStr
-    job_logs_slider: StrictStr
+    job_logs_start: StrictStr
+    job_logs_end: StrictStr
+    job_logs_page: StrictStr
     job_logs_button: StrictStr
+    # job_search
+    job_search_expander: StrictStr
+    job_search_text_input: StrictStr
+    job_search_job: StrictStr
+    job_search_last_day: StrictStr
+    job_search_hours: StrictStr
+    job_search_entries: StrictStr
+    job_search_selectbox: StrictStr
+    job_search_button: StrictStr
     # job_timer
+    job_timer_text_input: StrictStr
     job_timer_selectbox: StrictStr
     job_timer_button_start: StrictStr
     job_timer_button_stop: StrictStr
+    job_timer_metric: StrictStr
     # note_area
     note_area_text_area: StrictStr
     note_area_button: StrictStr
-    # TODO: timeline_chart
+    # timeline_chart
+    timeline_chart_radio: StrictStr
     # working_hours_schedule
     working_hours_schedule_slider: StrictStr
     # locale_selection
     language_selection_selectbox: StrictStr
+    # debug_panel
+    debug_panel_expander: StrictStr
+    debug_panel_caption: StrictStr
 
     def __str__(self) -> str:
         return self.language
@@ -51,6 +69,7 @@ class LanguageEN(Language):
             date_selection_date_input="Date",
             date_selection_button="Today",
             job_addition_manually_expander="Register a record manually",
+            job_addition_manually_text_input="Search jobs",
             job_addition_manually_selectbox="What you did?",
             job_addition_manually_slider="When did you do?",
             job_addition_manually_button="Register",
@@ -61,13 +80,28 @@ class LanguageEN(Language):
             job_creation_text_input="Job/Category name",
             job_creation_button="Create",
             job_logs_selectbox="Job",
-            job_logs_slider="Hours worked",
+            job_logs_start="Start",
+            job_logs_end="End",
+            job_logs_page="Page",
             job_logs_button="Revise",
+            job_search_expander="Search the history of jobs",
+            job_search_text_input="Job/Category name contains",
+            job_search_job="Job",
+            job_search_last_day="Last day",
+            job_search_hours="Hours",
+            job_search_entries="Records",
+            job_search_selectbox="Which job's last day do you show?",
+            job_search_button="Show the day",
+            job_timer_text_input="Search jobs",
             job_timer_selectbox="Which job do you start/stop?",
             job_timer_button_start="Start",
             job_timer_button_stop="Stop",
+            job_timer_metric="Working on",
             note_area_text_area="Note",
             note_area_button="Save",
+            timeline_chart_radio="View",
             working_hours_schedule_slider="How long do you plan to work today?",
             language_selection_selectbox="Language",
+            debug_panel_expander="Debug: spans of this rerun",
+            debug_panel_caption="Self time excludes nested spans. SQL covers execution, not the rows fetched afterwards.",
         )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+
+class IntervalIndex:
+    """In-memory index of the work entries of a day.
+
+    Intervals are kept sorted by start, along with the running maximum of their ends.
+    A probe bisects for the latest interval started before the probed range ends, then walks back
+    only while an earlier interval may still end after the range starts, so that a long interval
+    hidden behind shorter later ones is found too, e.g. in databases written before overlaps were rejected.
+    An open end is treated as now at probe time.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[int, datetime, datetime | None]] = ()) -> None:
+        self.__starts: List[Tuple[datetime, int]] = []
+        self.__ends: Dict[int, datetime | None] = {}
+        # NOTE: Latest end among the intervals up to each position, an open end counting as the latest
+        self.__max_ends: List[datetime] = []
+        for interval_id, start, end in intervals:
+            self.add(interval_id, start, end)
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+    def add(self, interval_id: int, start: datetime, end: datetime | None) -> None:
+        """Add an interval.
+
+        Args:
+            interval_id (int): Interval id, e.g. work entry id
+            start (datetime): Start datetime
+            end (datetime | None): End datetime, None if the interval is still open
+        """
+        position = bisect_left(self.__starts, (start, interval_id))
+        self.__starts.insert(position, (start, interval_id))
+        self.__ends[interval_id] = end
+        # NOTE: Intervals mostly come in order of start, so the tail to update is usually empty
+        self.__max_ends.insert(position, datetime.min)
+        max_end = self.__max_ends[position - 1] if position > 0 else datetime.min
+        for i in range(position, len(self.__starts)):
+            interval_end = self.__ends[self.__starts[i][1]]
+            max_end = max(max_end, datetime.max if interval_end is None else interval_end)
+            self.__max_ends[i] = max_end
+
+    def find_overlap(
+        self, start: datetime, end: datetime | None, exclude_id: int | None = None
+    ) -> int | None:
+        """Find an interval overlapping the half-open range [start, end).
+
+        Args:
+            start (datetime): Start datetime
+            end (datetime | None): End datetime, None if the range is still open
+            exclude_id (int | None): Interval id to ignore, e.g. the work entry being revised
+
+        Returns:
+            int | None: Id of the overlapping interval. Returns None if there is no such interval.
+        """
+        current_datetime = datetime.now()
+        if end is None:
+            end = current_datetime
+
+        position = bisect_left(self.__starts, (end,)) - 1
+        while position >= 0 and self.__max_ends[position] > start:
+            _, candidate_id = self.__starts[position]
+            candidate_end = self.__ends[candidate_id]
+            if candidate_end is None:
+                candidate_end = current_datetime
+            if candidate_id != exclude_id and candidate_end > start:
+                return candidate_id
+            position -= 1
+        return None
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import heapq
+import math
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from .view_models import TaskRecord
+
+# NOTE: Share of the trigrams of a query a task must contain to match without a prefix
+MIN_SIMILARITY = 0.5
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TaskSearchIndex:
+    """In-memory index to search tasks by what the user types, instead of listing them all.
+
+    Task names, project category names and "#id" are kept sorted for prefix search,
+    and the label of each task, "#id category/name", is split into trigrams for fuzzy search.
+    Tasks are only ever added, as they are never renamed nor deleted, and in the order of their ids,
+    so that the ones added last are the newest.
+    """
+
+    def __init__(self, tasks: Iterable[TaskRecord] = ()) -> None:
+        self.__tasks: Dict[int, TaskRecord] = {}
+        self.__labels: Dict[int, str] = {}
+        self.__prefixes: List[Tuple[str, int]] = []
+        self.__trigrams: Dict[str, Set[int]] = {}
+        self.max_id = 0
+        # NOTE: Sorted once at the end instead of inserting each key in order
+        for task in tasks:
+            self.__prefixes.extend(self.__index(task))
+        self.__prefixes.sort()
+
+    def __len__(self) -> int:
+        return len(self.__tasks)
+
+    def add(self, task: TaskRecord) -> None:
+        """Add a task, unless added already.
+
+        Args:
+            task (TaskRecord): Task
+        """
+        for key in self.__index(task):
+            insort(self.__prefixes, key)
+
+    def __index(self, task: TaskRecord) -> List[Tuple[str, int]]:
+        """Index the label of a task, returning its prefix keys to be kept sorted by the caller."""
+        if task.id in self.__tasks:
+            return []
+        label = normalize(str(task))
+        self.__tasks[task.id] = task
+        self.__labels[task.id] = label
+        for trigram in trigrams(label):
+            self.__trigrams.setdefault(trigram, set()).add(task.id)
+        self.max_id = max(self.max_id, task.id)
+        keys = {normalize(task.name), f"#{task.id}"}
+        if task.project_category is not None:
+            keys.add(normalize(task.project_category.name))
+        return [(key, task.id) for key in keys]
+
+    def search(self, query: str, limit: int, recent: Sequence[int] = ()) -> List[TaskRecord]:
+        """Search the tasks best matching the query.
+
+        Tasks whose name, project category name or id starts with the query come first,
+        then the ones sharing most of its trigrams. Ties go to the most recently used tasks,
+        then to the shortest labels, which the query covers the most.
+        An empty query returns the most recently used tasks, then the newest ones.
+
+        Args:
+            query (str): What the user typed
+            limit (int): Maximum number of tasks
+            recent (Sequence[int]): Task ids, most recently used first
+
+        Returns:
+            List[TaskRecord]: Tasks best matching first
+        """
+        ranks = {task_id: rank for rank, task_id in enumerate(recent)}
+        normalized = normalize(query)
+        if not normalized:
+            # NOTE: The newest tasks, i.e. the ones added last, fill in after the recent ones,
+            #       as they are likely to be used next
+            ids = [task_id for task_id in recent if task_id in self.__tasks]
+            ids.extend(
+                task_id
+                for task_id in islice(reversed(self.__tasks), limit + len(ids))
+                if task_id not in ranks
+            )
+            return [self.__tasks[task_id] for task_id in ids[:limit]]
+
+        # NOTE: Scores are (0 for a prefix match else 1, -similarity), lower is better
+        scores: Dict[int, Tuple[int, float]] = {}
+        position = bisect_left(self.__prefixes, (normalized,))
+        # NOTE: Walked by index, as slicing would copy the rest of the prefixes on every keystroke
+        for index in range(position, len(self.__prefixes)):
+            key, task_id = self.__prefixes[index]
+            if not key.startswith(normalized):
+                break
+            scores[task_id] = (0, -1.0)
+
+        # NOTE: Fuzzy matches rank after every prefix match,
+        #       so they are not needed once the prefix matches fill the limit
+        query_trigrams = trigrams(normalized)
+        if query_trigrams and len(scores) < limit:
+            postings = sorted((self.__trigrams.get(t, set()) for t in query_trigrams), key=len)
+            needed = math.ceil(MIN_SIMILARITY * len(postings))
+            # NOTE: A task sharing the needed trigrams is in one of the len - needed + 1
+            #       smallest postings at least, so the largest ones are only probed
+            candidates = set().union(*postings[: len(postings) - needed + 1])
+            for task_id in candidates.difference(scores):
+                count = sum(task_id in posting for posting in postings)
+                if count >= needed:
+                    scores[task_id] = (1, -count / len(postings))
+
+        unranked = len(ranks)
+        labels = self.__labels
+        best = heapq.nsmallest(
+            limit,
+            scores,
+            key=lambda i: (*scores[i], ranks.get(i, unranked), len(labels[i]), labels[i]),
+        )
+        return [self.__tasks[task_id] for task_id in best]
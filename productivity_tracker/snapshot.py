@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Sequence, Tuple
+
+from .frames import WorkEntryFrame
+from .overlap import IntervalIndex
+from .view_models import TaskRecord, WorkEntryRecord
+
+# NOTE: Approximate bytes per work entry besides the arrays: its record, its two datetimes
+#       and its entries in the interval index. Tasks are shared with the identity map and not counted.
+ENTRY_BYTES = (
+    sys.getsizeof(WorkEntryRecord(0, TaskRecord(0, ""), datetime.min, datetime.min))
+    + 2 * sys.getsizeof(datetime.min)
+    + sys.getsizeof((datetime.min, 0))
+    + 2 * sys.getsizeof(0)
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DaySnapshot:
+    """Work entries of a day at one data version, shared read-only by every session showing the day."""
+
+    day: date
+    work_entries: Tuple[WorkEntryRecord, ...]
+    work_entry_in_progress: WorkEntryRecord | None
+    work_entry_frame: WorkEntryFrame
+    interval_index: IntervalIndex
+
+    @classmethod
+    def build(
+        cls,
+        day: date,
+        work_entries: Sequence[WorkEntryRecord],
+        work_entry_in_progress: WorkEntryRecord | None,
+        work_entry_frame: WorkEntryFrame,
+    ) -> DaySnapshot:
+        """Build a snapshot, indexing its work entries and making its arrays read-only.
+
+        Args:
+            day (date): Date
+            work_entries (Sequence[WorkEntryRecord]): Finished work entries of the date
+            work_entry_in_progress (WorkEntryRecord | None): Work entry in progress started on the date
+            work_entry_frame (WorkEntryFrame): Finished and in progress work entries of the date as columns
+
+        Returns:
+            DaySnapshot: Snapshot
+        """
+        intervals = list(work_entries)
+        if work_entry_in_progress is not None:
+            intervals.append(work_entry_in_progress)
+        for array in (
+            work_entry_frame.ids,
+            work_entry_frame.task_ids,
+            work_entry_frame.starts,
+            work_entry_frame.ends,
+        ):
+            array.flags.writeable = False
+        return cls(
+            day=day,
+            work_entries=tuple(work_entries),
+            work_entry_in_progress=work_entry_in_progress,
+            work_entry_frame=work_entry_frame,
+            interval_index=IntervalIndex((w.id, w.start, w.end) for w in intervals),
+        )
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the snapshot, for the memory budget of the cache."""
+        frame = self.work_entry_frame
+        arrays = frame.ids.nbytes + frame.task_ids.nbytes + frame.starts.nbytes + frame.ends.nbytes
+        entries = len(self.work_entries) + (self.work_entry_in_progress is not None)
+        return arrays + entries * ENTRY_BYTES
@@ -0,0 +1,280 @@
+import csv
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple, TypeVar
+
+from . import business_logic as logic
+from . import view_models
+
+# Every stage is a generator handing over one chunk at a time,
+# so memory use does not depend on the number of rows in the file or in the database.
+
+T = TypeVar("T")
+Row = Dict[str, Any]
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class Entity(str, Enum):
+    project_categories = "project_categories"
+    tasks = "tasks"
+    work_entries = "work_entries"
+
+
+class Format(str, Enum):
+    csv = "csv"
+    jsonl = "jsonl"
+
+    @classmethod
+    def from_filename(cls, filename: str) -> "Format":
+        """Guess the format from the file extension, JSON Lines by default."""
+        if filename.lower().endswith(".csv"):
+            return cls.csv
+        return cls.jsonl
+
+
+FIELDNAMES: Dict[Entity, List[str]] = {
+    Entity.project_categories: ["name"],
+    Entity.tasks: ["name", "project_category"],
+    Entity.work_entries: ["task", "project_category", "start", "end"],
+}
+# NOTE: Fields a row cannot be imported without, the others being None when missing
+REQUIRED_FIELDNAMES: Dict[Entity, List[str]] = {
+    Entity.project_categories: ["name"],
+    Entity.tasks: ["name"],
+    Entity.work_entries: ["task", "start"],
+}
+
+
+class RowFormatError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class UnreadableRow:
+    """Line of a file which could not be read as a row, reported in place of the row."""
+
+    message: str
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of at most size items."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def export_rows(entity: Entity, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Row]:
+    """Read all rows of the entity page by page with keyset pagination.
+
+    Args:
+        entity (Entity): Entity to export
+        chunk_size (int): Number of rows read per query
+
+    Yields:
+        Row: Row keyed by FIELDNAMES[entity]
+    """
+    match entity:
+        case Entity.project_categories:
+            last_name: str | None = None
+            while names := logic.ProjectCategory.acquire_names_after(last_name, chunk_size):
+                yield from ({"name": name} for name in names)
+                last_name = names[-1]
+        case Entity.tasks:
+            last_id = 0
+            while keys := logic.Task.acquire_keys_after(last_id, chunk_size):
+                for _, name, category_name in keys:
+                    yield {"name": name, "project_category": category_name}
+                last_id = keys[-1][0]
+        case Entity.work_entries:
+            last_id = 0
+            while rows := logic.WorkEntry.acquire_rows_after(last_id, chunk_size):
+                for _, task_name, category_name, start, end in rows:
+                    yield {
+                        "task": task_name,
+                        "project_category": category_name,
+                        "start": start.isoformat(),
+                        "end": None if end is None else end.isoformat(),
+                    }
+                last_id = rows[-1][0]
+
+
+def write_rows(entity: Entity, rows: Iterable[Row], file: IO[str], file_format: Format) -> int:
+    """Write rows to a text file.
+
+    Args:
+        entity (Entity): Entity of the rows
+        rows (Iterable[Row]): Rows keyed by FIELDNAMES[entity]
+        file (IO[str]): Destination opened with newline=""
+        file_format (Format): File format
+
+    Returns:
+        int: Number of written rows
+    """
+    count = 0
+    match file_format:
+        case Format.csv:
+            writer = csv.DictWriter(file, fieldnames=FIELDNAMES[entity])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        case Format.jsonl:
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+    return count
+
+
+def read_rows(file: IO[str], file_format: Format) -> Iterator[Row | UnreadableRow]:
+    """Read rows from a text file one line at a time.
+
+    Empty CSV fields are read as None. A line which is not a JSON object is yielded as UnreadableRow,
+    so that it is reported as a rejected row instead of ending the import.
+
+    Args:
+        file (IO[str]): Source opened with newline=""
+        file_format (Format): File format
+
+    Yields:
+        Row | UnreadableRow: Row keyed by the CSV header or the JSON keys
+    """
+    match file_format:
+        case Format.csv:
+            for csv_row in csv.DictReader(file):
+                yield {key: value if value != "" else None for key, value in csv_row.items()}
+        case Format.jsonl:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield UnreadableRow(f"Invalid JSON: {error}")
+                    continue
+                if not isinstance(row, dict):
+                    yield UnreadableRow(f"Expected a JSON object, got {type(row).__name__}.")
+                    continue
+                yield row
+
+
+def parse_row(entity: Entity, row: Row | UnreadableRow) -> Tuple[Any, ...]:
+    """Pick the fields of a row read from a file in the order of FIELDNAMES[entity].
+
+    Raises:
+        RowFormatError: Occurs when the row is unreadable or a required field is missing.
+    """
+    if isinstance(row, UnreadableRow):
+        raise RowFormatError(row.message)
+    missing = [name for name in REQUIRED_FIELDNAMES[entity] if row.get(name) is None]
+    if missing:
+        raise RowFormatError(f"Missing {', '.join(missing)}.")
+    return tuple(row.get(name) for name in FIELDNAMES[entity])
+
+
+def import_rows(
+    entity: Entity, rows: Iterable[Row | UnreadableRow], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[view_models.BatchReport]:
+    """Register rows chunk by chunk through the batched register_many of the business logic.
+
+    Each chunk is one transaction. A rejected row, e.g. unreadable or missing a field, does not abort its chunk.
+    Work entries keep their datetimes as they are in the file, seconds included.
+
+    Args:
+        entity (Entity): Entity of the rows
+        rows (Iterable[Row | UnreadableRow]): Rows keyed by FIELDNAMES[entity]
+        chunk_size (int): Number of rows registered per transaction
+
+    Yields:
+        view_models.BatchReport: Report of each chunk, whose error rows are numbered from the first row
+    """
+    task_ids: Dict[Tuple[str, str | None], int] = {}
+    offset = 0
+    for chunk in chunked(rows, chunk_size):
+        # NOTE: Positions of the parsed records in the chunk, to number the errors of register_many
+        positions: List[int] = []
+        records: List[Tuple[Any, ...]] = []
+        errors: List[view_models.RowError] = []
+        for i, row in enumerate(chunk):
+            try:
+                records.append(parse_row(entity, row))
+            except RowFormatError as error:
+                errors.append(view_models.RowError(row=i, message=str(error)))
+                continue
+            positions.append(i)
+
+        match entity:
+            case Entity.project_categories:
+                report = logic.ProjectCategory.register_many(name for name, in records)
+            case Entity.tasks:
+                report = logic.Task.register_many(
+                    (name, category_name) for name, category_name in records
+                )
+            case Entity.work_entries:
+                report = _import_work_entries(records, task_ids)
+        errors.extend(
+            view_models.RowError(row=positions[error.row], message=error.message)
+            for error in report.errors
+        )
+        errors.sort(key=lambda error: error.row)
+        yield view_models.BatchReport(
+            registered=report.registered,
+            errors=[
+                view_models.RowError(row=offset + error.row, message=error.message)
+                for error in errors
+            ],
+        )
+        offset += len(chunk)
+
+
+def _import_work_entries(
+    records: List[Tuple[Any, ...]], task_ids: Dict[Tuple[str, str | None], int]
+) -> view_models.BatchReport:
+    """Resolve the tasks of a chunk with one query and register its work entries.
+
+    Args:
+        records (List[Tuple[Any, ...]]): Fields of the rows parsed by parse_row()
+        task_ids (Dict[Tuple[str, str | None], int]): Task ids resolved by previous chunks, updated in place
+
+    Returns:
+        view_models.BatchReport: Report whose error rows are numbered within the records
+    """
+    keys = {(task_name, category_name) for task_name, category_name, _, _ in records}
+    missing_keys = keys - task_ids.keys()
+    if missing_keys:
+        task_ids.update(logic.Task.acquire_ids_by_keys(missing_keys))
+
+    rows: List[int] = []
+    valid_records: List[Tuple[int, datetime, datetime]] = []
+    errors: List[view_models.RowError] = []
+    for i, (task_name, category_name, start_text, end_text) in enumerate(records):
+        key = (task_name, category_name)
+        if key not in task_ids:
+            label = task_name if category_name is None else f"{category_name}/{task_name}"
+            message = f"Task({label}) cannot be found."
+            errors.append(view_models.RowError(row=i, message=message))
+            continue
+        if end_text is None:
+            message = "Work entry in progress cannot be imported."
+            errors.append(view_models.RowError(row=i, message=message))
+            continue
+        try:
+            start = datetime.fromisoformat(start_text)
+            end = datetime.fromisoformat(end_text)
+        except (TypeError, ValueError) as error:
+            errors.append(view_models.RowError(row=i, message=str(error)))
+            continue
+        rows.append(i)
+        valid_records.append((task_ids[key], start, end))
+
+    # NOTE: Exported datetimes are kept as they are, so that a round trip changes nothing
+    report = logic.WorkEntry.register_many(valid_records, truncate=False)
+    errors.extend(
+        view_models.RowError(row=rows[error.row], message=error.message)
+        for error in report.errors
+    )
+    errors.sort(key=lambda error: error.row)
+    return view_models.BatchReport(registered=report.registered, errors=errors)
@@ -1,18 +1,34 @@
+from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, StrictInt, StrictStr, field_validator
 
 from .data import entities as models
 
 
+def format_task(task_id: int, name: str, project_category: Any) -> str:
+    if project_category is None:
+        return f"#{task_id} {name}"
+    return f"#{task_id} {project_category}/{name}"
+
+
+def format_work_entry(task: Any, start: datetime, end: datetime | None) -> str:
+    datetime_format = "%H:%M"
+    if end is None:
+        return f"{start.strftime(datetime_format)} - ??:?? ({task})"
+    return f"{start.strftime(datetime_format)} - {end.strftime(datetime_format)} ({task})"
+
+
+# NOTE: Every model sets defer_build, so that its validator is built on first use instead of on import,
+#       which the command-line client would otherwise spend a tenth of its startup on for models it never builds
 class ProjectCategory(BaseModel):
     name: StrictStr
 
     def __str__(self) -> str:
         return f"{self.name}"
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "defer_build": True}
 
 
 class Task(BaseModel):
@@ -21,18 +37,17 @@ class Task(BaseModel):
     project_category: ProjectCategory | None = None
 
     def __str__(self) -> str:
-        if self.project_category is None:
-            return f"#{self.id} {self.name}"
-        return f"#{self.id} {self.project_category}/{self.name}"
+        return format_task(self.id, self.name, self.project_category)
 
     @field_validator("project_category", mode="before")
     @classmethod
     def pony_set_project_category(cls, value: models.ProjectCategory | None) -> Any:
         if value is None:
             return None
-        return value.to_dict()
+        # NOTE: Read the primary key only, which never triggers a lazy load unlike to_dict()
+        return {"name": value.name}
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "defer_build": True}
 
 
 class WorkEntry(BaseModel):
@@ -42,10 +57,166 @@ class WorkEntry(BaseModel):
     end: Optional[datetime]
 
     def __str__(self) -> str:
-        datetime_format = "%H:%M"
-        if self.end is None:
-            return f"{self.start.strftime(datetime_format)} - ??:?? ({self.task})"
-        return f"{self.start.strftime(datetime_format)} - {self.end.strftime(datetime_format)} ({self.task})"
+        return format_work_entry(self.task, self.start, self.end)
+
+    model_config = {"from_attributes": True, "defer_build": True}
+
+
+# NOTE: Read-only variants of the models above for rendering, rebuilt on every rerun.
+#       They skip validation, which the database schema already guarantees,
+#       and have no per instance __dict__.
+@dataclass(frozen=True, slots=True)
+class ProjectCategoryRecord:
+    name: str
+
+    def __str__(self) -> str:
+        return f"{self.name}"
+
+
+@dataclass(frozen=True, slots=True)
+class TaskRecord:
+    id: int
+    name: str
+    project_category: ProjectCategoryRecord | None = None
+
+    def __str__(self) -> str:
+        return format_task(self.id, self.name, self.project_category)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkEntryRecord:
+    id: int
+    task: TaskRecord
+    start: datetime
+    end: datetime | None
+
+    def __str__(self) -> str:
+        return format_work_entry(self.task, self.start, self.end)
+
+
+class IdentityMap:
+    """Builds each project category and task record once, and hands out the same object afterwards.
+
+    One map lives per data version, as tasks and project categories never change otherwise.
+    Work entries built through the same map share their task with the task list,
+    so looking a work entry's task up in the list, e.g. by list.index(), matches by identity
+    instead of comparing fields.
+    """
+
+    def __init__(self) -> None:
+        self.__project_categories: Dict[str, ProjectCategoryRecord] = {}
+        self.__tasks: Dict[int, TaskRecord] = {}
+
+    def project_category(self, name: str) -> ProjectCategoryRecord:
+        project_category = self.__project_categories.get(name)
+        if project_category is None:
+            # NOTE: setdefault keeps the first record if another thread built one meanwhile
+            project_category = self.__project_categories.setdefault(
+                name, ProjectCategoryRecord(name)
+            )
+        return project_category
+
+    def task(self, task_id: int, name: str, category_name: str | None) -> TaskRecord:
+        task = self.__tasks.get(task_id)
+        if task is None:
+            project_category = (
+                None if category_name is None else self.project_category(category_name)
+            )
+            task = self.__tasks.setdefault(task_id, TaskRecord(task_id, name, project_category))
+        return task
+
+    def work_entries(self, rows: List[models.WorkEntryRow]) -> List[WorkEntryRecord]:
+        """Build work entry records from rows parsed by models.WorkEntry.parse_rows().
+
+        Args:
+            rows (List[models.WorkEntryRow]): Rows
+
+        Returns:
+            List[WorkEntryRecord]: Work entries in the order of the rows
+        """
+        task = self.task
+        return [
+            WorkEntryRecord(row_id, task(task_id, name, category_name), start, end)
+            for row_id, start, end, task_id, name, category_name in rows
+        ]
+
+
+class RowError(BaseModel):
+    row: StrictInt
+    message: StrictStr
+
+    def __str__(self) -> str:
+        return f"Row {self.row}: {self.message}"
+
+    model_config = {"defer_build": True}
+
 
-    model_config = {"from_attributes": True}
+class BatchReport(BaseModel):
+    registered: StrictInt
+    errors: List[RowError]
+
+    model_config = {"defer_build": True}
+
+
+class RerunMetrics(BaseModel):
+    """Data slices a rerun took anew, and the ones it kept from the previous rerun.
+
+    Each slice taken anew costs one query, or none when it is shared by another session's earlier load.
+    """
+
+    reloaded: List[StrictStr]
+    skipped: List[StrictStr]
+
+    @property
+    def queries_run(self) -> int:
+        return len(self.reloaded)
+
+    @property
+    def queries_skipped(self) -> int:
+        return len(self.skipped)
+
+    model_config = {"defer_build": True}
+
+
+class DailyTaskTotal(BaseModel):
+    day: date
+    task_id: StrictInt
+    total_seconds: float
+    entry_count: StrictInt
+
+    model_config = {"defer_build": True}
+
+
+class CategoryTotal(BaseModel):
+    period_start: date
+    project_category: StrictStr | None
+    total_seconds: float
+    entry_count: StrictInt
+
+    model_config = {"defer_build": True}
+
+
+class DailyOvertime(BaseModel):
+    day: date
+    worked_seconds: float
+    scheduled_seconds: float
+
+    @property
+    def overtime_seconds(self) -> float:
+        return self.worked_seconds - self.scheduled_seconds
+
+    model_config = {"defer_build": True}
+
+
+class TaskSearchHit(BaseModel):
+    task_id: StrictInt
+    task_name: StrictStr
+    project_category: StrictStr | None
+    last_day: date | None
+    total_seconds: float
+    entry_count: StrictInt
+
+    def __str__(self) -> str:
+        return format_task(self.task_id, self.task_name, self.project_category)
 
+    model_config = {"defer_build": True}
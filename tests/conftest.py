@@ -0,0 +1,41 @@
+"""Fixtures binding the application database to one temporary SQLite file for the whole test session.
+
+The database is bound once per process, so tests share it. Tasks and project categories are never deleted
+and stay, so each test registers them under names of its own. Work entries and daily task totals
+are deleted after every test, by another connection, which changes the data version and so drops the caches.
+"""
+import os
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+from typing import Iterator
+
+import pytest
+
+FILENAME = os.path.join(tempfile.mkdtemp(prefix="my-work-tracker-test-"), "sqlite.db")
+os.environ["FILENAME"] = FILENAME
+os.environ.pop("ARCHIVE_DIRECTORY", None)
+
+# pylint: disable=wrong-import-position
+from productivity_tracker.bootstrap import ensure_mapping  # noqa: E402
+
+ensure_mapping()
+
+
+@pytest.fixture
+def filename() -> str:
+    return FILENAME
+
+
+@pytest.fixture
+def the_day() -> date:
+    """Day before yesterday, so that work entries of the day neither are in progress nor archived."""
+    return date.today() - timedelta(days=2)
+
+
+@pytest.fixture(autouse=True)
+def delete_work_entries() -> Iterator[None]:
+    yield
+    with sqlite3.connect(FILENAME) as connection:
+        connection.execute("DELETE FROM work_entries")
+        connection.execute("DELETE FROM daily_task_totals")
@@ -0,0 +1,97 @@
+import os
+import sqlite3
+from datetime import date, datetime, time, timedelta
+from typing import Iterator
+
+import pytest
+
+from productivity_tracker import business_logic as logic
+from productivity_tracker import transfer
+from productivity_tracker.data.archive import partitions
+
+HORIZON_DAYS = 365
+COUNT = 10
+
+
+@pytest.fixture(scope="module")
+def archive_directory(tmp_path_factory: pytest.TempPathFactory) -> str:
+    # NOTE: Partitions stay attached to the connections, so every test archives to the same files
+    return str(tmp_path_factory.mktemp("archive"))
+
+
+@pytest.fixture(scope="module")
+def task_id() -> int:
+    return logic.Task.register("archive")
+
+
+@pytest.fixture
+def archived_day(archive_directory: str, task_id: int) -> Iterator[date]:
+    """Day of work entries all moved to the archive partition of its year."""
+    the_day = date.today() - timedelta(days=HORIZON_DAYS + 30)
+    logic.WorkEntry.register_many(
+        (
+            task_id,
+            datetime.combine(the_day, time(8 + i)),
+            datetime.combine(the_day, time(8 + i, 30)),
+        )
+        for i in range(COUNT)
+    )
+    partitions.configure(archive_directory, HORIZON_DAYS)
+    try:
+        assert logic.Archive.archive() == COUNT
+        yield the_day
+    finally:
+        partitions.configure(None, HORIZON_DAYS)
+        partition = os.path.join(archive_directory, f"work_entries_{the_day.year}.db")
+        with sqlite3.connect(partition) as connection:
+            connection.execute("DELETE FROM work_entries")
+
+
+def test_rebuild_counts_a_work_entry_left_in_two_databases_once(
+    filename: str, archived_day: date, task_id: int
+) -> None:
+    copy_back_first_archived_row(filename, archived_day)
+
+    logic.Report.rebuild()
+
+    totals = logic.Report.acquire_task_totals(
+        archived_day, archived_day + timedelta(days=1)
+    )
+    assert totals == {task_id: COUNT * 1800.0}
+
+
+def test_export_writes_a_work_entry_left_in_two_databases_once(
+    filename: str, archived_day: date
+) -> None:
+    copy_back_first_archived_row(filename, archived_day)
+
+    exported = [
+        row
+        for row in transfer.export_rows(transfer.Entity.work_entries, chunk_size=4)
+        if row["task"] == "archive"
+    ]
+
+    assert len(exported) == COUNT
+    assert len({row["start"] for row in exported}) == COUNT
+
+
+def test_archived_day_lists_a_work_entry_left_in_two_databases_once(
+    filename: str, archived_day: date
+) -> None:
+    copy_back_first_archived_row(filename, archived_day)
+
+    work_entries = logic.WorkEntry.acquire_all_finished_by_date(archived_day)
+
+    assert len(work_entries) == COUNT
+
+
+def copy_back_first_archived_row(filename: str, archived_day: date) -> None:
+    """Leave what an archival interrupted between copying to the partition and deleting from main does."""
+    with sqlite3.connect(filename) as connection:
+        connection.execute(
+            'ATTACH DATABASE ? AS "partition"', [partitions.filename(archived_day.year)]
+        )
+        connection.execute(
+            'INSERT INTO "main"."work_entries" '
+            'SELECT * FROM "partition"."work_entries" ORDER BY id LIMIT 1'
+        )
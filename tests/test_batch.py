@@ -0,0 +1,101 @@
+from datetime import date, datetime, time, timedelta
+
+from productivity_tracker import business_logic as logic
+
+
+def at(the_day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(the_day, time(hour, minute))
+
+
+def test_project_category_register_many_reports_existing_names() -> None:
+    logic.ProjectCategory.register("batch-category")
+
+    report = logic.ProjectCategory.register_many(
+        ["batch-category", "batch-category-new", "batch-category-new"]
+    )
+
+    assert report.registered == 1
+    assert [(error.row, error.message) for error in report.errors] == [
+        (0, "ProjectCategory(batch-category) already exists."),
+        (2, "ProjectCategory(batch-category-new) already exists."),
+    ]
+
+
+def test_task_register_many_reports_existing_tasks_and_missing_categories() -> None:
+    logic.ProjectCategory.register("batch-task-category")
+
+    report = logic.Task.register_many(
+        [
+            ("batch-task", "batch-task-category"),
+            ("batch-task", None),
+            ("batch-task", "batch-task-category"),
+            ("batch-task", "batch-missing-category"),
+        ]
+    )
+
+    assert report.registered == 2
+    assert [(error.row, error.message) for error in report.errors] == [
+        (2, "Task(batch-task-category/batch-task) already exists."),
+        (3, "Project category(batch-missing-category) is specified, but not found."),
+    ]
+
+
+def test_work_entry_register_many_reports_invalid_rows_and_keeps_the_others(
+    the_day: date,
+) -> None:
+    task_id = logic.Task.register("batch-work-entry")
+    logic.WorkEntry.register(task_id, at(the_day, 8), at(the_day, 9))
+    missing_task_id = max(task.id for task in logic.Task.acquire_all()) + 1
+
+    report = logic.WorkEntry.register_many(
+        [
+            (task_id, at(the_day, 10), at(the_day, 11)),
+            (task_id, at(the_day, 8, 30), at(the_day, 9, 30)),
+            (task_id, at(the_day, 10, 30), at(the_day, 11, 30)),
+            (missing_task_id, at(the_day, 12), at(the_day, 13)),
+            (task_id, at(the_day, 15), at(the_day, 14)),
+            (task_id, at(the_day, 13), at(the_day, 14)),
+        ]
+    )
+
+    assert report.registered == 2
+    assert [error.row for error in report.errors] == [1, 2, 3, 4]
+    assert report.errors[0].message.endswith("overlaps with the specified time.")
+    assert report.errors[1].message == "Row 0 overlaps with the specified time."
+    assert report.errors[2].message == f"Task(id={missing_task_id}) cannot be found."
+    assert report.errors[3].message == "End time must be greater than start time."
+    assert len(logic.WorkEntry.acquire_all_finished_by_date(the_day)) == 3
+    totals = logic.Report.acquire_task_totals(the_day, the_day + timedelta(days=1))
+    assert totals == {task_id: 3 * 3600.0}
+
+
+def test_work_entry_revise_many_reports_overlaps_within_the_batch(
+    the_day: date,
+) -> None:
+    task_id = logic.Task.register("batch-revise")
+    logic.WorkEntry.register_many(
+        [
+            (task_id, at(the_day, 9), at(the_day, 10)),
+            (task_id, at(the_day, 11), at(the_day, 12)),
+        ]
+    )
+    first, second = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+
+    report = logic.WorkEntry.revise_many(
+        [
+            (first.id, task_id, at(the_day, 9), at(the_day, 11, 30)),
+            (second.id, task_id, at(the_day, 11), at(the_day, 12, 30)),
+        ]
+    )
+
+    assert report.registered == 1
+    assert [error.row for error in report.errors] == [0]
+    assert (
+        report.errors[0].message
+        == f"WorkEntry(id={second.id}) overlaps with the specified time."
+    )
+    revised = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+    assert [(w.start, w.end) for w in revised] == [
+        (at(the_day, 9), at(the_day, 10)),
+        (at(the_day, 11), at(the_day, 12, 30)),
+    ]
@@ -0,0 +1,108 @@
+import sqlite3
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from productivity_tracker import business_logic as logic
+from productivity_tracker.overlap import IntervalIndex
+
+
+def at(the_day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(the_day, time(hour, minute))
+
+
+def test_interval_index_finds_an_overlap() -> None:
+    index = IntervalIndex([(1, datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 10))])
+
+    assert (
+        index.find_overlap(datetime(2024, 1, 1, 9, 30), datetime(2024, 1, 1, 11)) == 1
+    )
+    assert index.find_overlap(datetime(2024, 1, 1, 8), datetime(2024, 1, 1, 9, 30)) == 1
+    assert (
+        index.find_overlap(datetime(2024, 1, 1, 9, 30), datetime(2024, 1, 1, 11), 1)
+        is None
+    )
+
+
+def test_interval_index_keeps_ranges_touching_apart() -> None:
+    index = IntervalIndex([(1, datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 10))])
+
+    assert (
+        index.find_overlap(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11)) is None
+    )
+    assert index.find_overlap(datetime(2024, 1, 1, 8), datetime(2024, 1, 1, 9)) is None
+
+
+def test_interval_index_finds_an_overlap_hidden_behind_shorter_intervals() -> None:
+    # NOTE: The long interval started first, so the ones started after it come first on the way back
+    index = IntervalIndex(
+        [
+            (1, datetime(2024, 1, 1, 8), datetime(2024, 1, 1, 18)),
+            (2, datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 10)),
+            (3, datetime(2024, 1, 1, 11), datetime(2024, 1, 1, 12)),
+        ]
+    )
+
+    assert index.find_overlap(datetime(2024, 1, 1, 13), datetime(2024, 1, 1, 14)) == 1
+
+
+def test_interval_index_treats_an_open_end_as_overlapping_later_ranges() -> None:
+    index = IntervalIndex([(1, datetime(2024, 1, 1, 9), None)])
+
+    assert index.find_overlap(datetime(2024, 1, 1, 20), datetime(2024, 1, 1, 21)) == 1
+    assert index.find_overlap(datetime(2024, 1, 1, 7), datetime(2024, 1, 1, 8)) is None
+
+
+def test_register_rejects_an_overlapping_work_entry(the_day: date) -> None:
+    task_id = logic.Task.register("overlap-register")
+    logic.WorkEntry.register(task_id, at(the_day, 9), at(the_day, 10))
+
+    with pytest.raises(logic.OverlapException):
+        logic.WorkEntry.register(task_id, at(the_day, 9, 30), at(the_day, 11))
+    logic.WorkEntry.register(task_id, at(the_day, 10), at(the_day, 11))
+
+    assert len(logic.WorkEntry.acquire_all_finished_by_date(the_day)) == 2
+
+
+def test_register_rejects_an_overlap_hidden_behind_a_shorter_work_entry(
+    filename: str, the_day: date
+) -> None:
+    # NOTE: Databases written before overlaps were rejected may hold entries over several days
+    task_id = logic.Task.register("overlap-hidden")
+    with sqlite3.connect(filename) as connection:
+        connection.execute(
+            'INSERT INTO work_entries (task, start, "end") VALUES (?, ?, ?)',
+            (
+                task_id,
+                f"{the_day - timedelta(days=3)} 20:00:00.000000",
+                f"{the_day} 14:00:00.000000",
+            ),
+        )
+    logic.WorkEntry.register(task_id, at(the_day, 15), at(the_day, 16))
+
+    with pytest.raises(logic.OverlapException):
+        logic.WorkEntry.register(task_id, at(the_day, 13), at(the_day, 13, 30))
+
+
+def test_revise_ignores_the_revised_work_entry(the_day: date) -> None:
+    task_id = logic.Task.register("overlap-revise")
+    logic.WorkEntry.register(task_id, at(the_day, 9), at(the_day, 10))
+    (work_entry,) = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+
+    logic.WorkEntry.revise(
+        work_entry.id, task_id, at(the_day, 9, 30), at(the_day, 10, 30)
+    )
+
+    (revised,) = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+    assert (revised.start, revised.end) == (at(the_day, 9, 30), at(the_day, 10, 30))
+
+
+def test_start_after_a_work_entry_stopped_within_the_minute() -> None:
+    task_id = logic.Task.register("overlap-start")
+    for _ in range(3):
+        logic.WorkEntry.start(task_id)
+        work_entry = logic.WorkEntry.acquire_one_in_progress_by_date(date.today())
+        assert work_entry is not None
+        logic.WorkEntry.stop(work_entry.id)
+
+    assert logic.WorkEntry.acquire_one_in_progress_by_date(date.today()) is None
@@ -0,0 +1,54 @@
+"""The acquire_* methods run a constant number of SQL statements whatever the row count."""
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, List
+
+from productivity_tracker import business_logic as logic
+from productivity_tracker.data.connection import DatabaseSingleton
+
+ROW_COUNTS = [10, 100, 1000]
+
+
+def test_acquire_runs_a_constant_number_of_statements(the_day: date) -> None:
+    db = DatabaseSingleton.get_instance()
+    day_start = datetime.combine(the_day, time.min)
+    checks: Dict[str, Callable[[], object]] = {
+        "Task.acquire_all": logic.Task.acquire_all,
+        "ProjectCategory.acquire_all": logic.ProjectCategory.acquire_all,
+        "WorkEntry.acquire_all_finished_by_date": (
+            lambda: logic.WorkEntry.acquire_all_finished_by_date(the_day)
+        ),
+        "WorkEntry.acquire_one_in_progress_by_date": (
+            lambda: logic.WorkEntry.acquire_one_in_progress_by_date(date.today())
+        ),
+    }
+    counts: Dict[str, List[int]] = {name: [] for name in checks}
+
+    registered = 0
+    for row_count in ROW_COUNTS:
+        new_rows = range(registered, row_count)
+        logic.ProjectCategory.register_many(f"count-category-{i}" for i in new_rows)
+        keys = [
+            (f"count-task-{i}", f"count-category-{i}" if i % 2 else None)
+            for i in new_rows
+        ]
+        logic.Task.register_many(keys)
+        task_ids = logic.Task.acquire_ids_by_keys(keys)
+        # NOTE: One minute entries, each of a different task, fill at most 720 rows of the day
+        logic.WorkEntry.register_many(
+            (
+                task_ids[keys[i - registered]],
+                day_start + timedelta(minutes=2 * i),
+                day_start + timedelta(minutes=2 * i + 1),
+            )
+            for i in range(registered, min(row_count, 720))
+        )
+        registered = row_count
+
+        for name, check in checks.items():
+            with db.count_statements() as counter:
+                check()
+            counts[name].append(counter.count)
+
+    assert all(
+        len(set(statement_counts)) == 1 for statement_counts in counts.values()
+    ), counts
@@ -0,0 +1,80 @@
+"""The date selectors of work entries are served by the indexes on start and end instead of a scan.
+
+Each selector runs while its statements are recorded, and the statements reading work_entries are explained by SQLite.
+"""
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime, time, timedelta
+from typing import Callable, List
+
+import pytest
+from pony.orm import db_session
+
+from productivity_tracker.data import entities as models
+from productivity_tracker.data.connection import DatabaseSingleton
+
+THE_DAY = date.today() - timedelta(days=3)
+DAY_START = datetime.combine(THE_DAY, time.min)
+WEEK = (DAY_START, DAY_START + timedelta(days=7))
+
+
+def explain(filename: str, sql: str) -> List[str]:
+    """Return the details of the query plan, binding NULL to every placeholder."""
+    with closing(sqlite3.connect(filename)) as connection:
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count("?"))
+        return [detail for _, _, _, detail in rows]
+
+
+# NOTE: Selector and the index its statements on work_entries must search
+@pytest.mark.parametrize(
+    "select, index",
+    [
+        (
+            lambda: models.WorkEntry.select_all_finished_by_date(THE_DAY),
+            "idx_work_entries__start",
+        ),
+        (
+            lambda: models.WorkEntry.select_all_finished_between(*WEEK),
+            "idx_work_entries__start",
+        ),
+        (
+            lambda: models.WorkEntry.select_rows_between(*WEEK),
+            "idx_work_entries__start",
+        ),
+        (
+            lambda: models.WorkEntry.select_one_in_progress_by_date(THE_DAY),
+            "idx_work_entries__end",
+        ),
+        # NOTE: Finished work entries are sought from the start of the range minus the longest duration
+        (
+            lambda: models.WorkEntry.select_one_overlapping(*WEEK),
+            "idx_work_entries__start",
+        ),
+    ],
+    ids=[
+        "select_all_finished_by_date",
+        "select_all_finished_between",
+        "select_rows_between",
+        "select_one_in_progress_by_date",
+        "select_one_overlapping",
+    ],
+)
+def test_selector_searches_an_index(
+    filename: str, select: Callable[[], object], index: str
+) -> None:
+    db = DatabaseSingleton.get_instance()
+    with db_session(strict=True), db.count_statements() as counter:
+        select()
+    plans = [
+        explain(filename, sql)
+        for sql in counter.statements
+        if f'"{models.WorkEntry._table_}"' in sql
+    ]
+
+    assert plans
+    details = [detail for plan in plans for detail in plan]
+    assert not any(detail.startswith("SCAN") for detail in details), details
+    # NOTE: Loading a work entry by id after finding it searches the primary key, which is fine
+    for plan in plans:
+        if not all("USING INTEGER PRIMARY KEY" in detail for detail in plan):
+            assert any(f"USING INDEX {index}" in detail for detail in plan), plan
@@ -0,0 +1,62 @@
+"""Reruns read from the database only the data slices a write or a date change made dirty.
+
+Runs main.py through Streamlit's AppTest and compares the data slices each interaction reloaded.
+"""
+import os
+import sqlite3
+from datetime import date, timedelta
+from typing import Set
+
+from streamlit.testing.v1 import AppTest
+
+from productivity_tracker.app_state import (
+    DataSlice,
+    KeyDataSlices,
+    KeyDateSelection,
+    KeyTaskAdditionManually,
+    KeyTaskCreation,
+    KeyTaskTimer,
+)
+
+MAIN = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py"
+)
+
+
+def test_reruns_reload_only_dirty_data_slices(filename: str) -> None:
+    every = {data_slice.name for data_slice in DataSlice}
+    dated = {"work_entries", "work_entry_in_progress", "work_entry_frame"}
+    # NOTE: Streamlit keys the session state by str() of the Enum members
+    app = AppTest.from_file(MAIN, default_timeout=60)
+
+    def reloaded() -> Set[str]:
+        assert not app.exception, [e.value for e in app.exception]
+        return set(app.session_state[str(KeyDataSlices.rerun_metrics)].reloaded)
+
+    app.run()
+    assert reloaded() == every, "first run"
+    app.radio(key=str(KeyTaskCreation.radio)).set_value("category").run()
+    assert reloaded() == set(), "switch a radio"
+    app.text_input(key=str(KeyTaskCreation.input)).input("rerun-category").run()
+    app.button(key=str(KeyTaskCreation.button)).click().run()
+    assert reloaded() == {"project_categories"}, "create a category"
+    app.radio(key=str(KeyTaskCreation.radio)).set_value("job").run()
+    app.text_input(key=str(KeyTaskCreation.input)).input("rerun-task").run()
+    app.button(key=str(KeyTaskCreation.button)).click().run()
+    assert reloaded() == {"tasks"}, "create a task"
+    app.selectbox(key=str(KeyTaskAdditionManually.selectbox)).select_index(0).run()
+    app.button(key=str(KeyTaskAdditionManually.button)).click().run()
+    assert reloaded() == {"work_entries", "work_entry_frame"}, "add a work entry"
+    app.selectbox(key=str(KeyTaskTimer.selectbox)).select_index(0).run()
+    app.button(key=str(KeyTaskTimer.button_start)).click().run()
+    assert reloaded() == {"work_entry_in_progress", "work_entry_frame"}, "start a task"
+    app.date_input(key=str(KeyDateSelection.input)).set_value(
+        date.today() - timedelta(days=1)
+    ).run()
+    assert reloaded() == dated, "change the date"
+    with sqlite3.connect(filename) as connection:
+        connection.execute(
+            "INSERT INTO project_categories (name) VALUES ('rerun-external')"
+        )
+    app.run()
+    assert reloaded() == every, "write by another process"
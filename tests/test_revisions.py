@@ -0,0 +1,62 @@
+"""Revising work entries keeps them and the daily task totals right, in the cases that broke before."""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Tuple
+
+import pytest
+
+from productivity_tracker import business_logic as logic
+
+
+@pytest.fixture(scope="module")
+def task_ids() -> Tuple[int, int]:
+    return logic.Task.register("revision-first"), logic.Task.register("revision-second")
+
+
+def at(the_day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime.combine(the_day, time(hour, minute))
+
+
+def totals(the_day: date) -> Dict[int, float]:
+    return logic.Report.acquire_task_totals(the_day, the_day + timedelta(days=1))
+
+
+def test_revise_the_only_entry_of_a_task(
+    the_day: date, task_ids: Tuple[int, int]
+) -> None:
+    # NOTE: Deletes the total of the day and task, then adds to the same one again in the same session
+    first, _ = task_ids
+    logic.WorkEntry.register(first, at(the_day, 9), at(the_day, 10))
+    (work_entry,) = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+
+    logic.WorkEntry.revise(work_entry.id, first, at(the_day, 9), at(the_day, 11))
+
+    assert totals(the_day) == {first: 7200.0}
+
+
+def test_move_the_only_entry_to_another_task(
+    the_day: date, task_ids: Tuple[int, int]
+) -> None:
+    first, second = task_ids
+    logic.WorkEntry.register(first, at(the_day, 9), at(the_day, 11))
+    (work_entry,) = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+
+    logic.WorkEntry.revise(work_entry.id, second, at(the_day, 9), at(the_day, 11))
+
+    assert totals(the_day) == {second: 7200.0}
+
+
+def test_move_an_entry_shorter_than_a_minute_to_another_task(
+    the_day: date, task_ids: Tuple[int, int]
+) -> None:
+    # NOTE: The editor sends the unedited start and end as they are stored
+    first, second = task_ids
+    start, end = at(the_day, 13).replace(second=10), at(the_day, 13).replace(second=40)
+    logic.WorkEntry.register_many([(first, start, end)], truncate=False)
+    (work_entry,) = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+
+    report = logic.WorkEntry.revise_many([(work_entry.id, second, start, end)])
+
+    assert not report.errors
+    (revised,) = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+    assert (revised.task.id, revised.start, revised.end) == (second, start, end)
+    assert totals(the_day) == {second: 30.0}
@@ -0,0 +1,63 @@
+from productivity_tracker import business_logic as logic
+from productivity_tracker.search import TaskSearchIndex
+from productivity_tracker.view_models import ProjectCategoryRecord, TaskRecord
+
+CATEGORY = ProjectCategoryRecord("mobile")
+TASKS = [
+    TaskRecord(1, "design review", CATEGORY),
+    TaskRecord(2, "release notes", None),
+    TaskRecord(3, "review backlog", None),
+    TaskRecord(4, "reveiw typo", CATEGORY),
+]
+
+
+def test_prefix_matches_come_before_fuzzy_matches() -> None:
+    index = TaskSearchIndex(TASKS)
+
+    hits = index.search("review", 10)
+
+    assert [task.id for task in hits[:1]] == [3]
+    assert 1 in {task.id for task in hits[1:]}
+
+
+def test_search_by_id_and_project_category() -> None:
+    index = TaskSearchIndex(TASKS)
+
+    assert [task.id for task in index.search("#2", 10)] == [2]
+    assert {task.id for task in index.search("mobile", 10)} == {1, 4}
+
+
+def test_empty_query_returns_recent_tasks_then_the_newest() -> None:
+    index = TaskSearchIndex(TASKS)
+
+    assert [task.id for task in index.search("", 3, recent=[2])] == [2, 4, 3]
+
+
+def test_added_task_is_found_once() -> None:
+    index = TaskSearchIndex(TASKS)
+    added = TaskRecord(5, "review notes", None)
+
+    index.add(added)
+    index.add(added)
+
+    assert len(index) == 5
+    assert index.search("review notes", 1) == [added]
+
+
+def test_task_search_fills_in_the_newest_tasks_whatever_their_names() -> None:
+    # NOTE: Registered so that the order by name differs from the order by id
+    task_ids = [
+        logic.Task.register(name)
+        for name in ["search-zeta", "search-alpha", "search-mid"]
+    ]
+
+    hits = logic.Task.search("", 3)
+
+    assert [task.id for task in hits] == task_ids[::-1]
+
+
+def test_task_search_finds_a_task_registered_since_the_last_search() -> None:
+    logic.Task.search("search-", 1)
+    task_id = logic.Task.register("search-registered-later")
+
+    assert [task.id for task in logic.Task.search("search-registered", 1)] == [task_id]
@@ -0,0 +1,48 @@
+import json
+from typing import Any, List
+
+import pytest
+
+import track
+from productivity_tracker import business_logic as logic
+
+
+def run(capsys: pytest.CaptureFixture[str], *argv: str) -> Any:
+    track.main(["--json", *argv])
+    return json.loads(capsys.readouterr().out)
+
+
+def test_add_task_returns_the_id_of_the_registered_task(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    outcome = run(capsys, "add-task", "track-returned-id")
+
+    assert outcome["ok"]
+    assert outcome["result"]["id"] == track.resolve_task_id("track-returned-id", None)
+
+
+def test_task_named_with_digits_is_resolved_by_name(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    first = run(capsys, "add-task", "track-first")["result"]["id"]
+    # NOTE: A task named after the id of another one
+    named = run(capsys, "add-task", str(first))["result"]["id"]
+
+    assert named != first
+    assert track.resolve_task_id(str(first), None) == named
+    assert track.resolve_task_id(str(named), None) == named
+
+
+def test_unknown_digits_fall_back_to_a_task_id(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    task_id = run(capsys, "add-task", "track-by-id")["result"]["id"]
+    names: List[str] = [task.name for task in logic.Task.acquire_all()]
+    assert str(task_id) not in names
+
+    assert track.resolve_task_id(str(task_id), None) == task_id
+
+
+def test_unknown_name_is_reported() -> None:
+    with pytest.raises(logic.LogicException, match="cannot be found"):
+        track.resolve_task_id("track-missing", "track-missing-category")
@@ -0,0 +1,91 @@
+import io
+import json
+from datetime import date, datetime, time, timedelta
+
+from productivity_tracker import business_logic as logic
+from productivity_tracker import transfer
+
+
+def test_import_reports_rejected_rows_numbered_from_the_first_row(
+    the_day: date,
+) -> None:
+    logic.Task.register("transfer-import")
+    start = datetime.combine(the_day, time(9, 0, 15))
+    lines = [
+        json.dumps(
+            {
+                "task": "transfer-import",
+                "start": start.isoformat(),
+                "end": (start + timedelta(hours=1)).isoformat(),
+            }
+        ),
+        "{not json",
+        json.dumps(["transfer-import"]),
+        json.dumps({"task": "transfer-import"}),
+        json.dumps(
+            {
+                "task": "transfer-missing",
+                "start": "2024-01-01T09:00:00",
+                "end": "2024-01-01T10:00:00",
+            }
+        ),
+        json.dumps(
+            {"task": "transfer-import", "start": start.isoformat(), "end": None}
+        ),
+        json.dumps({"task": "transfer-import", "start": "yesterday", "end": "today"}),
+    ]
+    rows = transfer.read_rows(
+        io.StringIO("\n".join(lines) + "\n"), transfer.Format.jsonl
+    )
+
+    reports = list(
+        transfer.import_rows(transfer.Entity.work_entries, rows, chunk_size=3)
+    )
+
+    assert [report.registered for report in reports] == [1, 0, 0]
+    errors = [error for report in reports for error in report.errors]
+    assert [error.row for error in errors] == [1, 2, 3, 4, 5, 6]
+    assert errors[0].message.startswith("Invalid JSON")
+    assert errors[1].message == "Expected a JSON object, got list."
+    assert errors[2].message == "Missing start."
+    assert errors[3].message == "Task(transfer-missing) cannot be found."
+    assert errors[4].message == "Work entry in progress cannot be imported."
+    # NOTE: Seconds of imported datetimes are kept as they are
+    (work_entry,) = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+    assert work_entry.start == start
+
+
+def test_export_and_import_round_trip(the_day: date) -> None:
+    task_id = logic.Task.register("transfer-round-trip")
+    logic.WorkEntry.register(
+        task_id, datetime.combine(the_day, time(9)), datetime.combine(the_day, time(10))
+    )
+    file = io.StringIO(newline="")
+    exported = [
+        row
+        for row in transfer.export_rows(transfer.Entity.work_entries)
+        if row["task"] == "transfer-round-trip"
+    ]
+    transfer.write_rows(
+        transfer.Entity.work_entries, exported, file, transfer.Format.csv
+    )
+    (work_entry,) = logic.WorkEntry.acquire_all_finished_by_date(the_day)
+    logic.WorkEntry.revise(
+        work_entry.id,
+        task_id,
+        datetime.combine(the_day, time(11)),
+        datetime.combine(the_day, time(12)),
+    )
+
+    file.seek(0)
+    rows = transfer.read_rows(file, transfer.Format.csv)
+    (report,) = transfer.import_rows(transfer.Entity.work_entries, rows)
+
+    assert (report.registered, report.errors) == (1, [])
+    assert [
+        (w.start.hour, w.end and w.end.hour)
+        for w in logic.WorkEntry.acquire_all_finished_by_date(the_day)
+    ] == [
+        (9, 10),
+        (11, 12),
+    ]
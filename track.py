@@ -0,0 +1,291 @@
+"""Command-line client of My Work Tracker, to start, stop and report work without the web page.
+
+Imports neither Streamlit, pandas nor Plotly, so that each command starts fast enough for scripts and shell hooks.
+A task is given by its id, or by its name and --category. Times are HH:MM of --date, today by default.
+
+Examples:
+    $ python track.py start 12
+    $ python track.py start "Code review" --category Project-A
+    $ python track.py stop
+    $ python track.py register 12 09:00 10:30 --date 2024-04-01
+    $ python track.py --json report --start 2024-04-01 --end 2024-04-07
+    $ printf 'start 12\\nstatus\\n' | python track.py --json batch
+"""
+import argparse
+import json
+import shlex
+import sys
+from datetime import date, datetime, time, timedelta
+from typing import IO, Any, Callable, Dict, List, NoReturn
+
+from productivity_tracker import business_logic as logic
+from productivity_tracker.bootstrap import ensure_mapping
+from productivity_tracker.view_models import WorkEntryRecord
+
+
+class UsageError(Exception):
+    pass
+
+
+class BatchArgumentParser(argparse.ArgumentParser):
+    """Raises UsageError instead of exiting, so that a wrong line of a batch does not end the others."""
+
+    def error(self, message: str) -> NoReturn:
+        raise UsageError(message)
+
+
+def parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r}, expected YYYY-MM-DD") from error
+
+
+def parse_time(value: str) -> time:
+    try:
+        return datetime.strptime(value, "%H:%M").time()
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"invalid time: {value!r}, expected HH:MM") from error
+
+
+def resolve_task_id(task: str, category: str | None) -> int:
+    """Return the id of the task given by its name and project category name, or by its id.
+
+    A name made of digits is looked up as a name first, so that a task named e.g. 2024
+    is not taken for an id.
+
+    Raises:
+        LogicException: Occurs when no task has the name in the project category.
+    """
+    task_ids = logic.Task.acquire_ids_by_keys([(task, category)])
+    if (task, category) in task_ids:
+        return task_ids[(task, category)]
+    if task.isdigit() and category is None:
+        return int(task)
+    where = "without project category" if category is None else f"in {category!r}"
+    raise logic.LogicException(f"Task {task!r} {where} cannot be found.")
+
+
+def work_entry_to_json(work_entry: WorkEntryRecord) -> Dict[str, Any]:
+    end = work_entry.end or datetime.now()
+    return {
+        "id": work_entry.id,
+        "task_id": work_entry.task.id,
+        "task": str(work_entry.task),
+        "start": work_entry.start.isoformat(),
+        "end": None if work_entry.end is None else work_entry.end.isoformat(),
+        "seconds": (end - work_entry.start).total_seconds(),
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    minutes = round(seconds / 60)
+    return f"{minutes // 60:d}:{minutes % 60:02d}"
+
+
+def command_start(args: argparse.Namespace) -> Any:
+    logic.WorkEntry.start(resolve_task_id(args.task, args.category))
+    return command_status(args)
+
+
+def command_stop(args: argparse.Namespace) -> Any:
+    work_entry = logic.WorkEntry.acquire_one_in_progress_by_date(date.today())
+    if work_entry is None:
+        raise logic.LogicException("No work entry is in progress.")
+    logic.WorkEntry.stop(work_entry.id)
+    return {"id": work_entry.id, "task_id": work_entry.task.id, "task": str(work_entry.task)}
+
+
+def command_register(args: argparse.Namespace) -> Any:
+    task_id = resolve_task_id(args.task, args.category)
+    start = datetime.combine(args.date, args.start)
+    end = datetime.combine(args.date, args.end)
+    if end <= start:
+        raise logic.LogicException("End must be after start.")
+    logic.WorkEntry.register(task_id, start, end)
+    return {"task_id": task_id, "start": start.isoformat(), "end": end.isoformat()}
+
+
+def command_add_task(args: argparse.Namespace) -> Any:
+    task_id = logic.Task.register(args.name, args.category)
+    return {"id": task_id, "name": args.name, "category": args.category}
+
+
+def command_add_category(args: argparse.Namespace) -> Any:
+    logic.ProjectCategory.register(args.name)
+    return {"name": args.name}
+
+
+def command_status(args: argparse.Namespace) -> Any:
+    work_entry = logic.WorkEntry.acquire_one_in_progress_by_date(date.today())
+    return None if work_entry is None else work_entry_to_json(work_entry)
+
+
+def command_day(args: argparse.Namespace) -> Any:
+    work_entries = logic.WorkEntry.acquire_all_finished_by_date(args.date)
+    in_progress = logic.WorkEntry.acquire_one_in_progress_by_date(args.date)
+    if in_progress is not None:
+        work_entries = [*work_entries, in_progress]
+    return [work_entry_to_json(work_entry) for work_entry in work_entries]
+
+
+def command_report(args: argparse.Namespace) -> Any:
+    # NOTE: Both ends are inclusive here, while business logic takes an exclusive last day
+    task_totals = logic.Report.acquire_task_totals(args.start, args.end + timedelta(days=1))
+    tasks = {task.id: task for task in logic.Task.acquire_all()}
+    return [
+        {"task_id": task_id, "task": str(tasks[task_id]), "seconds": seconds}
+        for task_id, seconds in sorted(task_totals.items(), key=lambda item: -item[1])
+    ]
+
+
+def format_text(command: str, result: Any) -> str:
+    """Format the result of a command for people, its JSON being for scripts."""
+    if command == "status":
+        if result is None:
+            return "No work entry is in progress."
+        return f"{result['task']} since {result['start'][11:16]} ({format_seconds(result['seconds'])})"
+    if command == "start":
+        return f"Started {result['task']} at {result['start'][11:16]}."
+    if command == "stop":
+        return f"Stopped {result['task']}."
+    if command == "register":
+        return f"Registered #{result['task_id']} {result['start'][11:16]} - {result['end'][11:16]}."
+    if command == "add-task":
+        return f"Registered task #{result['id']} {result['name']}."
+    if command == "add-category":
+        return f"Registered project category {result['name']}."
+    if command == "day":
+        return "\n".join(
+            f"{w['start'][11:16]} - {'??:??' if w['end'] is None else w['end'][11:16]} "
+            f"{format_seconds(w['seconds']):>6} {w['task']}"
+            for w in result
+        )
+    if command == "report":
+        total = sum(row["seconds"] for row in result)
+        lines = [f"{format_seconds(row['seconds']):>7} {row['task']}" for row in result]
+        return "\n".join([*lines, f"{format_seconds(total):>7} total"])
+    raise ValueError(command)
+
+
+def run_command(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run a parsed command, turning the errors of business logic into the result.
+
+    Returns:
+        Dict[str, Any]: "ok" and either "result" or "error"
+    """
+    try:
+        return {"ok": True, "result": args.func(args)}
+    except logic.LogicException as error:
+        return {"ok": False, "error": str(error)}
+
+
+def write_outcome(outcome: Dict[str, Any], args: argparse.Namespace, out: IO[str]) -> None:
+    if args.json:
+        out.write(json.dumps(outcome, ensure_ascii=False) + "\n")
+    elif outcome["ok"]:
+        out.write(format_text(args.command, outcome["result"]) + "\n")
+    else:
+        print(f"error: {outcome['error']}", file=sys.stderr)
+
+
+def command_batch(args: argparse.Namespace) -> int:
+    """Run one command per line of stdin, each committed on its own, and go on after a failing one.
+
+    Blank lines and lines starting with # are skipped. With --json, each command writes one JSON line
+    with its line number and command on top of its outcome.
+    """
+    parser = build_parser(BatchArgumentParser, batch=False)
+    failed = False
+    for number, line in enumerate(sys.stdin, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            # NOTE: shlex raises ValueError on unbalanced quotes
+            line_args = parser.parse_args([*(["--json"] if args.json else []), *shlex.split(line)])
+        except (UsageError, ValueError) as error:
+            line_args = args
+            outcome = {"ok": False, "error": str(error)}
+        else:
+            outcome = run_command(line_args)
+        failed |= not outcome["ok"]
+        if args.json:
+            outcome = {"line": number, "command": line, **outcome}
+        elif not outcome["ok"]:
+            outcome = {**outcome, "error": f"line {number}: {outcome['error']}"}
+        write_outcome(outcome, line_args, sys.stdout)
+    return 1 if failed else 0
+
+
+def add_task_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("task", help="Task name, with --category if it has one, or task id")
+    parser.add_argument("--category", help="Project category name of the task name")
+
+
+def build_parser(
+    parser_class: Callable[..., argparse.ArgumentParser] = argparse.ArgumentParser,
+    batch: bool = True,
+) -> argparse.ArgumentParser:
+    parser = parser_class(
+        prog="track.py", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--json", action="store_true", help="Write results as JSON lines")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparser = subparsers.add_parser("start", help="Start working on a task now")
+    add_task_arguments(subparser)
+    subparser.set_defaults(func=command_start)
+
+    subparser = subparsers.add_parser("stop", help="Stop the work entry in progress")
+    subparser.set_defaults(func=command_stop)
+
+    subparser = subparsers.add_parser("register", help="Register a finished work entry")
+    add_task_arguments(subparser)
+    subparser.add_argument("start", type=parse_time, help="HH:MM")
+    subparser.add_argument("end", type=parse_time, help="HH:MM")
+    subparser.add_argument("--date", type=parse_date, default=date.today(), help="YYYY-MM-DD")
+    subparser.set_defaults(func=command_register)
+
+    subparser = subparsers.add_parser("add-task", help="Register a task")
+    subparser.add_argument("name")
+    subparser.add_argument("--category", help="Project category name, which must exist")
+    subparser.set_defaults(func=command_add_task)
+
+    subparser = subparsers.add_parser("add-category", help="Register a project category")
+    subparser.add_argument("name")
+    subparser.set_defaults(func=command_add_category)
+
+    subparser = subparsers.add_parser("status", help="Show the work entry in progress")
+    subparser.set_defaults(func=command_status)
+
+    subparser = subparsers.add_parser("day", help="List the work entries of a day")
+    subparser.add_argument("--date", type=parse_date, default=date.today(), help="YYYY-MM-DD")
+    subparser.set_defaults(func=command_day)
+
+    subparser = subparsers.add_parser("report", help="Total the time per task over days")
+    subparser.add_argument("--start", type=parse_date, default=date.today(), help="First day, YYYY-MM-DD")
+    subparser.add_argument("--end", type=parse_date, default=date.today(), help="Last day, YYYY-MM-DD")
+    subparser.set_defaults(func=command_report)
+
+    if batch:
+        subparser = subparsers.add_parser(
+            "batch", help="Run one command per line of stdin, e.g. from a script"
+        )
+        subparser.set_defaults(func=command_batch)
+
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    ensure_mapping()
+    if args.command == "batch":
+        return command_batch(args)
+    outcome = run_command(args)
+    write_outcome(outcome, args, sys.stdout)
+    return 0 if outcome["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())